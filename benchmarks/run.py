@@ -0,0 +1,371 @@
+"""Performance benchmarks for the Scadable SDK hot paths.
+
+Everything runs against ``scadable.testing.MockServer``, so results only depend on the
+machine and the SDK version::
+
+    python -m benchmarks.run                       # run and print
+    python -m benchmarks.run --save base.json      # keep results for later
+    python -m benchmarks.run --compare base.json   # fail on regressions
+    python -m benchmarks.run -k stream             # only matching cases
+
+The ``import.*`` cases time a cold import in a fresh interpreter, which is
+what short-lived CLI and serverless processes pay on every start.
+
+``--compare`` exits with status 1 when any case is worse than the baseline
+by more than ``--threshold`` (10% by default).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+import scadable
+from scadable import AsyncScadable, Gateway, GatewayIndex, Scadable, TelemetrySink
+from scadable._resources._base import SyncResource
+from scadable._transport._base import Response
+from scadable.testing import MockServer, make_event, make_gateway
+
+
+@dataclass
+class Result:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+_CASES: list[tuple[str, str, bool, Callable[..., float]]] = []
+
+
+def bench(name: str, unit: str, higher_is_better: bool = True):
+    def register(fn: Callable[..., float]) -> Callable[..., float]:
+        _CASES.append((name, unit, higher_is_better, fn))
+        return fn
+
+    return register
+
+
+# -- HTTP transports ---------------------------------------------------------
+
+REQUESTS = 2_000
+GATEWAY = "gw-000000"
+
+
+@bench("http.sync.get", "req/s")
+def http_sync(server: MockServer) -> float:
+    with Scadable(api_key="sk_bench", base_url=server.base_url) as client:
+        client.gateways.get(GATEWAY)  # connect outside the timed loop
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            client._transport.request("GET", f"/v1/gateways/{GATEWAY}")
+        return REQUESTS / (time.perf_counter() - start)
+
+
+@bench("http.async.get", "req/s")
+def http_async(server: MockServer, concurrency: int = 16) -> float:
+    async def main() -> float:
+        async with AsyncScadable(
+            api_key="sk_bench", base_url=server.base_url
+        ) as client:
+            await client.gateways.get(GATEWAY)
+            per_worker = REQUESTS // concurrency
+
+            async def worker() -> None:
+                for _ in range(per_worker):
+                    await client._transport.request("GET", f"/v1/gateways/{GATEWAY}")
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return per_worker * concurrency / (time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+@bench("commands.bulk.200", "commands/s")
+def commands_bulk(server: MockServer, concurrency: int = 16) -> float:
+    """Submitting commands over a simulated 20 ms round trip."""
+    ids = [f"gw-{i:06d}" for i in range(200)]
+
+    async def main() -> float:
+        async with AsyncScadable(
+            api_key="sk_bench", base_url=server.base_url
+        ) as client:
+            start = time.perf_counter()
+            await client.gateways.bulk_command(
+                ids, "ping", concurrency=concurrency, watch=False
+            )
+            return len(ids) / (time.perf_counter() - start)
+
+    server.latency = 0.02
+    try:
+        return asyncio.run(main())
+    finally:
+        server.latency = 0.0
+
+
+# One request at a time, as a loop over ``gateways.command`` would.
+bench("commands.sequential.200", "commands/s")(
+    lambda server: commands_bulk(server, concurrency=1)
+)
+
+
+# -- list validation ---------------------------------------------------------
+
+
+class _StaticTransport:
+    def __init__(self, data: Any = None, content: bytes = b""):
+        self._response = Response(200, data, content=content)
+
+    def request(self, *_: Any, **__: Any) -> Response:
+        return self._response
+
+
+def _validate_list(size: int) -> float:
+    data = {"gateways": [make_gateway(i) for i in range(size)]}
+    resource = SyncResource(_StaticTransport(data))
+    loops = max(1, 20_000 // size)
+    start = time.perf_counter()
+    for _ in range(loops):
+        resource._list("/v1/gateways", model=Gateway)
+    return (time.perf_counter() - start) / (loops * size) * 1e6
+
+
+for _size in (100, 1_000, 10_000):
+    bench(f"list.validate.{_size}", "us/gateway", higher_is_better=False)(
+        lambda server, size=_size: _validate_list(size)
+    )
+
+
+def _validate_json_list(size: int, *, bulk: bool) -> float:
+    """A bare-array body: one TypeAdapter call vs. json.loads and an item loop.
+
+    Both start from a fresh collection with the cyclic GC enabled, so
+    neither pays for garbage left by the other.
+    """
+    body = json.dumps([make_gateway(i) for i in range(size)]).encode()
+    resource = SyncResource(_StaticTransport(content=body))
+    gc.collect()
+    start = time.perf_counter()
+    if bulk:
+        resource._list("/v1/gateways", model=Gateway)
+    else:
+        [Gateway.model_validate(item) for item in json.loads(body)]
+    return (time.perf_counter() - start) / size * 1e6
+
+
+for _size in (10_000, 100_000):
+    for _mode in ("loop", "bulk"):
+        bench(f"list.json.{_mode}.{_size}", "us/gateway", higher_is_better=False)(
+            lambda server, size=_size, mode=_mode: _validate_json_list(
+                size, bulk=mode == "bulk"
+            )
+        )
+
+
+@bench("list.http.10000", "gateways/s")
+def list_http(server: MockServer) -> float:
+    with Scadable(api_key="sk_bench", base_url=server.base_url) as client:
+        start = time.perf_counter()
+        gateways = client.gateways.list()
+        return len(gateways) / (time.perf_counter() - start)
+
+
+# -- local queries -----------------------------------------------------------
+
+
+@bench("index.query.10000", "us/query", higher_is_better=False)
+def index_query(server: MockServer) -> float:
+    index = GatewayIndex(Gateway.model_validate(make_gateway(i)) for i in range(10_000))
+    loops = 200
+    start = time.perf_counter()
+    for _ in range(loops):
+        index.query(status="offline", firmware_below="0.6", protocol="modbus")
+        index.query(project_id="proj-003", order_by="-last_seen_at", limit=10)
+        index.devices(has_error=False, connected=True, status="degraded")
+    return (time.perf_counter() - start) / (loops * 3) * 1e6
+
+
+@bench("fleet.resync.10000", "ms", higher_is_better=False)
+def fleet_resync(server: MockServer) -> float:
+    with Scadable(api_key="sk_bench", base_url=server.base_url) as client:
+        client.fleet.sync()
+        start = time.perf_counter()
+        client.fleet.sync()
+        return (time.perf_counter() - start) * 1000
+
+
+# -- streaming ---------------------------------------------------------------
+
+
+@bench("stream.async.events", "events/s")
+def stream_async(server: MockServer, **options: Any) -> float:
+    async def main() -> float:
+        async with AsyncScadable(
+            api_key="sk_bench", base_url=server.base_url, **options
+        ) as client:
+            count = 0
+            start = time.perf_counter()
+            async with client.gateways.stream(GATEWAY) as stream:
+                async for _ in stream:
+                    count += 1
+            return count / (time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+# Every message timed: the worst case for profiling overhead.
+bench("stream.async.events.profiled", "events/s")(
+    lambda server: stream_async(server, stream_profile_rate=1.0)
+)
+
+
+@bench("stream.sync.events", "events/s")
+def stream_sync(server: MockServer) -> float:
+    with Scadable(api_key="sk_bench", base_url=server.base_url) as client:
+        count = 0
+        start = time.perf_counter()
+        with client.gateways.stream(GATEWAY) as stream:
+            for _ in stream:
+                count += 1
+        return count / (time.perf_counter() - start)
+
+
+@bench("sink.write.events", "events/s")
+def sink_write(server: MockServer, count: int = 20_000) -> float:
+    """Cost of archiving on the receive loop; disk writes happen off-thread."""
+    events = [make_event(make_gateway(i % 50)) for i in range(count)]
+
+    async def main() -> float:
+        with tempfile.TemporaryDirectory() as root:
+            async with TelemetrySink(root) as sink:
+                start = time.perf_counter()
+                for event in events:
+                    sink.write(event)
+                elapsed = time.perf_counter() - start
+            return count / elapsed
+
+    return asyncio.run(main())
+
+
+# -- memory ------------------------------------------------------------------
+
+
+@bench("memory.gateways.10000", "MiB", higher_is_better=False)
+def memory_gateways(server: MockServer) -> float:
+    payload = [make_gateway(i) for i in range(10_000)]
+    gc.collect()
+    tracemalloc.start()
+    gateways = [Gateway.model_validate(item) for item in payload]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del gateways
+    return size / 2**20
+
+
+# -- import time -------------------------------------------------------------
+
+
+def _import_ms(statement: str, runs: int = 5) -> float:
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"{statement}; print(time.perf_counter() - t)"
+    )
+    samples = [
+        float(subprocess.check_output([sys.executable, "-c", code]))
+        for _ in range(runs)
+    ]
+    return min(samples) * 1000
+
+
+@bench("import.package", "ms", higher_is_better=False)
+def import_package(server: MockServer) -> float:
+    return _import_ms("import scadable")
+
+
+@bench("import.sync_client", "ms", higher_is_better=False)
+def import_sync_client(server: MockServer) -> float:
+    return _import_ms("from scadable import Scadable; Scadable(api_key='k')")
+
+
+@bench("import.async_client", "ms", higher_is_better=False)
+def import_async_client(server: MockServer) -> float:
+    return _import_ms("from scadable import AsyncScadable; AsyncScadable(api_key='k')")
+
+
+# -- runner ------------------------------------------------------------------
+
+
+def run(pattern: str | None, repeat: int) -> list[Result]:
+    results = []
+    # Uncompressed responses keep server-side gzip out of the client numbers.
+    server = MockServer(fleet_size=10_000, stream_events=20_000, compression=False)
+    with server:
+        for name, unit, higher, fn in _CASES:
+            if pattern and pattern not in name:
+                continue
+            samples = [fn(server) for _ in range(repeat)]
+            value = max(samples) if higher else min(samples)
+            results.append(Result(name, value, unit, higher))
+            print(f"{name:<28} {value:>14,.2f} {unit}", flush=True)
+    return results
+
+
+def compare(results: list[Result], baseline_path: str, threshold: float) -> bool:
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    ok = True
+    print(f"\nvs {baseline_path} (threshold {threshold:.0%})")
+    for result in results:
+        base = baseline.get(result.name)
+        if not base or not base["value"]:
+            print(f"{result.name:<28} {'(new)':>14}")
+            continue
+        change = result.value / base["value"] - 1
+        worse = -change if result.higher_is_better else change
+        flag = "REGRESSION" if worse > threshold else ""
+        ok = ok and not flag
+        print(f"{result.name:<28} {change:>+13.1%}  {flag}")
+    return ok
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run cases containing this")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {
+                    "scadable": scadable.__version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": [asdict(r) for r in results],
+                },
+                f,
+                indent=2,
+            )
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
 """Scadable Python SDK — the simplest way to interact with the Scadable IoT platform."""
 
-from ._client import Scadable, AsyncScadable
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from ._config import ClientConfig
+from ._retry import RetryPolicy
 from ._exceptions import (
     ScadableError,
     AuthenticationError,
@@ -11,19 +16,47 @@ from ._exceptions import (
     PermissionError,
     RateLimitError,
 )
-from ._models import (
-    Device,
-    Gateway,
-    GatewayMetrics,
-    GatewaySecurity,
-    MetricPoint,
-    TelemetryEvent,
-)
+
+if TYPE_CHECKING:
+    from ._client import Scadable, AsyncScadable
+    from ._commands import CommandBatch, CommandResult
+    from ._fleet import FleetChange, FleetMirror
+    from ._index import GatewayIndex
+    from ._poller import GatewayPoller
+    from ._sinks import TelemetrySink
+    from ._pool import AsyncScadablePool, ScadablePool
+    from ._tracker import DeviceChange, DeviceTracker
+    from ._transport._codecs import register_decoder
+    from ._transport._profile import StreamProfile
+    from ._transport._websocket import StreamStats
+    from ._models import (
+        Device,
+        Gateway,
+        GatewayMetrics,
+        GatewaySecurity,
+        MetricPoint,
+        TelemetryEvent,
+    )
 
 __all__ = [
     "Scadable",
     "AsyncScadable",
+    "ScadablePool",
+    "AsyncScadablePool",
     "ClientConfig",
+    "RetryPolicy",
+    "CommandBatch",
+    "CommandResult",
+    "DeviceChange",
+    "DeviceTracker",
+    "FleetChange",
+    "FleetMirror",
+    "GatewayIndex",
+    "GatewayPoller",
+    "StreamProfile",
+    "TelemetrySink",
+    "StreamStats",
+    "register_decoder",
     # Errors
     "ScadableError",
     "AuthenticationError",
@@ -42,3 +75,43 @@ __all__ = [
 ]
 
 __version__ = "2.0.2"
+
+# Clients, models and transports pull in httpx, pydantic and websockets, so
+# they are imported on first access instead of with the package.
+_LAZY: dict[str, str] = {
+    "Scadable": "._client",
+    "AsyncScadable": "._client",
+    "ScadablePool": "._pool",
+    "AsyncScadablePool": "._pool",
+    "CommandBatch": "._commands",
+    "CommandResult": "._commands",
+    "DeviceChange": "._tracker",
+    "DeviceTracker": "._tracker",
+    "FleetChange": "._fleet",
+    "FleetMirror": "._fleet",
+    "GatewayIndex": "._index",
+    "GatewayPoller": "._poller",
+    "StreamProfile": "._transport._profile",
+    "TelemetrySink": "._sinks",
+    "StreamStats": "._transport._websocket",
+    "register_decoder": "._transport._codecs",
+    "Device": "._models",
+    "Gateway": "._models",
+    "GatewayMetrics": "._models",
+    "GatewaySecurity": "._models",
+    "MetricPoint": "._models",
+    "TelemetryEvent": "._models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable
+
 from ._config import ClientConfig
 from ._transport._http import SyncHTTPTransport, AsyncHTTPTransport
 from ._transport._websocket import WebSocketTransport
+from ._resources._devices import Devices, AsyncDevices
+from ._resources._fleet import Fleet, AsyncFleet
 from ._resources._gateways import Gateways, AsyncGateways
 
+if TYPE_CHECKING:
+    import httpx
+
+
+@dataclass
+class Warmup:
+    """What :meth:`AsyncScadable.warmup` opened."""
+
+    connections: int = 0  # pooled HTTP connections
+    streams: list[str] = field(default_factory=list)  # gateways ready to stream
+    errors: dict[str, Exception] = field(default_factory=dict)  # by gateway
+
 
 class Scadable:
     """Synchronous Scadable client.
@@ -12,6 +29,9 @@ class Scadable:
     >>> client = Scadable(api_key="sk_live_...")
     >>> for gw in client.gateways.list():
     ...     print(gw.name, gw.status)
+    >>> with client.gateways.stream("gw-123") as stream:
+    ...     for event in stream:
+    ...         print(event.data)
     """
 
     def __init__(
@@ -21,16 +41,26 @@ class Scadable:
         base_url: str | None = None,
         timeout: float = 30.0,
         max_retries: int = 2,
+        http_client: httpx.Client | None = None,
+        **options: Any,
     ):
         self._config = ClientConfig.resolve(
             api_key=api_key,
             base_url=base_url,
             timeout=timeout,
             max_retries=max_retries,
+            **options,
         )
-        self._transport = SyncHTTPTransport(self._config)
+        self._transport = SyncHTTPTransport(self._config, client=http_client)
+        self._ws_transport = WebSocketTransport(self._config)
 
-        self.gateways = Gateways(self._transport)
+        self.gateways = Gateways(
+            self._transport,
+            self._ws_transport,
+            command_batch_path=self._config.command_batch_path,
+        )
+        self.devices = Devices(self._transport)
+        self.fleet = Fleet(self._transport, since_param=self._config.fleet_since_param)
 
     def close(self) -> None:
         self._transport.close()
@@ -58,23 +88,67 @@ class AsyncScadable:
         base_url: str | None = None,
         timeout: float = 30.0,
         max_retries: int = 2,
+        http_client: httpx.AsyncClient | None = None,
+        **options: Any,
     ):
         self._config = ClientConfig.resolve(
             api_key=api_key,
             base_url=base_url,
             timeout=timeout,
             max_retries=max_retries,
+            **options,
         )
-        self._transport = AsyncHTTPTransport(self._config)
+        self._transport = AsyncHTTPTransport(self._config, client=http_client)
         self._ws_transport = WebSocketTransport(self._config)
 
-        self.gateways = AsyncGateways(self._transport, self._ws_transport)
+        self.gateways = AsyncGateways(
+            self._transport,
+            self._ws_transport,
+            command_batch_path=self._config.command_batch_path,
+        )
+        self.devices = AsyncDevices(self._transport)
+        self.fleet = AsyncFleet(
+            self._transport, since_param=self._config.fleet_since_param
+        )
+
+    async def warmup(
+        self, connections: int = 4, *, gateways: Iterable[str] = ()
+    ) -> Warmup:
+        """Open connections now instead of on the first requests after startup.
+
+        Opens up to ``connections`` pooled HTTP connections (TLS handshakes
+        included; capped by ``max_connections`` and
+        ``max_keepalive_connections``, and they close again after
+        ``keepalive_expiry`` idle seconds) and pre-connects the
+        stream of every gateway in ``gateways`` for its next
+        :meth:`~AsyncGateways.stream`. Failures are reported, not raised.
+
+        >>> async with AsyncScadable(dns_cache_ttl=60) as client:
+        ...     await client.warmup(16, gateways=["gw-1", "gw-2"])
+        """
+        import asyncio
+
+        gateway_ids = list(dict.fromkeys(gateways))
+        opened, *streams = await asyncio.gather(
+            self._transport.warmup(connections),
+            *(self.gateways.preconnect(gid) for gid in gateway_ids),
+            return_exceptions=True,
+        )
+        result = Warmup(opened if isinstance(opened, int) else 0)
+        for gateway_id, outcome in zip(gateway_ids, streams):
+            if isinstance(outcome, Exception):
+                result.errors[gateway_id] = outcome
+            else:
+                result.streams.append(gateway_id)
+        return result
 
     async def close(self) -> None:
         await self._transport.close()
         await self._ws_transport.close()
 
     async def __aenter__(self) -> AsyncScadable:
+        if self._config.warmup_connections:
+            await self.warmup(self._config.warmup_connections)
         return self
 
     async def __aexit__(self, *_: object) -> None:
@@ -0,0 +1,451 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping
+
+from ._exceptions import FATAL_ERRORS, ConnectionError, ScadableError
+from ._models._telemetry import TelemetryEvent
+from ._resources._base import _extract_list
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from ._resources._gateways import AsyncGateways
+
+# Task statuses after which no further updates are expected.
+TERMINAL_STATUSES = frozenset(
+    {"completed", "succeeded", "failed", "rejected", "cancelled", "timed_out"}
+)
+_SUCCEEDED = frozenset({"completed", "succeeded"})
+# Task events seen before the request that created the task returned.
+_MAX_EARLY = 10_000
+# Times a lost stream is redialled, waiting ``_RECONNECT_DELAY`` seconds
+# before the first attempt and doubling the wait after each one.
+_RECONNECTS = 3
+_RECONNECT_DELAY = 0.5
+
+
+@dataclass
+class CommandResult:
+    """One gateway's command and what has been heard of its task.
+
+    ``status`` is ``"pending"`` once the server accepted the command, then
+    follows the task's events on the stream; a command accepted without a
+    ``task_id`` has nothing to follow and is ``"completed"`` right away.
+    ``"error"`` means the request itself failed, with the exception in
+    ``error``.
+    """
+
+    gateway_id: str
+    task_id: str | None = None
+    status: str = "pending"
+    result: Any = None
+    error: ScadableError | None = None
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def done(self) -> bool:
+        return self.status == "error" or self.status in TERMINAL_STATUSES
+
+    @property
+    def ok(self) -> bool:
+        return self.status in _SUCCEEDED
+
+
+ResultCallback = Callable[[CommandResult], None]
+
+
+class CommandBatch:
+    """Per-gateway results of one bulk command, completed from stream events.
+
+    Every stream event carrying a ``task_id`` of the batch updates that
+    task's :class:`CommandResult`; a ``data.status`` in
+    :data:`TERMINAL_STATUSES` completes it (an event without a status counts
+    as ``"completed"``). ``bulk_command`` on the async client feeds the batch
+    from the gateways' own streams; otherwise pass events to :meth:`observe`.
+
+    A lost stream is redialled a few times, but events sent while it was
+    down are missed. A gateway whose stream cannot be kept up is recorded in
+    :attr:`unwatched`, and its result stays pending (see :attr:`unobserved`).
+
+    >>> batch = await client.gateways.bulk_command(ids, "reboot")
+    >>> batch.on_complete(lambda r: print(r.gateway_id, r.status))
+    >>> if not await batch.wait(timeout=60):
+    ...     print("still running:", [r.gateway_id for r in batch.pending])
+    """
+
+    def __init__(self) -> None:
+        self.results: dict[str, CommandResult] = {}
+        # Gateways whose stream could not be watched, with the reason.
+        self.unwatched: dict[str, Exception] = {}
+        self._tasks: dict[str, CommandResult] = {}
+        self._early: OrderedDict[str, TelemetryEvent] = OrderedDict()
+        self._callbacks: list[ResultCallback] = []
+        self._watchers: dict[str, asyncio.Task[None]] = {}
+        self._changed: asyncio.Event | None = None
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[CommandResult]:
+        return iter(self.results.values())
+
+    @property
+    def pending(self) -> list[CommandResult]:
+        return [r for r in self.results.values() if not r.done]
+
+    @property
+    def failed(self) -> list[CommandResult]:
+        return [r for r in self.results.values() if r.done and not r.ok]
+
+    @property
+    def unobserved(self) -> list[CommandResult]:
+        """Pending results whose gateway's stream is no longer watched."""
+        return [r for r in self.pending if r.gateway_id in self.unwatched]
+
+    @property
+    def done(self) -> bool:
+        return all(r.done for r in self.results.values())
+
+    def on_complete(self, callback: ResultCallback) -> ResultCallback:
+        """Call ``callback`` with each result once it is done; usable as a decorator.
+
+        Results already done, e.g. tasks that finished while the batch was
+        still being sent, are passed to it right away.
+        """
+        self._callbacks.append(callback)
+        for result in list(self.results.values()):
+            if result.done:
+                callback(result)
+        return callback
+
+    def observe(self, event: TelemetryEvent | Mapping[str, Any]) -> bool:
+        """Apply a stream event; returns whether it belonged to this batch."""
+        if not isinstance(event, TelemetryEvent):
+            event = TelemetryEvent.model_validate(event)
+        if event.task_id is None:
+            return False
+        result = self._tasks.get(event.task_id)
+        if result is None:
+            # The task's request may not have returned yet.
+            self._early[event.task_id] = event
+            if len(self._early) > _MAX_EARLY:
+                self._early.popitem(last=False)
+            return False
+        if result.done:
+            return True
+        data = event.data
+        result.status = str(data.get("status") or "completed")
+        result.result = data.get("result", result.result)
+        result.updated_at = time.time()
+        if result.done:
+            self._finish(result)
+        return True
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait until every result is done or :attr:`unobserved`.
+
+        Returns whether every result is done: ``False`` if ``timeout`` ran
+        out first or some results can no longer be observed. Stream watchers
+        end once the batch is done; after a timeout they keep going until
+        :meth:`close`.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while any(
+            not r.done and r.gateway_id not in self.unwatched
+            for r in self.results.values()
+        ):
+            self._changed = changed = asyncio.Event()
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return self.done
+
+    async def close(self) -> None:
+        """Stop watching streams for the results still pending."""
+        import asyncio
+
+        watchers, self._watchers = self._watchers, {}
+        for task in watchers.values():
+            task.cancel()
+        await asyncio.gather(*watchers.values(), return_exceptions=True)
+
+    def _add(self, result: CommandResult) -> None:
+        self.results[result.gateway_id] = result
+        if result.task_id is not None:
+            self._tasks[result.task_id] = result
+            early = self._early.pop(result.task_id, None)
+            if early is not None:
+                self.observe(early)
+        if result.done:
+            self._finish(result)
+
+    def _finish(self, result: CommandResult) -> None:
+        for callback in self._callbacks:
+            callback(result)
+        watcher = self._watchers.pop(result.gateway_id, None)
+        if watcher is not None:
+            watcher.cancel()
+        if self._changed is not None:
+            self._changed.set()
+
+    def _unwatch(self, gateway_id: str, error: Exception) -> None:
+        self.unwatched[gateway_id] = error
+        if self._changed is not None:
+            self._changed.set()
+
+    async def _watch(self, gateways: AsyncGateways, gateway_id: str) -> None:
+        """Follow the gateway's stream until its result is done.
+
+        Runs until cancelled by :meth:`_finish` or :meth:`close`, or until
+        the stream is lost for good.
+        """
+        import asyncio
+
+        error: Exception
+        for attempt in range(_RECONNECTS + 1):
+            if attempt:
+                await asyncio.sleep(_RECONNECT_DELAY * 2 ** (attempt - 1))
+            try:
+                async with gateways.stream(gateway_id) as events:
+                    async for event in events:
+                        self.observe(event)
+                error = ConnectionError("Stream closed")
+            except FATAL_ERRORS as exc:
+                error = exc
+                break
+            except Exception as exc:
+                error = exc
+        self._watchers.pop(gateway_id, None)
+        self._unwatch(gateway_id, error)
+
+
+def command_path(gateway_id: str) -> str:
+    return f"/v1/gateways/{gateway_id}/commands"
+
+
+def command_body(command: str, params: Mapping[str, Any] | None) -> dict[str, Any]:
+    return {"command": command, "params": dict(params or {})}
+
+
+def accepted(gateway_id: str, data: Any) -> CommandResult:
+    """The result for a command the server took, from its response body."""
+    data = data if isinstance(data, dict) else {}
+    task_id = data.get("task_id")
+    status = str(data.get("status") or "pending")
+    if task_id is None and status not in TERMINAL_STATUSES:
+        # No task will report back, so taking the command is all there is.
+        status = "completed"
+    return CommandResult(
+        gateway_id,
+        task_id=None if task_id is None else str(task_id),
+        status=status,
+        result=data.get("result"),
+    )
+
+
+def _chunks(ids: list[str], size: int) -> Iterator[list[str]]:
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def _batch_body(
+    gateway_ids: list[str], command: str, params: Mapping[str, Any] | None
+) -> dict[str, Any]:
+    body = command_body(command, params)
+    return {"commands": [{"gateway_id": gid, **body} for gid in gateway_ids]}
+
+
+def _batch_results(gateway_ids: list[str], data: Any) -> list[CommandResult]:
+    """Match a batch response's items to the gateways sent, by ``gateway_id``."""
+    items = {
+        item.get("gateway_id"): item
+        for item in _extract_list(data)
+        if isinstance(item, dict)
+    }
+    results = []
+    for gateway_id in gateway_ids:
+        item = items.get(gateway_id)
+        if item is None:
+            error = ScadableError("Missing from the batch response")
+        elif item.get("error"):
+            error = ScadableError(str(item["error"]), body=item)
+        else:
+            results.append(accepted(gateway_id, item))
+            continue
+        results.append(CommandResult(gateway_id, status="error", error=error))
+    return results
+
+
+def _failed(gateway_ids: Iterable[str], exc: ScadableError) -> list[CommandResult]:
+    return [CommandResult(gid, status="error", error=exc) for gid in gateway_ids]
+
+
+def send_commands(
+    transport: Any,
+    gateway_ids: Iterable[str],
+    command: str,
+    params: Mapping[str, Any] | None,
+    *,
+    concurrency: int,
+    batch_path: str | None,
+    batch_size: int,
+) -> CommandBatch:
+    """Send ``command`` from ``concurrency`` threads over the shared client."""
+    ids = list(dict.fromkeys(gateway_ids))
+    body = command_body(command, params)
+
+    def _one(gateway_id: str) -> list[CommandResult]:
+        try:
+            resp = transport.request("POST", command_path(gateway_id), json=body)
+        except ScadableError as exc:
+            return _failed([gateway_id], exc)
+        return [accepted(gateway_id, resp.data)]
+
+    def _many(chunk: list[str]) -> list[CommandResult]:
+        try:
+            resp = transport.request(
+                "POST",
+                batch_path,
+                json=_batch_body(chunk, command, params),
+            )
+        except ScadableError as exc:
+            return _failed(chunk, exc)
+        return _batch_results(chunk, resp.data)
+
+    batch = CommandBatch()
+    with ThreadPoolExecutor(max(1, concurrency)) as pool:
+        if batch_path is None:
+            outcomes = pool.map(_one, ids)
+        else:
+            outcomes = pool.map(_many, _chunks(ids, batch_size))
+        for results in outcomes:
+            for result in results:
+                batch._add(result)
+    return batch
+
+
+async def send_commands_async(
+    gateways: AsyncGateways,
+    gateway_ids: Iterable[str],
+    command: str,
+    params: Mapping[str, Any] | None,
+    *,
+    concurrency: int,
+    batch_path: str | None,
+    batch_size: int,
+    watch: bool,
+) -> CommandBatch:
+    """Pipeline ``command`` with up to ``concurrency`` requests in flight.
+
+    With ``watch``, each gateway's stream is connected before its command
+    goes out, so a task that finishes immediately is still seen. That is one
+    WebSocket per gateway, open until its task is done.
+    """
+    import asyncio
+
+    ids = list(dict.fromkeys(gateway_ids))
+    transport = gateways._transport
+    body = command_body(command, params)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    batch = CommandBatch()
+
+    async def _preconnect(gateway_id: str) -> None:
+        async with slots:
+            try:
+                await gateways.preconnect(gateway_id)
+            except Exception as exc:
+                # The command still goes out; its result stays unobserved.
+                batch._unwatch(gateway_id, exc)
+                return
+        watcher = asyncio.create_task(batch._watch(gateways, gateway_id))
+        batch._watchers[gateway_id] = watcher
+
+    async def _one(gateway_id: str) -> None:
+        async with slots:
+            try:
+                resp = await transport.request(
+                    "POST",
+                    command_path(gateway_id),
+                    json=body,
+                )
+            except ScadableError as exc:
+                results = _failed([gateway_id], exc)
+            else:
+                results = [accepted(gateway_id, resp.data)]
+        for result in results:
+            batch._add(result)
+
+    async def _many(chunk: list[str]) -> None:
+        async with slots:
+            try:
+                resp = await transport.request(
+                    "POST",
+                    batch_path,
+                    json=_batch_body(chunk, command, params),
+                )
+            except ScadableError as exc:
+                results = _failed(chunk, exc)
+            else:
+                results = _batch_results(chunk, resp.data)
+        for result in results:
+            batch._add(result)
+
+    if watch:
+        await asyncio.gather(*(_preconnect(gid) for gid in ids))
+    try:
+        if batch_path is None:
+            await asyncio.gather(*(_one(gid) for gid in ids))
+        else:
+            await asyncio.gather(*(_many(c) for c in _chunks(ids, batch_size)))
+    except BaseException:
+        await batch.close()
+        raise
+    return batch
+
+
+def update_gateways(
+    gateways: Any,
+    updates: Mapping[str, Mapping[str, Any]],
+    *,
+    concurrency: int,
+) -> dict[str, Any]:
+    """``gateways.update`` for each entry from ``concurrency`` threads."""
+
+    def _one(item: tuple[str, Mapping[str, Any]]) -> Any:
+        try:
+            return gateways.update(item[0], **item[1])
+        except ScadableError as exc:
+            return exc
+
+    with ThreadPoolExecutor(max(1, concurrency)) as pool:
+        return dict(zip(updates, pool.map(_one, updates.items())))
+
+
+async def update_gateways_async(
+    gateways: AsyncGateways,
+    updates: Mapping[str, Mapping[str, Any]],
+    *,
+    concurrency: int,
+) -> dict[str, Any]:
+    import asyncio
+
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(gateway_id: str, fields: Mapping[str, Any]) -> Any:
+        async with slots:
+            try:
+                return await gateways.update(gateway_id, **fields)
+            except ScadableError as exc:
+                return exc
+
+    results = await asyncio.gather(*(_one(g, f) for g, f in updates.items()))
+    return dict(zip(updates, results))
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
+
+from ._retry import RetryPolicy
 
 
 @dataclass
@@ -10,6 +13,53 @@ class ClientConfig:
     base_url: str = "https://api.scadable.com"
     timeout: float = 30.0
     max_retries: int = 2
+    # Which failures are retried, with what backoff and within what budget.
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    # Per-client request budget (requests/second, each retry included) and
+    # cap on requests in flight; a streamed body being read no longer counts.
+    # ``None`` leaves them unlimited.
+    rate_limit: float | None = None
+    rate_limit_burst: float | None = None
+    max_concurrency: int | None = None
+    # Connection pool of the client's own httpx client (not used with a
+    # shared ``http_client``). Idle connections close after
+    # ``keepalive_expiry`` seconds.
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    # Seconds the async client reuses DNS answers for new connections.
+    # ``None`` resolves on every connect.
+    dns_cache_ttl: float | None = None
+    # Connections ``async with AsyncScadable(...)`` opens before the block
+    # runs (see ``AsyncScadable.warmup``).
+    warmup_connections: int = 0
+    # Keep response headers on ``Response.headers``; ``False`` drops them.
+    response_headers: bool = True
+    # WebSocket tuning. ``None`` disables the corresponding limit or keepalive.
+    ws_compression: str | None = "deflate"
+    ws_compression_level: int | None = None
+    ws_max_window_bits: int | None = None
+    ws_max_size: int | None = 2**20
+    ws_max_queue: int | None = 16
+    ws_write_limit: int = 2**15
+    ws_ping_interval: float | None = 20.0
+    ws_ping_timeout: float | None = 20.0
+    ws_open_timeout: float | None = 10.0
+    # Stream payload encodings to offer, most preferred first. ``None`` offers
+    # every registered decoder (MessagePack/CBOR when installed, then JSON).
+    stream_encodings: tuple[str, ...] | None = None
+    # Fraction of stream messages timed per pipeline stage (see
+    # ``StreamProfile``); ``None`` turns profiling off.
+    stream_profile_rate: float | None = None
+    # Query parameter the list endpoint accepts for "modified since" filtering.
+    # ``None`` makes ``fleet.sync()`` diff the full listing every time.
+    fleet_since_param: str | None = None
+    # Endpoint that accepts many gateways' commands in one POST. ``None``
+    # makes ``bulk_command`` send one request per gateway.
+    command_batch_path: str | None = None
+    # Send each write (POST, PATCH) with a fresh ``Idempotency-Key``, which
+    # lets it be retried like a read. Only for APIs that deduplicate by it.
+    idempotency_keys: bool = False
 
     @classmethod
     def resolve(
@@ -18,13 +68,21 @@ class ClientConfig:
         base_url: str | None = None,
         timeout: float = 30.0,
         max_retries: int = 2,
+        **options: Any,
     ) -> ClientConfig:
         key = api_key or os.environ.get("SCADABLE_API_KEY")
         if not key:
             raise ValueError(
                 "No API key provided. Pass api_key= or set SCADABLE_API_KEY."
             )
-        url = base_url or os.environ.get(
-            "SCADABLE_BASE_URL", "https://api.scadable.com"
+        return cls(
+            api_key=key,
+            base_url=resolve_base_url(base_url),
+            timeout=timeout,
+            max_retries=max_retries,
+            **options,
         )
-        return cls(api_key=key, base_url=url, timeout=timeout, max_retries=max_retries)
+
+
+def resolve_base_url(base_url: str | None = None) -> str:
+    return base_url or os.environ.get("SCADABLE_BASE_URL", "https://api.scadable.com")
@@ -43,6 +43,9 @@ class ConnectionError(ScadableError):
     """Network or transport failure."""
 
 
+# Errors a retry or reconnect can't fix.
+FATAL_ERRORS = (AuthenticationError, PermissionError, NotFoundError)
+
 _STATUS_MAP: dict[int, type[ScadableError]] = {
     401: AuthenticationError,
     403: PermissionError,
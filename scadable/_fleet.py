@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import blake2b
+from typing import Any, Callable, Collection, Iterator, Literal
+
+from ._index import GatewayIndex, gateway_key
+from ._models._gateway import Device, Gateway
+
+ChangeKind = Literal["added", "changed", "removed"]
+# Fields that move on every heartbeat, on gateways and their devices; a
+# record that differs only in these is not reported as changed.
+HEARTBEAT_FIELDS = frozenset({"last_seen_at"})
+
+
+@dataclass(frozen=True)
+class FleetChange:
+    """One gateway that differs between two syncs.
+
+    ``gateway`` is the new record (the last known one for ``removed``);
+    ``previous`` is the record it replaced, if any.
+    """
+
+    kind: ChangeKind
+    gateway_id: str
+    gateway: Gateway
+    previous: Gateway | None = None
+
+
+ChangeCallback = Callable[[FleetChange], None]
+
+
+def differs(
+    old: Gateway, new: Gateway, ignore: Collection[str] = HEARTBEAT_FIELDS
+) -> bool:
+    """Whether two records differ outside the ``ignore`` fields.
+
+    The fields are ignored on the gateway and on each of its devices.
+    """
+    exclude: dict[str, Any] = dict.fromkeys(ignore, True)
+    if "devices" not in exclude:
+        exclude["devices"] = {"__all__": set(ignore)}
+    return old.model_dump(exclude=exclude) != new.model_dump(exclude=exclude)
+
+
+def _digest(raw: bytes) -> bytes:
+    return blake2b(raw, digest_size=16).digest()
+
+
+class FleetMirror:
+    """In-memory copy of the fleet kept in a :class:`GatewayIndex`.
+
+    Each gateway is stored with a digest of its raw JSON, so a sync only
+    validates records whose bytes changed. A record that only differs in
+    :data:`HEARTBEAT_FIELDS` replaces the stored one without being reported
+    as changed. Devices come from the ``devices`` embedded in each gateway
+    record.
+
+    >>> mirror = client.fleet.mirror
+    >>> offline = mirror.where(status="offline", project_id="proj-001")
+    """
+
+    def __init__(self) -> None:
+        self.index = GatewayIndex()
+        self._digests: dict[bytes, str] = {}
+        self._digest_of: dict[str, bytes] = {}
+        self.cursor: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[Gateway]:
+        return iter(self.index)
+
+    def __contains__(self, gateway_id: object) -> bool:
+        return gateway_id in self.index
+
+    def get(self, gateway_id: str) -> Gateway | None:
+        return self.index.get(gateway_id)
+
+    def device(self, device_id: str, gateway_id: str | None = None) -> Device | None:
+        return self.index.device(device_id, gateway_id)
+
+    def where(self, **filters: Any) -> list[Gateway]:
+        """Gateways matching every filter; see :meth:`GatewayIndex.query`."""
+        return self.index.query(**filters)
+
+    def by_status(self, status: str) -> list[Gateway]:
+        return self.where(status=status)
+
+    def by_project(self, project_id: str) -> list[Gateway]:
+        return self.where(project_id=project_id)
+
+    def by_firmware(self, firmware_version: str) -> list[Gateway]:
+        return self.where(firmware_version=firmware_version)
+
+    def diff(self, *, partial: bool = False) -> FleetDiff:
+        """Start comparing a fresh listing against the mirror.
+
+        With ``partial=True`` the listing only holds modified records, so
+        gateways missing from it are kept rather than reported as removed.
+        """
+        return FleetDiff(self, partial=partial)
+
+    def _put(self, key: str, gateway: Gateway, digest: bytes) -> None:
+        self._drop(key)
+        self.index.upsert(gateway)
+        self._digests[digest] = key
+        self._digest_of[key] = digest
+        seen = gateway.last_seen_at
+        if seen is not None and (self.cursor is None or seen > self.cursor):
+            self.cursor = seen
+
+    def _drop(self, key: str) -> Gateway | None:
+        gateway = self.index.remove(key)
+        if gateway is not None:
+            self._digests.pop(self._digest_of.pop(key), None)
+        return gateway
+
+
+class FleetDiff:
+    """Accumulates raw list items, then applies them to a mirror at once.
+
+    Items whose bytes match a stored digest are recognised without parsing.
+    The mirror is only touched in :meth:`commit`, so a listing that fails
+    half-way leaves it as it was.
+    """
+
+    def __init__(self, mirror: FleetMirror, *, partial: bool = False):
+        self._mirror = mirror
+        self._partial = partial
+        self._seen: set[str] = set()
+        self._updates: list[tuple[str, Gateway, bytes]] = []
+
+    def add(self, raw: bytes) -> None:
+        digest = _digest(raw)
+        key = self._mirror._digests.get(digest)
+        if key is not None:
+            self._seen.add(key)
+            return
+        gateway = Gateway.model_validate_json(raw)
+        key = gateway_key(gateway)
+        self._seen.add(key)
+        self._updates.append((key, gateway, digest))
+
+    def commit(self) -> list[FleetChange]:
+        mirror, changes = self._mirror, []
+        for key, gateway, digest in self._updates:
+            previous = mirror.index.get(key)
+            mirror._put(key, gateway, digest)
+            if previous is None:
+                changes.append(FleetChange("added", key, gateway))
+            elif differs(previous, gateway):
+                changes.append(FleetChange("changed", key, gateway, previous))
+        if not self._partial:
+            gone = [k for k in mirror._digest_of if k not in self._seen]
+            for key in gone:
+                gateway = mirror._drop(key)
+                assert gateway is not None
+                changes.append(FleetChange("removed", key, gateway, gateway))
+        return changes
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, insort
+from functools import lru_cache
+from datetime import datetime, timezone
+from typing import Any, Collection, Hashable, Iterable, Iterator, Mapping, Tuple, Union
+
+from ._models._gateway import Device, Gateway
+from ._models._telemetry import TelemetryEvent, epoch_seconds
+
+# Gateway fields with a value -> gateway ids index.
+_GATEWAY_FIELDS = ("status", "project_id", "firmware_version")
+# Device fields, indexed both as value -> device keys and as value -> gateway
+# id -> number of such devices; ``has_error`` is derived from ``last_error``.
+# A device key is (gateway id, device id), or the device's position on the
+# gateway when it has no id, since device ids need not be fleet-unique.
+_DeviceKey = Tuple[str, Union[str, int]]
+_DEVICE_FIELDS = ("protocol", "connected", "has_error")
+_FIRMWARE_BOUNDS = ("firmware_below", "firmware_at_least")
+_ORDERS = ("last_seen_at", "-last_seen_at")
+_NEVER = float("-inf")
+
+
+def gateway_key(gateway: Gateway) -> str:
+    return gateway.gateway_id or gateway.id or gateway.name
+
+
+@lru_cache(maxsize=1024)
+def _version_key(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def _seen_key(value: datetime | None) -> float:
+    return _NEVER if value is None else value.timestamp()
+
+
+def _device_values(device: Device) -> tuple[Any, ...]:
+    return device.protocol, device.connected, device.last_error is not None
+
+
+def _union(index: dict[Any, Collection[Hashable]], value: Any) -> Collection[Hashable]:
+    """Keys stored under ``value``, or under any of its members for collections."""
+    if not isinstance(value, (set, frozenset, list, tuple)):
+        return index.get(value, ())
+    return set().union(*(index[v] for v in value if v in index))
+
+
+def _intersect(groups: list[Collection[Hashable]]) -> Collection[Hashable]:
+    if len(groups) == 1:
+        return groups[0]
+    # Start from the smallest group; set and dict-view intersections run in C
+    # and iterate the smaller operand.
+    groups.sort(key=len)
+    result = set(groups[0])
+    for group in groups[1:]:
+        result = result & (group.keys() if isinstance(group, dict) else group)
+    return result
+
+
+class GatewayIndex:
+    """Gateways and their devices with secondary indexes for fast filtering.
+
+    Gateway-level indexes cover ``status``, ``project_id`` and
+    ``firmware_version``; device-level ones cover ``protocol``, ``connected``
+    and ``has_error``. Filters combine with AND, a collection value matches
+    any of its members, and results can be ordered by ``last_seen_at``:
+
+    >>> index = GatewayIndex(client.gateways.list())
+    >>> index.query(status="offline", firmware_below="0.6", order_by="-last_seen_at")
+    >>> index.devices(has_error=True, protocol={"modbus", "mqtt"})
+
+    :meth:`apply_event` folds telemetry events into the indexed records,
+    replacing them with updated copies.
+    """
+
+    def __init__(self, gateways: Iterable[Gateway] = ()):
+        self._gateways: dict[str, Gateway] = {}
+        self._fields: dict[str, dict[Any, set[str]]] = {
+            field: {} for field in _GATEWAY_FIELDS
+        }
+        self._device_fields: dict[str, dict[Any, dict[str, int]]] = {
+            field: {} for field in _DEVICE_FIELDS
+        }
+        self._device_index: dict[str, dict[Any, set[_DeviceKey]]] = {
+            field: {} for field in _DEVICE_FIELDS
+        }
+        self._devices: dict[_DeviceKey, Device] = {}
+        self._device_keys: dict[str, list[_DeviceKey]] = {}
+        # Device id -> ids of the gateways that have a device with it.
+        self._device_gateways: dict[str, dict[str, None]] = {}
+        self._seen: dict[str, float] = {}
+        self._by_seen: list[tuple[float, str]] = []
+        for gateway in gateways:
+            self.upsert(gateway)
+
+    def __len__(self) -> int:
+        return len(self._gateways)
+
+    def __iter__(self) -> Iterator[Gateway]:
+        return iter(list(self._gateways.values()))
+
+    def __contains__(self, gateway_id: object) -> bool:
+        return gateway_id in self._gateways
+
+    def get(self, gateway_id: str) -> Gateway | None:
+        return self._gateways.get(gateway_id)
+
+    def device(self, device_id: str, gateway_id: str | None = None) -> Device | None:
+        """The device with ``device_id``, on ``gateway_id`` if given.
+
+        Device ids are only unique per gateway; without ``gateway_id`` the
+        device of the first indexed gateway having that id is returned.
+        """
+        if gateway_id is None:
+            gateway_id = next(iter(self._device_gateways.get(device_id, ())), "")
+        return self._devices.get((gateway_id, device_id))
+
+    def upsert(self, gateway: Gateway) -> None:
+        key = gateway_key(gateway)
+        self.remove(key)
+        self._gateways[key] = gateway
+        self._add_indexes(key, gateway)
+
+    def remove(self, gateway_id: str) -> Gateway | None:
+        gateway = self._gateways.pop(gateway_id, None)
+        if gateway is not None:
+            self._drop_indexes(gateway_id, gateway)
+        return gateway
+
+    def query(
+        self,
+        *,
+        order_by: str | None = None,
+        limit: int | None = None,
+        **filters: Any,
+    ) -> list[Gateway]:
+        """Gateways matching every filter.
+
+        Besides the indexed fields, ``firmware_below`` and
+        ``firmware_at_least`` compare versions numerically. Device filters
+        match gateways with at least one such device. ``order_by`` is
+        ``"last_seen_at"`` or ``"-last_seen_at"`` (newest first).
+        """
+        if order_by is not None and order_by not in _ORDERS:
+            raise ValueError(f"Cannot order by {order_by!r}; use one of {_ORDERS}")
+        keys = self._match(filters)
+        if keys is None:
+            keys = self._gateways.keys()
+        if order_by is None:
+            result = [self._gateways[key] for key in keys]
+        else:
+            result = self._ordered(keys, descending=order_by.startswith("-"))
+        return result if limit is None else result[:limit]
+
+    def devices(self, **filters: Any) -> list[Device]:
+        """Devices matching the device filters, on gateways matching the rest."""
+        groups = [
+            _union(self._device_index[field], filters.pop(field))
+            for field in _DEVICE_FIELDS
+            if field in filters
+        ]
+        gateways = self._match(filters)
+        if gateways is not None:
+            groups.append({dk for key in gateways for dk in self._device_keys[key]})
+        keys = _intersect(groups) if groups else self._devices.keys()
+        return [self._devices[key] for key in keys]
+
+    def apply_event(self, event: TelemetryEvent | Mapping[str, Any]) -> bool:
+        """Update device state and ``last_seen_at`` from a telemetry event.
+
+        Returns ``False`` when the event is for a gateway not in the index.
+        """
+        data = event.data if isinstance(event, TelemetryEvent) else event["data"]
+        gateway = self._gateways.get(data.get("gateway_id") or "")
+        if gateway is None:
+            return False
+        key = gateway_key(gateway)
+        timestamp = epoch_seconds(data.get("timestamp"))
+        if timestamp is not None:
+            seen = datetime.fromtimestamp(timestamp, timezone.utc)
+        else:
+            seen = gateway.last_seen_at
+        # Updated copies replace the records, which callers may share.
+        devices = list(gateway.devices)
+        positions = {device.name: i for i, device in enumerate(devices)}
+        for name, state in (data.get("devices") or {}).items():
+            position = positions.get(name)
+            if position is None:
+                position = positions[name] = len(devices)
+                devices.append(Device(name=name, gateway_id=key))
+            update = {
+                f: state[f]
+                for f in ("connected", "protocol", "last_error")
+                if f in state
+            }
+            update["last_seen_at"] = seen
+            devices[position] = devices[position].model_copy(update=update)
+        updated = gateway.model_copy(update={"devices": devices, "last_seen_at": seen})
+        self._drop_indexes(key, gateway)
+        self._gateways[key] = updated
+        self._add_indexes(key, updated)
+        return True
+
+    def _match(self, filters: dict[str, Any]) -> Collection[str] | None:
+        """Gateway ids satisfying ``filters``, or ``None`` when unfiltered."""
+        groups: list[Collection[str]] = []
+        for field, value in filters.items():
+            if field in self._fields:
+                groups.append(_union(self._fields[field], value))
+            elif field in self._device_fields:
+                groups.append(_union(self._device_fields[field], value))
+            elif field in _FIRMWARE_BOUNDS:
+                limit, below = _version_key(value), field == "firmware_below"
+                versions = self._fields["firmware_version"]
+                groups.append(
+                    set().union(
+                        *(
+                            keys
+                            for version, keys in versions.items()
+                            if version is not None
+                            and (_version_key(version) < limit) == below
+                        )
+                    )
+                )
+            else:
+                raise ValueError(f"Cannot filter on {field!r}")
+        return _intersect(groups) if groups else None
+
+    def _ordered(self, keys: Collection[str], *, descending: bool) -> list[Gateway]:
+        gateways = self._gateways
+        if len(keys) * 4 < len(gateways):
+            # Few matches: sorting them beats walking the whole order.
+            seen = self._seen
+            ordered = sorted(sorted(keys), key=seen.__getitem__)
+        else:
+            ordered = [k for _, k in self._by_seen if k in keys]
+        if descending:
+            ordered.reverse()
+        return [gateways[key] for key in ordered]
+
+    def _add_indexes(self, key: str, gateway: Gateway) -> None:
+        for field in _GATEWAY_FIELDS:
+            self._fields[field].setdefault(getattr(gateway, field), set()).add(key)
+        device_keys = []
+        for position, device in enumerate(gateway.devices):
+            device_id = device.device_id or device.id
+            device_key: _DeviceKey = (key, device_id or position)
+            if device_key in self._devices:
+                device_key = (key, position)  # repeated on this gateway
+            elif device_id:
+                self._device_gateways.setdefault(device_id, {})[key] = None
+            device_keys.append(device_key)
+            self._devices[device_key] = device
+            for field, value in zip(_DEVICE_FIELDS, _device_values(device)):
+                # Counts how many of the gateway's devices have this value.
+                by_gateway = self._device_fields[field].setdefault(value, {})
+                by_gateway[key] = by_gateway.get(key, 0) + 1
+                self._device_index[field].setdefault(value, set()).add(device_key)
+        self._device_keys[key] = device_keys
+        seen = self._seen[key] = _seen_key(gateway.last_seen_at)
+        insort(self._by_seen, (seen, key))
+
+    def _drop_indexes(self, key: str, gateway: Gateway) -> None:
+        for field in _GATEWAY_FIELDS:
+            value = getattr(gateway, field)
+            ids = self._fields[field][value]
+            ids.discard(key)
+            if not ids:
+                del self._fields[field][value]
+        for device_key in self._device_keys.pop(key):
+            device = self._devices.pop(device_key)
+            if isinstance(device_key[1], str):
+                owners = self._device_gateways[device_key[1]]
+                del owners[key]
+                if not owners:
+                    del self._device_gateways[device_key[1]]
+            for field, value in zip(_DEVICE_FIELDS, _device_values(device)):
+                by_gateway = self._device_fields[field][value]
+                by_gateway[key] -= 1
+                if not by_gateway[key]:
+                    del by_gateway[key]
+                if not by_gateway:
+                    del self._device_fields[field][value]
+                device_keys = self._device_index[field][value]
+                device_keys.discard(device_key)
+                if not device_keys:
+                    del self._device_index[field][value]
+        entry = (self._seen.pop(key), key)
+        del self._by_seen[bisect_left(self._by_seen, entry)]
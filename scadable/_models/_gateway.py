@@ -3,12 +3,23 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
+from pydantic import AliasChoices, Field
+
 from ._base import ScadableModel
 
 
+def _either(name: str, other: str) -> Any:
+    """A field read from ``name``, or from ``other`` when ``name`` is absent.
+
+    Lets duplicated fields fill each other inside pydantic-core, with no
+    per-item Python validator.
+    """
+    return Field(None, validation_alias=AliasChoices(name, other))
+
+
 class Device(ScadableModel):
-    device_id: str | None = None
-    id: str | None = None
+    device_id: str | None = _either("device_id", "id")
+    id: str | None = _either("id", "device_id")
     name: str | None = None
     status: str | None = None
     protocol: str | None = None
@@ -19,12 +30,12 @@ class Device(ScadableModel):
 
 
 class Gateway(ScadableModel):
-    id: str | None = None
-    gateway_id: str | None = None
+    id: str | None = _either("id", "gateway_id")
+    gateway_id: str | None = _either("gateway_id", "id")
     name: str
     status: str = "unknown"
-    firmware_version: str | None = None
-    version: str | None = None
+    firmware_version: str | None = _either("firmware_version", "version")
+    version: str | None = _either("version", "firmware_version")
     project_id: str | None = None
     os: str | None = None
     arch: str | None = None
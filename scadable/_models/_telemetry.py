@@ -9,3 +9,13 @@ class TelemetryEvent(ScadableModel):
     type: str
     data: dict[str, Any] = {}
     task_id: str | None = None
+
+
+def epoch_seconds(value: Any) -> float | None:
+    """An event ``timestamp`` in seconds, or ``None`` if it isn't a number.
+
+    Values above ``1e11`` (the year 5138 in seconds) are milliseconds.
+    """
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return None
+    return value / 1000 if value > 1e11 else value
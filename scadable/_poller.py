@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Hashable, Iterable, Mapping
+
+from ._exceptions import FATAL_ERRORS, NotFoundError
+from ._fleet import HEARTBEAT_FIELDS, ChangeCallback, FleetChange, differs
+from ._models._gateway import Gateway
+from ._ratelimit import TokenBucket
+
+if TYPE_CHECKING:
+    from ._resources._gateways import AsyncGateways
+
+# Scale a gateway's interval by its status: degraded ones are watched more
+# closely, offline ones rarely change until they come back.
+_STATUS_FACTORS = {"degraded": 0.5, "offline": 2.0}
+
+
+class TimerWheel:
+    """Hashed timing wheel: O(1) schedule and cancel, work per tick only.
+
+    Deadlines are rounded up to whole ticks. Entries further away than one
+    revolution share a slot with nearer ones and are skipped until due.
+    """
+
+    def __init__(self, tick: float, slots: int = 512, *, now: float = 0.0):
+        if tick <= 0:
+            raise ValueError("tick must be positive")
+        self.tick = tick
+        self._slots: list[dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._slot_of: dict[Hashable, int] = {}
+        self._start = now
+        self._current = 0
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: Hashable, delay: float) -> None:
+        """(Re)schedule ``key`` to fire ``delay`` seconds after the last advance."""
+        self.cancel(key)
+        due = self._current + max(1, math.ceil(delay / self.tick))
+        slot = due % len(self._slots)
+        self._slots[slot][key] = due
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self, now: float) -> list[Hashable]:
+        """Move the wheel to ``now`` and return the keys that became due."""
+        # The epsilon keeps float error from landing a whole tick early.
+        target = int((now - self._start) / self.tick + 1e-9)
+        if target <= self._current:
+            return []
+        size = len(self._slots)
+        # After a long stall every slot is visited once, not once per tick.
+        first = max(self._current + 1, target - size + 1)
+        expired = []
+        for tick in range(first, target + 1):
+            slot = self._slots[tick % size]
+            due = [key for key, at in slot.items() if at <= target]
+            for key in due:
+                del slot[key]
+                del self._slot_of[key]
+            expired.extend(due)
+        self._current = target
+        return expired
+
+
+@dataclass
+class PollStats:
+    polls: int = 0
+    changes: int = 0
+    errors: int = 0
+    callback_errors: int = 0
+    throttled: float = 0.0  # seconds spent waiting for the request budget
+
+
+@dataclass
+class _Target:
+    interval: float
+    gateway: Gateway | None = None
+
+
+class GatewayPoller:
+    """Polls gateways at intervals that follow how often each one changes.
+
+    A gateway's interval halves when a poll finds a change and grows by half
+    when it does not, within ``min_interval``/``max_interval``, and is scaled
+    by ``status_factors`` for its last status. Each delay is jittered by
+    ``±jitter`` so gateways added together drift apart. All polls share a
+    token bucket of ``requests_per_second`` (plus ``burst``), so a large
+    fleet never exceeds the request budget; polls past it wait their turn.
+
+    Callbacks receive a :class:`FleetChange` only when a gateway is first
+    seen, changed (ignoring ``ignore_fields``, by default the ``last_seen_at``
+    of the gateway and its devices) or returns 404. Only
+    authentication errors stop the poller: other failed polls, e.g. a record
+    that fails validation, count in ``stats.errors`` and are retried, and a
+    callback that raises is reported to the event loop's exception handler
+    without affecting the others.
+
+    >>> poller = client.gateways.poll(ids, requests_per_second=20)
+    >>> poller.on_change(lambda c: print(c.gateway_id, c.gateway.status))
+    >>> async with poller:
+    ...     await asyncio.sleep(3600)
+    """
+
+    def __init__(
+        self,
+        gateways: AsyncGateways,
+        gateway_ids: Iterable[str] = (),
+        *,
+        interval: float = 30.0,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        jitter: float = 0.1,
+        requests_per_second: float = 10.0,
+        burst: float | None = None,
+        concurrency: int = 16,
+        status_factors: Mapping[str, float] | None = None,
+        ignore_fields: Iterable[str] = HEARTBEAT_FIELDS,
+        tick: float = 0.1,
+        seed: int | None = None,
+    ):
+        if not 0 < min_interval <= interval <= max_interval:
+            raise ValueError("need 0 < min_interval <= interval <= max_interval")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be in [0, 1)")
+        self.stats = PollStats()
+        self._gateways = gateways
+        self._interval = interval
+        self._min = min_interval
+        self._max = max_interval
+        self._jitter = jitter
+        self._factors = dict(
+            _STATUS_FACTORS if status_factors is None else status_factors
+        )
+        self._ignore = set(ignore_fields)
+        self._bucket = TokenBucket(requests_per_second, burst)
+        self._concurrency = concurrency
+        self._tick = tick
+        self._rng = random.Random(seed)
+        self._targets: dict[str, _Target] = {}
+        self._wheel: TimerWheel | None = None
+        self._callbacks: list[ChangeCallback] = []
+        self._task: asyncio.Task[None] | None = None
+        for gateway_id in gateway_ids:
+            self.add(gateway_id)
+
+    @property
+    def gateways(self) -> dict[str, Gateway]:
+        """Last polled record of every gateway seen so far."""
+        return {
+            gid: t.gateway for gid, t in self._targets.items() if t.gateway is not None
+        }
+
+    def interval(self, gateway_id: str) -> float:
+        """Current (unjittered) polling interval of ``gateway_id``."""
+        target = self._targets[gateway_id]
+        return self._effective(target)
+
+    def on_change(self, callback: ChangeCallback) -> ChangeCallback:
+        """Call ``callback`` with every :class:`FleetChange`; usable as a decorator."""
+        self._callbacks.append(callback)
+        return callback
+
+    def add(self, gateway_id: str, *, interval: float | None = None) -> None:
+        """Start polling ``gateway_id``; the first poll lands within one interval."""
+        target = _Target(min(max(interval or self._interval, self._min), self._max))
+        self._targets[gateway_id] = target
+        if self._wheel is not None:
+            self._wheel.schedule(gateway_id, self._rng.uniform(0, target.interval))
+
+    def remove(self, gateway_id: str) -> None:
+        self._targets.pop(gateway_id, None)
+        if self._wheel is not None:
+            self._wheel.cancel(gateway_id)
+
+    async def run(self) -> None:
+        """Poll until cancelled; raises on authentication errors."""
+        loop = asyncio.get_running_loop()
+        wheel = self._wheel = TimerWheel(self._tick, now=loop.time())
+        for gateway_id, target in self._targets.items():
+            # Spread the first round over one interval instead of a burst.
+            wheel.schedule(gateway_id, self._rng.uniform(0, target.interval))
+        slots = asyncio.Semaphore(self._concurrency)
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            while True:
+                for task in [t for t in tasks if t.done()]:
+                    tasks.discard(task)
+                    task.result()
+                for gateway_id in wheel.advance(loop.time()):
+                    self.stats.throttled += await self._bucket.acquire()
+                    await slots.acquire()
+                    task = asyncio.create_task(self._poll(str(gateway_id)))
+                    task.add_done_callback(lambda _: slots.release())
+                    tasks.add(task)
+                await asyncio.sleep(self._tick)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._wheel = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> GatewayPoller:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.stop()
+
+    async def _poll(self, gateway_id: str) -> None:
+        self.stats.polls += 1
+        try:
+            gateway = await self._gateways.get(gateway_id)
+        except NotFoundError:
+            target = self._targets.pop(gateway_id, None)
+            if target is not None and target.gateway is not None:
+                gone = target.gateway
+                self._notify(FleetChange("removed", gateway_id, gone, gone))
+            return
+        except FATAL_ERRORS:
+            raise
+        except Exception:
+            # Includes records that fail validation, not only API errors.
+            self.stats.errors += 1
+            self._reschedule(gateway_id, changed=False)
+            return
+        target = self._targets.get(gateway_id)
+        if target is None:  # removed while in flight
+            return
+        previous, target.gateway = target.gateway, gateway
+        changed = previous is None or differs(previous, gateway, self._ignore)
+        self._reschedule(gateway_id, changed=changed)
+        if changed:
+            self.stats.changes += 1
+            kind = "added" if previous is None else "changed"
+            self._notify(FleetChange(kind, gateway_id, gateway, previous))
+
+    def _reschedule(self, gateway_id: str, *, changed: bool) -> None:
+        target = self._targets.get(gateway_id)
+        if target is None or self._wheel is None:
+            return
+        # Multiplicative decrease on change, gentler increase while idle.
+        factor = 0.5 if changed else 1.5
+        target.interval = min(max(target.interval * factor, self._min), self._max)
+        delay = self._effective(target)
+        if self._jitter:
+            delay *= self._rng.uniform(1 - self._jitter, 1 + self._jitter)
+        self._wheel.schedule(gateway_id, delay)
+
+    def _effective(self, target: _Target) -> float:
+        status = target.gateway.status if target.gateway is not None else None
+        interval = target.interval * self._factors.get(status or "", 1.0)
+        return min(max(interval, self._min), self._max)
+
+    def _notify(self, change: FleetChange) -> None:
+        for callback in self._callbacks:
+            try:
+                callback(change)
+            except Exception as exc:
+                self.stats.callback_errors += 1
+                asyncio.get_running_loop().call_exception_handler(
+                    {
+                        "message": f"GatewayPoller callback {callback!r} failed",
+                        "exception": exc,
+                    }
+                )
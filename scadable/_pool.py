@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar
+
+import httpx
+
+from ._client import AsyncScadable, Scadable
+from ._config import resolve_base_url
+from ._transport._http import _accept_encoding
+
+if TYPE_CHECKING:
+    import asyncio
+
+C = TypeVar("C", Scadable, AsyncScadable)
+
+
+class _Tenants(Generic[C]):
+    """Clients by API key, least recently used first."""
+
+    def __init__(
+        self,
+        factory: Callable[[str], C],
+        idle_timeout: float | None,
+        max_tenants: int | None,
+        clock: Callable[[], float],
+    ):
+        self._factory = factory
+        self._idle_timeout = idle_timeout
+        self._max_tenants = max_tenants
+        self._clock = clock
+        self._clients: OrderedDict[str, tuple[C, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def get(self, api_key: str) -> tuple[C, list[C]]:
+        """The client for ``api_key`` and the clients evicted to make room."""
+        if not api_key:
+            raise ValueError("api_key is required")
+        now = self._clock()
+        with self._lock:
+            entry = self._clients.pop(api_key, None)
+            client = self._factory(api_key) if entry is None else entry[0]
+            self._clients[api_key] = (client, now)
+            return client, self._evict(now)
+
+    def evict_idle(self) -> list[C]:
+        with self._lock:
+            return self._evict(self._clock())
+
+    def _evict(self, now: float) -> list[C]:
+        clients, evicted = self._clients, []
+        while clients:
+            key, (client, used) = next(iter(clients.items()))
+            over = self._max_tenants is not None and len(clients) > self._max_tenants
+            idle = self._idle_timeout is not None and now - used > self._idle_timeout
+            if not (over or idle):
+                break
+            del clients[key]
+            evicted.append(client)
+        self.evicted += len(evicted)
+        return evicted
+
+
+class _PoolBase(Generic[C]):
+    _tenants: _Tenants[C]
+
+    def __len__(self) -> int:
+        return len(self._tenants._clients)
+
+    def __contains__(self, api_key: object) -> bool:
+        return api_key in self._tenants._clients
+
+    @property
+    def evicted(self) -> int:
+        """Tenants dropped so far for being idle or over ``max_tenants``."""
+        return self._tenants.evicted
+
+
+def _limits(max_connections: int, max_keepalive: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_keepalive
+    )
+
+
+class ScadablePool(_PoolBase[Scadable]):
+    """:class:`Scadable` clients for many API keys over one connection pool.
+
+    Every tenant's requests go through a single ``httpx.Client`` with the
+    API key set per request. ``rate_limit`` (requests/second, with
+    ``rate_limit_burst``) and ``max_concurrency`` apply to each key
+    separately. Tenants unused for ``idle_timeout`` seconds, or beyond the
+    ``max_tenants`` most recently used, are dropped. Other ``options`` are
+    passed to every client.
+
+    >>> pool = ScadablePool(rate_limit=5, max_concurrency=4, idle_timeout=600)
+    >>> for key in customer_keys:
+    ...     print(len(pool.client(key).gateways.list()))
+    >>> pool.close()
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        rate_limit: float | None = None,
+        rate_limit_burst: float | None = None,
+        max_concurrency: int | None = None,
+        idle_timeout: float | None = 600.0,
+        max_tenants: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        **options: Any,
+    ):
+        self.base_url = resolve_base_url(base_url)
+        self.http_client = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout,
+            headers={"Accept-Encoding": _accept_encoding()},
+            limits=_limits(max_connections, max_keepalive_connections),
+        )
+        options.update(
+            base_url=self.base_url,
+            timeout=timeout,
+            rate_limit=rate_limit,
+            rate_limit_burst=rate_limit_burst,
+            max_concurrency=max_concurrency,
+        )
+        self._tenants = _Tenants(
+            lambda key: Scadable(key, http_client=self.http_client, **options),
+            idle_timeout,
+            max_tenants,
+            clock,
+        )
+
+    def client(self, api_key: str) -> Scadable:
+        """The client for ``api_key``, created on first use."""
+        client, evicted = self._tenants.get(api_key)
+        for old in evicted:
+            old.close()
+        return client
+
+    def evict_idle(self) -> int:
+        """Drop and close tenants idle for longer than ``idle_timeout``.
+
+        Returns how many were dropped. Also runs on every :meth:`client`
+        call. A closed tenant's requests keep working for whoever still holds
+        it, since the connection pool is shared, but the next :meth:`client`
+        call for its key starts a fresh one with fresh limits.
+        """
+        evicted = self._tenants.evict_idle()
+        for client in evicted:
+            client.close()
+        return len(evicted)
+
+    def close(self) -> None:
+        self._tenants._clients.clear()
+        self.http_client.close()
+
+    def __enter__(self) -> ScadablePool:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+class AsyncScadablePool(_PoolBase[AsyncScadable]):
+    """:class:`ScadablePool` for :class:`AsyncScadable` clients.
+
+    >>> async with AsyncScadablePool(rate_limit=5) as pool:
+    ...     results = await asyncio.gather(
+    ...         *(pool.client(key).gateways.list() for key in customer_keys)
+    ...     )
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str | None = None,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        rate_limit: float | None = None,
+        rate_limit_burst: float | None = None,
+        max_concurrency: int | None = None,
+        idle_timeout: float | None = 600.0,
+        max_tenants: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        **options: Any,
+    ):
+        self.base_url = resolve_base_url(base_url)
+        self.http_client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            headers={"Accept-Encoding": _accept_encoding()},
+            limits=_limits(max_connections, max_keepalive_connections),
+        )
+        options.update(
+            base_url=self.base_url,
+            timeout=timeout,
+            rate_limit=rate_limit,
+            rate_limit_burst=rate_limit_burst,
+            max_concurrency=max_concurrency,
+        )
+        self._tenants = _Tenants(
+            lambda key: AsyncScadable(key, http_client=self.http_client, **options),
+            idle_timeout,
+            max_tenants,
+            clock,
+        )
+        self._closing: set[asyncio.Future[None]] = set()
+
+    def client(self, api_key: str) -> AsyncScadable:
+        """The client for ``api_key``, created on first use.
+
+        Tenants evicted by the call are closed in the background.
+        """
+        import asyncio
+
+        client, evicted = self._tenants.get(api_key)
+        if evicted:
+            closing = asyncio.ensure_future(self._close_all(evicted))
+            self._closing.add(closing)
+            closing.add_done_callback(self._closing.discard)
+        return client
+
+    async def evict_idle(self) -> int:
+        """Drop and close tenants idle for longer than ``idle_timeout``.
+
+        Returns how many were dropped. Also runs on every :meth:`client`
+        call. Closing releases a tenant's pre-opened streams; its requests
+        keep working for whoever still holds it, since the connection pool is
+        shared, but the next :meth:`client` call for its key starts a fresh
+        one with fresh limits.
+        """
+        evicted = self._tenants.evict_idle()
+        await self._close_all(evicted)
+        return len(evicted)
+
+    async def close(self) -> None:
+        import asyncio
+
+        clients = [client for client, _ in self._tenants._clients.values()]
+        self._tenants._clients.clear()
+        await asyncio.gather(*self._closing)
+        await self._close_all(clients)
+        await self.http_client.aclose()
+
+    @staticmethod
+    async def _close_all(clients: list[AsyncScadable]) -> None:
+        for client in clients:
+            # Closes open streams; the shared HTTP client is not theirs.
+            await client.close()
+
+    async def __aenter__(self) -> AsyncScadablePool:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.close()
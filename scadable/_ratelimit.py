@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``.
+
+    Starts full. Safe to share between threads; :meth:`acquire` waits
+    without blocking the event loop, :meth:`acquire_sync` blocks the thread.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available now."""
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` would be available."""
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait for ``tokens`` and take them; returns the seconds waited."""
+        import asyncio
+
+        waited = 0.0
+        while not self.try_acquire(tokens):
+            delay = self.delay(tokens)
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    def acquire_sync(self, tokens: float = 1.0) -> float:
+        """Blocking :meth:`acquire` for threads."""
+        waited = 0.0
+        while not self.try_acquire(tokens):
+            delay = self.delay(tokens)
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed, self._updated = now - self._updated, now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
@@ -1,6 +1,12 @@
+from ._devices import Devices, AsyncDevices
+from ._fleet import Fleet, AsyncFleet
 from ._gateways import Gateways, AsyncGateways
 
 __all__ = [
     "Gateways",
     "AsyncGateways",
+    "Fleet",
+    "AsyncFleet",
+    "Devices",
+    "AsyncDevices",
 ]
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from typing import Any, TypeVar, Type
+import re
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterator, TypeVar, Type
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from .._transport._base import Response
+from .._transport._jsonstream import ArrayItemScanner
 
 T = TypeVar("T", bound=BaseModel)
 
+# A body that is a bare JSON array; anchored, so only leading bytes are read.
+_ARRAY_BODY = re.compile(rb"\s*\[")
+
 
 def _extract_list(data: Any) -> list[Any]:
     """Extract a list from an API response — handles raw arrays, wrapped objects, etc."""
@@ -23,6 +29,31 @@ def _extract_list(data: Any) -> list[Any]:
     return []
 
 
+def _validate(model: Type[T], resp: Response) -> T:
+    # Validating the raw body skips building an intermediate dict.
+    if resp.content:
+        return model.model_validate_json(resp.content)
+    return model.model_validate(resp.data)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[T]) -> TypeAdapter[list[T]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def _validate_list(model: Type[T], resp: Response) -> list[T]:
+    """Validate a whole list in one call instead of one call per item.
+
+    Bare arrays are validated straight from the raw bytes; wrapped or
+    single-object bodies go through :func:`_extract_list` first.
+    """
+    adapter = _list_adapter(model)
+    content = resp.content
+    if content and _ARRAY_BODY.match(content):
+        return adapter.validate_json(content)
+    return adapter.validate_python(_extract_list(resp.data))
+
+
 class SyncResource:
     def __init__(self, transport: Any):
         self._transport = transport
@@ -31,13 +62,34 @@ class SyncResource:
         self, path: str, *, model: Type[T], params: dict[str, Any] | None = None
     ) -> T:
         resp: Response = self._transport.request("GET", path, params=params)
-        return model.model_validate(resp.data)
+        return _validate(model, resp)
+
+    def _patch(self, path: str, *, model: Type[T], json: dict[str, Any]) -> T:
+        resp: Response = self._transport.request("PATCH", path, json=json)
+        return _validate(model, resp)
 
     def _list(
         self, path: str, *, model: Type[T], params: dict[str, Any] | None = None
     ) -> list[T]:
         resp: Response = self._transport.request("GET", path, params=params)
-        return [model.model_validate(item) for item in _extract_list(resp.data)]
+        return _validate_list(model, resp)
+
+    def _iter_list(
+        self, path: str, *, model: Type[T], params: dict[str, Any] | None = None
+    ) -> Iterator[T]:
+        """Like ``_list`` but validates items while the body is still arriving."""
+        for item in self._iter_raw(path, params=params):
+            yield model.model_validate_json(item)
+
+    def _iter_raw(
+        self, path: str, *, params: dict[str, Any] | None = None
+    ) -> Iterator[bytes]:
+        """Raw JSON bytes of each list item, as the body arrives."""
+        scanner = ArrayItemScanner()
+        with self._transport.stream("GET", path, params=params) as chunks:
+            for chunk in chunks:
+                yield from scanner.feed(chunk)
+        yield from scanner.close()
 
 
 class AsyncResource:
@@ -48,10 +100,33 @@ class AsyncResource:
         self, path: str, *, model: Type[T], params: dict[str, Any] | None = None
     ) -> T:
         resp: Response = await self._transport.request("GET", path, params=params)
-        return model.model_validate(resp.data)
+        return _validate(model, resp)
+
+    async def _patch(self, path: str, *, model: Type[T], json: dict[str, Any]) -> T:
+        resp: Response = await self._transport.request("PATCH", path, json=json)
+        return _validate(model, resp)
 
     async def _list(
         self, path: str, *, model: Type[T], params: dict[str, Any] | None = None
     ) -> list[T]:
         resp: Response = await self._transport.request("GET", path, params=params)
-        return [model.model_validate(item) for item in _extract_list(resp.data)]
+        return _validate_list(model, resp)
+
+    async def _iter_list(
+        self, path: str, *, model: Type[T], params: dict[str, Any] | None = None
+    ) -> AsyncIterator[T]:
+        """Like ``_list`` but validates items while the body is still arriving."""
+        async for item in self._iter_raw(path, params=params):
+            yield model.model_validate_json(item)
+
+    async def _iter_raw(
+        self, path: str, *, params: dict[str, Any] | None = None
+    ) -> AsyncIterator[bytes]:
+        """Raw JSON bytes of each list item, as the body arrives."""
+        scanner = ArrayItemScanner()
+        async with self._transport.stream("GET", path, params=params) as chunks:
+            async for chunk in chunks:
+                for item in scanner.feed(chunk):
+                    yield item
+        for item in scanner.close():
+            yield item
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
+
+from .._models._gateway import Device, Gateway
+from ._base import AsyncResource, SyncResource
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def _gateway_id(gateway: Gateway) -> str | None:
+    """The id to fetch devices by; a gateway listed without one is skipped."""
+    return gateway.gateway_id or gateway.id
+
+
+def _owned(devices: list[Device], gateway_id: str) -> list[Device]:
+    for device in devices:
+        if device.gateway_id is None:
+            device.gateway_id = gateway_id
+    return devices
+
+
+def _check_window(window: int) -> None:
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+
+class Devices(SyncResource):
+    def iter_all(self, *, window: int = 8) -> Iterator[Device]:
+        """Every device in the fleet, fetched ``window`` gateways at a time.
+
+        The gateway listing is parsed as it streams in and feeds per-gateway
+        ``devices`` requests on worker threads sharing the client's connection
+        pool. Devices are yielded as each gateway's response arrives, so order
+        follows completion, not the listing. At most ``window`` responses are
+        held at once. Leaving the loop early cancels the requests not yet
+        started and does not wait for those in flight.
+
+        >>> for device in client.devices.iter_all(window=16):
+        ...     print(device.gateway_id, device.name)
+        """
+        _check_window(window)
+        gateways = self._iter_list("/v1/gateways", model=Gateway)
+        pending: set[Future[list[Device]]] = set()
+        executor = ThreadPoolExecutor(window, thread_name_prefix="scadable-devices")
+        try:
+            listing_done = False
+            while True:
+                while not listing_done and len(pending) < window:
+                    gateway = next(gateways, None)
+                    if gateway is None:
+                        listing_done = True
+                    elif _gateway_id(gateway) is not None:
+                        pending.add(executor.submit(self._fetch, _gateway_id(gateway)))
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            gateways.close()
+
+    def _fetch(self, gateway_id: str) -> list[Device]:
+        path = f"/v1/gateways/{gateway_id}/devices"
+        return _owned(self._list(path, model=Device), gateway_id)
+
+
+class AsyncDevices(AsyncResource):
+    async def iter_all(self, *, window: int = 8) -> AsyncIterator[Device]:
+        """Every device in the fleet, fetched ``window`` gateways at a time.
+
+        Same pipeline as the sync client, with tasks instead of threads.
+        Leaving the loop early cancels the requests still in flight.
+        """
+        import asyncio
+
+        _check_window(window)
+        gateways = self._iter_list("/v1/gateways", model=Gateway).__aiter__()
+        pending: set[asyncio.Task[list[Device]]] = set()
+        done: set[asyncio.Task[list[Device]]] = set()
+        try:
+            listing_done = False
+            while True:
+                while not listing_done and len(pending) < window:
+                    try:
+                        gateway = await gateways.__anext__()
+                    except StopAsyncIteration:
+                        listing_done = True
+                    else:
+                        gateway_id = _gateway_id(gateway)
+                        if gateway_id is not None:
+                            fetch = self._fetch(gateway_id)
+                            pending.add(asyncio.ensure_future(fetch))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    for device in task.result():
+                        yield device
+        finally:
+            for task in pending:
+                task.cancel()
+            # Also retrieves errors of finished tasks that were not raised.
+            await asyncio.gather(*pending, *done, return_exceptions=True)
+            await gateways.aclose()
+
+    async def _fetch(self, gateway_id: str) -> list[Device]:
+        path = f"/v1/gateways/{gateway_id}/devices"
+        return _owned(await self._list(path, model=Device), gateway_id)
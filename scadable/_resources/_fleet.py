@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .._fleet import ChangeCallback, FleetChange, FleetMirror
+from ._base import AsyncResource, SyncResource
+
+
+def _sync_params(
+    mirror: FleetMirror, since_param: str | None, full: bool
+) -> tuple[dict[str, Any] | None, bool]:
+    """Query params for the next listing and whether it is partial."""
+    if since_param and not full and mirror.cursor is not None:
+        return {since_param: mirror.cursor.isoformat()}, True
+    return None, False
+
+
+def _notify(callbacks: list[ChangeCallback], changes: list[FleetChange]) -> None:
+    for change in changes:
+        for callback in callbacks:
+            callback(change)
+
+
+class Fleet(SyncResource):
+    """Keeps :attr:`mirror` in step with ``/v1/gateways``.
+
+    >>> client.fleet.on_change(lambda c: print(c.kind, c.gateway_id))
+    >>> client.fleet.sync()
+    """
+
+    def __init__(self, transport: Any, *, since_param: str | None = None):
+        super().__init__(transport)
+        self.mirror = FleetMirror()
+        self._since_param = since_param
+        self._callbacks: list[ChangeCallback] = []
+
+    def on_change(self, callback: ChangeCallback) -> ChangeCallback:
+        """Call ``callback`` with every :class:`FleetChange`; usable as a decorator."""
+        self._callbacks.append(callback)
+        return callback
+
+    def sync(self, *, full: bool = False) -> list[FleetChange]:
+        """Refresh the mirror and return what changed since the last sync.
+
+        When the client is configured with ``fleet_since_param`` only records
+        modified after the newest ``last_seen_at`` are fetched; removals are
+        then only noticed on a ``full=True`` sync. Otherwise every sync lists
+        the whole fleet and skips records whose bytes are unchanged.
+        """
+        params, partial = _sync_params(self.mirror, self._since_param, full)
+        diff = self.mirror.diff(partial=partial)
+        for raw in self._iter_raw("/v1/gateways", params=params):
+            diff.add(raw)
+        changes = diff.commit()
+        _notify(self._callbacks, changes)
+        return changes
+
+
+class AsyncFleet(AsyncResource):
+    def __init__(self, transport: Any, *, since_param: str | None = None):
+        super().__init__(transport)
+        self.mirror = FleetMirror()
+        self._since_param = since_param
+        self._callbacks: list[ChangeCallback] = []
+
+    def on_change(self, callback: ChangeCallback) -> ChangeCallback:
+        self._callbacks.append(callback)
+        return callback
+
+    async def sync(self, *, full: bool = False) -> list[FleetChange]:
+        params, partial = _sync_params(self.mirror, self._since_param, full)
+        diff = self.mirror.diff(partial=partial)
+        async for raw in self._iter_raw("/v1/gateways", params=params):
+            diff.add(raw)
+        changes = diff.commit()
+        _notify(self._callbacks, changes)
+        return changes
@@ -1,14 +1,81 @@
 from __future__ import annotations
 
-from typing import Any, AsyncIterator
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator, Mapping
 from contextlib import asynccontextmanager
+from time import perf_counter
 
 from .._models._gateway import Gateway, Device
 from .._models._telemetry import TelemetryEvent
 from ._base import SyncResource, AsyncResource
 
+if TYPE_CHECKING:
+    from .._commands import CommandBatch, CommandResult
+    from .._exceptions import ScadableError
+    from .._poller import GatewayPoller
+    from .._tracker import DeviceTracker
+    from .._transport._background import SyncStream
+    from .._transport._profile import StreamProfile
+
+
+class TelemetryStream:
+    """Async iterator of :class:`TelemetryEvent` over a raw message stream."""
+
+    def __init__(self, raw_stream: Any):
+        self._raw = raw_stream
+
+    @property
+    def stats(self) -> Any:
+        """Byte counters of the underlying connection, when the transport has them."""
+        return getattr(self._raw, "stats", None)
+
+    @property
+    def profile(self) -> StreamProfile | None:
+        """Per-stage timings, when ``stream_profile_rate`` is set."""
+        return getattr(self._raw, "profile", None)
+
+    def __aiter__(self) -> AsyncIterator[TelemetryEvent]:
+        return self._parse()
+
+    async def _parse(self) -> AsyncIterator[TelemetryEvent]:
+        profile = self.profile
+        validate = TelemetryEvent.model_validate
+        async for msg in self._raw:
+            if profile is None or not profile.active:
+                yield validate(msg)
+                continue
+            started = perf_counter()
+            event = validate(msg)
+            validated = perf_counter()
+            profile.validate.record(validated - started)
+            profile.observe_latency(msg)
+            yield event
+            profile.handoff.record(perf_counter() - validated)
+
+
+def _stream_path(gateway_id: str) -> str:
+    return f"/v1/gateways/{gateway_id}/stream"
+
+
+@asynccontextmanager
+async def _open_stream(
+    stream_transport: Any, gateway_id: str
+) -> AsyncIterator[TelemetryStream]:
+    async with stream_transport.connect(_stream_path(gateway_id)) as raw_stream:
+        yield TelemetryStream(raw_stream)
+
 
 class Gateways(SyncResource):
+    def __init__(
+        self,
+        transport: Any,
+        stream_transport: Any = None,
+        *,
+        command_batch_path: str | None = None,
+    ):
+        super().__init__(transport)
+        self._stream_transport = stream_transport
+        self._command_batch_path = command_batch_path
+
     def list(self) -> list[Gateway]:
         return self._list("/v1/gateways", model=Gateway)
 
@@ -18,11 +85,102 @@ class Gateways(SyncResource):
     def devices(self, gateway_id: str) -> list[Device]:
         return self._list(f"/v1/gateways/{gateway_id}/devices", model=Device)
 
+    def iter_list(self) -> Iterator[Gateway]:
+        """Yield gateways as the response streams in, one parsed item at a time."""
+        return self._iter_list("/v1/gateways", model=Gateway)
+
+    def iter_devices(self, gateway_id: str) -> Iterator[Device]:
+        return self._iter_list(f"/v1/gateways/{gateway_id}/devices", model=Device)
+
+    def update(self, gateway_id: str, **fields: Any) -> Gateway:
+        """Change a gateway's ``fields``; returns the updated gateway."""
+        return self._patch(f"/v1/gateways/{gateway_id}", model=Gateway, json=fields)
+
+    def command(
+        self, gateway_id: str, command: str, params: Mapping[str, Any] | None = None
+    ) -> CommandResult:
+        """Send ``command`` to a gateway; the result carries its ``task_id``."""
+        from .._commands import accepted, command_body, command_path
+
+        resp = self._transport.request(
+            "POST",
+            command_path(gateway_id),
+            json=command_body(command, params),
+        )
+        return accepted(gateway_id, resp.data)
+
+    def bulk_command(
+        self,
+        gateway_ids: Iterable[str],
+        command: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        concurrency: int = 16,
+        batch_size: int = 500,
+    ) -> CommandBatch:
+        """Send ``command`` to many gateways, ``concurrency`` requests at a time.
+
+        With the ``command_batch_path`` option set, gateways are sent
+        ``batch_size`` per request instead. Failed requests become results
+        with status ``"error"``; pass stream events to
+        :meth:`CommandBatch.observe` to follow the tasks to completion.
+        """
+        from .._commands import send_commands
+
+        return send_commands(
+            self._transport,
+            gateway_ids,
+            command,
+            params,
+            concurrency=concurrency,
+            batch_path=self._command_batch_path,
+            batch_size=batch_size,
+        )
+
+    def bulk_update(
+        self, updates: Mapping[str, Mapping[str, Any]], *, concurrency: int = 16
+    ) -> dict[str, Gateway | ScadableError]:
+        """:meth:`update` many gateways at once; failures are returned, not raised.
+
+        >>> client.gateways.bulk_update({gid: {"name": f"Pump {gid}"} for gid in ids})
+        """
+        from .._commands import update_gateways
+
+        return update_gateways(self, updates, concurrency=concurrency)
+
+    def stream(
+        self, gateway_id: str, *, max_queue: int = 1024
+    ) -> SyncStream[TelemetryEvent]:
+        """Blocking telemetry stream served by the shared background loop.
+
+        Use it as a context manager so the connection is closed when done:
+
+        >>> with client.gateways.stream("gw-123") as stream:
+        ...     for event in stream:
+        ...         print(event.data)
+        """
+        if not self._stream_transport:
+            raise RuntimeError("Streaming requires a stream transport")
+        # Imported here so sync clients that never stream skip asyncio.
+        from .._transport._background import SyncStream
+
+        transport = self._stream_transport
+        return SyncStream(
+            lambda: _open_stream(transport, gateway_id), max_queue=max_queue
+        )
+
 
 class AsyncGateways(AsyncResource):
-    def __init__(self, transport: Any, stream_transport: Any = None):
+    def __init__(
+        self,
+        transport: Any,
+        stream_transport: Any = None,
+        *,
+        command_batch_path: str | None = None,
+    ):
         super().__init__(transport)
         self._stream_transport = stream_transport
+        self._command_batch_path = command_batch_path
 
     async def list(self) -> list[Gateway]:
         return await self._list("/v1/gateways", model=Gateway)
@@ -33,19 +191,125 @@ class AsyncGateways(AsyncResource):
     async def devices(self, gateway_id: str) -> list[Device]:
         return await self._list(f"/v1/gateways/{gateway_id}/devices", model=Device)
 
+    def iter_list(self) -> AsyncIterator[Gateway]:
+        """Yield gateways as the response streams in, one parsed item at a time."""
+        return self._iter_list("/v1/gateways", model=Gateway)
+
+    def iter_devices(self, gateway_id: str) -> AsyncIterator[Device]:
+        return self._iter_list(f"/v1/gateways/{gateway_id}/devices", model=Device)
+
+    async def update(self, gateway_id: str, **fields: Any) -> Gateway:
+        """Change a gateway's ``fields``; returns the updated gateway."""
+        return await self._patch(
+            f"/v1/gateways/{gateway_id}", model=Gateway, json=fields
+        )
+
+    async def command(
+        self, gateway_id: str, command: str, params: Mapping[str, Any] | None = None
+    ) -> CommandResult:
+        """Send ``command`` to a gateway; the result carries its ``task_id``."""
+        from .._commands import accepted, command_body, command_path
+
+        resp = await self._transport.request(
+            "POST",
+            command_path(gateway_id),
+            json=command_body(command, params),
+        )
+        return accepted(gateway_id, resp.data)
+
+    async def bulk_command(
+        self,
+        gateway_ids: Iterable[str],
+        command: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        concurrency: int = 16,
+        batch_size: int = 500,
+        watch: bool = True,
+    ) -> CommandBatch:
+        """Send ``command`` to many gateways, ``concurrency`` requests at a time.
+
+        With ``watch``, each gateway's stream is opened first and the batch
+        completes tasks from their ``task_id`` events, closing each stream
+        once its task is done. That holds one WebSocket per gateway until
+        its task finishes; for very large batches, split ``gateway_ids`` or
+        pass ``watch=False`` and feed events to :meth:`CommandBatch.observe`.
+        With the ``command_batch_path`` option set, gateways are sent
+        ``batch_size`` per request instead of one each.
+
+        >>> batch = await client.gateways.bulk_command(ids, "set_interval", {"s": 5})
+        >>> await batch.wait(timeout=60)
+        >>> print(len(batch.failed), "failed")
+        """
+        from .._commands import send_commands_async
+
+        return await send_commands_async(
+            self,
+            gateway_ids,
+            command,
+            params,
+            concurrency=concurrency,
+            batch_path=self._command_batch_path,
+            batch_size=batch_size,
+            watch=watch,
+        )
+
+    async def bulk_update(
+        self, updates: Mapping[str, Mapping[str, Any]], *, concurrency: int = 16
+    ) -> dict[str, Gateway | ScadableError]:
+        """:meth:`update` many gateways at once; failures are returned, not raised."""
+        from .._commands import update_gateways_async
+
+        return await update_gateways_async(self, updates, concurrency=concurrency)
+
     @asynccontextmanager
-    async def stream(
-        self, gateway_id: str
-    ) -> AsyncIterator[AsyncIterator[TelemetryEvent]]:
+    async def stream(self, gateway_id: str) -> AsyncIterator[TelemetryStream]:
+        if not self._stream_transport:
+            raise RuntimeError("Streaming requires AsyncScadable client")
+        async with _open_stream(self._stream_transport, gateway_id) as events:
+            yield events
+
+    async def preconnect(self, gateway_id: str) -> None:
+        """Open ``gateway_id``'s stream connection ahead of :meth:`stream`.
+
+        The next ``stream(gateway_id)`` starts on it without a handshake;
+        events sent in between are delivered first.
+        """
         if not self._stream_transport:
             raise RuntimeError("Streaming requires AsyncScadable client")
-        path = f"/v1/gateways/{gateway_id}/stream"  # pragma: no cover
-        async with self._stream_transport.connect(
-            path
-        ) as raw_stream:  # pragma: no cover
+        await self._stream_transport.preconnect(_stream_path(gateway_id))
+
+    def track_devices(
+        self,
+        gateway_id: str,
+        *,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> DeviceTracker:
+        """Device connectivity kept current from the stream instead of polling.
+
+        >>> async with client.gateways.track_devices("gw-123") as tracker:
+        ...     tracker.on_change(lambda c: print(c.device.name, c.changes))
+        ...     await asyncio.sleep(3600)
+        """
+        from .._tracker import DeviceTracker
+
+        return DeviceTracker(
+            self,
+            gateway_id,
+            reconnect_delay=reconnect_delay,
+            max_reconnect_delay=max_reconnect_delay,
+        )
+
+    def poll(self, gateway_ids: Iterable[str] = (), **options: Any) -> GatewayPoller:
+        """Poll gateways at adaptive intervals within a shared request budget.
+
+        ``options`` are passed to :class:`GatewayPoller`.
 
-            async def _parse() -> AsyncIterator[TelemetryEvent]:  # pragma: no cover
-                async for msg in raw_stream:
-                    yield TelemetryEvent.model_validate(msg)
+        >>> async with client.gateways.poll(ids, requests_per_second=20) as poller:
+        ...     poller.on_change(lambda c: print(c.gateway_id, c.kind))
+        ...     await asyncio.sleep(3600)
+        """
+        from .._poller import GatewayPoller
 
-            yield _parse()  # pragma: no cover
+        return GatewayPoller(self, gateway_ids, **options)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass, field
+from time import time
+from typing import Any, Mapping
+
+_RETRY_STATUSES: dict[int, int | None] = {
+    429: None,
+    500: None,
+    502: None,
+    503: None,
+    504: None,
+}
+# Statuses that mean the server did not act on the request.
+_UNPROCESSED_STATUSES = frozenset({429})
+_JITTERS = ("full", "decorrelated", "none")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how the HTTP transports retry a failed request.
+
+    ``statuses`` and ``exceptions`` map what may be retried to how many
+    times; ``None`` means up to ``max_retries``, which itself defaults to the
+    client's ``max_retries``. ``exceptions`` defaults to httpx transport
+    errors. The first matching exception class applies.
+
+    Requests with methods outside ``idempotent_methods`` (and without an
+    ``Idempotency-Key`` header) are only retried when the server cannot have
+    acted on them: connection failures and 429s.
+
+    The retry budget caps retries at ``budget_ratio`` of requests, plus a
+    burst of ``budget_burst``, so an outage doesn't multiply load.
+
+    >>> Scadable(retry=RetryPolicy(statuses={503: 4, 429: 1}, jitter="decorrelated"))
+    """
+
+    max_retries: int | None = None
+    statuses: Mapping[int, int | None] = field(
+        default_factory=lambda: dict(_RETRY_STATUSES)
+    )
+    exceptions: Mapping[type[BaseException], int | None] | None = None
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    jitter: str = "full"
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+    idempotent_methods: frozenset[str] = frozenset(
+        {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    )
+    budget_ratio: float = 0.2
+    budget_burst: int = 10
+
+    def __post_init__(self) -> None:
+        if self.jitter not in _JITTERS:
+            raise ValueError(f"jitter must be one of {_JITTERS}, not {self.jitter!r}")
+
+
+def _default_exceptions() -> dict[type[BaseException], int | None]:
+    import httpx
+
+    return {httpx.TransportError: None}
+
+
+def _unsent_exceptions() -> tuple[type[BaseException], ...]:
+    """Errors raised before the request reached the server."""
+    import httpx
+
+    return (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float | None:
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryStats:
+    """Counters kept by one transport."""
+
+    requests: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+
+
+class Retrier:
+    """Applies a :class:`RetryPolicy` and owns the transport's retry budget.
+
+    Thread-safe: the sync transport may be shared by worker threads.
+    """
+
+    def __init__(self, config: Any):
+        self._config = config
+        self._lock = threading.Lock()
+        self._tokens = float(config.retry.budget_burst)
+        self._rng = random.Random()
+        self.stats = RetryStats()
+
+    @property
+    def policy(self) -> RetryPolicy:
+        return self._config.retry
+
+    def start(self, method: str, headers: Mapping[str, str]) -> RetryAttempts:
+        policy = self.policy
+        with self._lock:
+            self.stats.requests += 1
+            self._tokens = min(
+                float(policy.budget_burst), self._tokens + policy.budget_ratio
+            )
+        idempotent = (
+            method.upper() in policy.idempotent_methods or "idempotency-key" in headers
+        )
+        return RetryAttempts(self, policy, idempotent)
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self.stats.budget_exhausted += 1
+                return False
+            self._tokens -= 1
+            self.stats.retries += 1
+            return True
+
+
+class RetryAttempts:
+    """Retry bookkeeping for one logical request."""
+
+    def __init__(self, retrier: Retrier, policy: RetryPolicy, idempotent: bool):
+        self._retrier = retrier
+        self._policy = policy
+        self._idempotent = idempotent
+        self._max = (
+            policy.max_retries
+            if policy.max_retries is not None
+            else retrier._config.max_retries
+        )
+        # A rule with its own limit may retry beyond ``max_retries``.
+        limits = [*policy.statuses.values(), *(policy.exceptions or {}).values()]
+        self._total = max([self._max, *(n for n in limits if n is not None)])
+        self._attempts = 0
+        self._per_rule: dict[object, int] = {}
+        self._delay = policy.backoff
+
+    def on_status(self, status: int, headers: Mapping[str, str]) -> float | None:
+        """Seconds to wait before retrying a response, or ``None`` to give up."""
+        policy = self._policy
+        if status not in policy.statuses:
+            return None
+        if not self._idempotent and status not in _UNPROCESSED_STATUSES:
+            return None
+        server_delay = _retry_after(headers) if policy.respect_retry_after else None
+        if server_delay is not None and server_delay > policy.max_retry_after:
+            return None
+        delay = self._next(status, policy.statuses[status])
+        if delay is None or server_delay is None:
+            return delay
+        return max(delay, server_delay)
+
+    def on_exception(self, exc: BaseException) -> float | None:
+        """Seconds to wait before retrying after ``exc``, or ``None`` to give up."""
+        rules = self._policy.exceptions
+        if rules is None:
+            rules = _default_exceptions()
+        for cls, limit in rules.items():
+            if isinstance(exc, cls):
+                break
+        else:
+            return None
+        if not self._idempotent and not isinstance(exc, _unsent_exceptions()):
+            return None
+        return self._next(cls, limit)
+
+    def _next(self, rule: object, limit: int | None) -> float | None:
+        used = self._per_rule.get(rule, 0)
+        cap = self._max if limit is None else limit
+        if self._attempts >= self._total or used >= cap:
+            return None
+        if not self._retrier._spend():
+            return None
+        self._attempts += 1
+        self._per_rule[rule] = used + 1
+        return self._backoff()
+
+    def _backoff(self) -> float:
+        policy, rng = self._policy, self._retrier._rng
+        if policy.jitter == "decorrelated":
+            upper = max(policy.backoff, self._delay * 3)
+            self._delay = min(policy.max_backoff, rng.uniform(policy.backoff, upper))
+            return self._delay
+        ceiling = min(policy.max_backoff, policy.backoff * 2 ** (self._attempts - 1))
+        if policy.jitter == "full":
+            return rng.uniform(0, ceiling)
+        return ceiling
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import os
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, AsyncIterable, Mapping
+from urllib.parse import quote
+
+from ._models._telemetry import TelemetryEvent, epoch_seconds
+
+if TYPE_CHECKING:
+    import asyncio
+
+COLUMNS = ("timestamp", "gateway_id", "device", "register", "value")
+_PARTITIONS = ("gateway_id", "date")
+_FORMATS = ("parquet", "csv")
+_DEFAULT_COMPRESSION = {"parquet": "zstd", "csv": "gzip"}
+# Suffix of files still being written; renamed away once complete.
+_IN_PROGRESS = ".inprogress"
+
+# One buffered column chunk: a list per entry of ``COLUMNS``.
+_Chunk = tuple[list[float], list[str], list[str], list[str], list[float]]
+
+
+def _path_segment(value: str) -> str:
+    """``value`` URI-encoded as Hive partitioning does, safe as one path segment.
+
+    Separators and other reserved characters are percent-encoded, so ids
+    from the stream cannot climb out of the sink's root directory.
+    """
+    value = quote(value, safe="")
+    return value.replace(".", "%2E") if value in (".", "..") else value
+
+
+@dataclass
+class SinkStats:
+    events: int = 0
+    rows: int = 0
+    flushes: int = 0
+    files: int = 0  # completed files
+
+
+class _ParquetFile:
+    suffix = ".parquet"
+
+    def __init__(self, path: str, compression: str | None):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        self._pa, self._pc = pa, pc
+        self._timestamp = pa.timestamp("us", tz="UTC")
+        schema = pa.schema(
+            [
+                ("timestamp", self._timestamp),
+                ("gateway_id", pa.string()),
+                ("device", pa.string()),
+                ("register", pa.string()),
+                ("value", pa.float64()),
+            ]
+        )
+        self._sink = pa.OSFile(path, "wb")
+        self._writer = pq.ParquetWriter(self._sink, schema, compression=compression)
+        self._schema = schema
+
+    @property
+    def size(self) -> int:
+        return self._sink.tell()
+
+    def write(self, chunk: _Chunk) -> None:
+        pa = self._pa
+        seconds = pa.array(chunk[0], pa.float64())
+        micros = self._pc.multiply(seconds, 1e6).cast(pa.int64(), safe=False)
+        columns = [micros.cast(self._timestamp), *chunk[1:4], chunk[4]]
+        # Each flush becomes one row group, i.e. one chunk per column.
+        self._writer.write_table(pa.table(columns, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+        self._sink.close()
+
+
+class _CsvFile:
+    suffix = ".csv"
+
+    def __init__(self, path: str, compression: str | None):
+        self._raw = open(path, "wb")
+        if compression == "gzip":
+            self._file: Any = gzip.open(self._raw, "wt", newline="", compresslevel=6)
+        else:
+            self._file = io.TextIOWrapper(self._raw, newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, chunk: _Chunk) -> None:
+        stamps = [datetime.fromtimestamp(t, timezone.utc).isoformat() for t in chunk[0]]
+        self._writer.writerows(zip(stamps, *chunk[1:]))
+        self._file.flush()
+
+    @property
+    def size(self) -> int:
+        return self._raw.tell()
+
+    def close(self) -> None:
+        self._file.close()
+        self._raw.close()
+
+
+class _OpenFile:
+    def __init__(self, path: str, file: _ParquetFile | _CsvFile, opened: float):
+        self.path = path
+        self.file = file
+        self.opened = opened
+
+
+class TelemetrySink:
+    """Archives telemetry events to Parquet (or CSV) files.
+
+    Events become rows of ``timestamp, gateway_id, device, register, value``
+    (one per numeric register reading) and are buffered in memory as column
+    chunks. :meth:`write` only appends to those buffers; full chunks, and
+    every ``flush_interval`` seconds whatever is buffered, are written by a
+    background thread, so the receive loop never waits on disk or
+    compression.
+
+    Files are laid out Hive-style by ``partition_by``, e.g.
+    ``root/gateway_id=gw-1/date=2026-10-19/part-20261019T120000-<id>-0001.parquet``
+    (``<id>`` is random per sink, so sinks sharing a root never collide),
+    and rotated once they reach ``max_file_bytes`` or ``max_file_age``
+    seconds. Files being written carry an ``.inprogress`` suffix until
+    complete, so readers only ever see whole files.
+
+    Parquet needs ``pyarrow`` (``pip install "scadable[parquet]"``); without it
+    ``format=None`` falls back to gzipped CSV.
+
+    >>> async with TelemetrySink("archive/") as sink:
+    ...     async with client.gateways.stream("gw-123") as events:
+    ...         await sink.consume(events, gateway_id="gw-123")
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        *,
+        format: str | None = None,
+        compression: str | None = "default",
+        partition_by: tuple[str, ...] = _PARTITIONS,
+        flush_rows: int = 50_000,
+        flush_interval: float | None = 5.0,
+        max_file_bytes: int = 128 * 2**20,
+        max_file_age: float = 3600.0,
+        max_pending: int = 4,
+    ):
+        if format is None:
+            format = "parquet" if find_spec("pyarrow") is not None else "csv"
+        if format not in _FORMATS:
+            raise ValueError(f"format must be one of {_FORMATS}, not {format!r}")
+        unknown = set(partition_by) - set(_PARTITIONS)
+        if unknown:
+            raise ValueError(f"Cannot partition by {sorted(unknown)}")
+        self.root = os.fspath(root)
+        self.format = format
+        self.stats = SinkStats()
+        if compression == "default":
+            compression = _DEFAULT_COMPRESSION[format]
+        if format == "csv" and compression not in ("gzip", None):
+            raise ValueError(f"CSV supports gzip compression only, not {compression!r}")
+        self._compression = compression
+        self._file_type = _ParquetFile if format == "parquet" else _CsvFile
+        self._partition_by = partition_by
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval
+        self._max_file_bytes = max_file_bytes
+        self._max_file_age = max_file_age
+        self._max_pending = max_pending
+        self._buffer: dict[tuple[str, ...], _Chunk] = {}
+        self._buffered = 0
+        # One thread keeps writes to each file in order.
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="scadable-sink")
+        self._pending: list[Future[None]] = []
+        self._open: dict[tuple[str, ...], _OpenFile] = {}
+        self._sequence = 0
+        self._token = uuid.uuid4().hex[:12]
+        self._timer: asyncio.Task[None] | None = None
+        self._closed = False
+
+    def write(
+        self,
+        event: TelemetryEvent | Mapping[str, Any],
+        *,
+        gateway_id: str | None = None,
+    ) -> None:
+        """Buffer one event's register readings; never blocks on I/O.
+
+        ``gateway_id`` files events that don't name their gateway, such as
+        those of a single gateway's stream; otherwise they go under
+        ``"unknown"``.
+        """
+        if self._closed:
+            raise RuntimeError("Sink is closed")
+        data = event.data if isinstance(event, TelemetryEvent) else event.get("data")
+        self.stats.events += 1
+        devices = data.get("devices") if isinstance(data, dict) else None
+        if not devices:
+            return
+        stamp = epoch_seconds(data.get("timestamp"))
+        if stamp is None:
+            stamp = time.time()
+        gateway_id = str(data.get("gateway_id") or gateway_id or "unknown")
+        key = self._partition(gateway_id, stamp)
+        chunk = self._buffer.get(key)
+        if chunk is None:
+            chunk = self._buffer[key] = ([], [], [], [], [])
+        stamps, gateways, names, registers, values = chunk
+        before = len(values)
+        for name, state in devices.items():
+            readings = state.get("data") if isinstance(state, dict) else None
+            if not readings:
+                continue
+            for register, value in readings.items():
+                if isinstance(value, (int, float)):
+                    names.append(name)
+                    registers.append(register)
+                    values.append(float(value))
+        added = len(values) - before
+        stamps.extend([stamp] * added)
+        gateways.extend([gateway_id] * added)
+        self._buffered += added
+        if self._buffered >= self._flush_rows:
+            self._submit()
+
+    async def consume(
+        self, events: AsyncIterable[Any], *, gateway_id: str | None = None
+    ) -> int:
+        """Write every event of ``events``; returns how many were written.
+
+        ``gateway_id`` is passed on to :meth:`write`.
+
+        Waits for the writer thread only when ``max_pending`` chunks are
+        already queued, so a slow disk slows the stream instead of growing
+        memory without bound.
+        """
+        import asyncio
+
+        count = 0
+        async for event in events:
+            self.write(event, gateway_id=gateway_id)
+            count += 1
+            while len(self._pending) > self._max_pending:
+                await asyncio.wrap_future(self._pending[0])
+                self._prune()
+        return count
+
+    async def flush(self) -> None:
+        """Hand buffered rows to the writer and wait until they are written."""
+        import asyncio
+
+        self._submit()
+        for future in list(self._pending):
+            await asyncio.wrap_future(future)
+        self._prune()
+
+    async def start(self) -> TelemetrySink:
+        """Start the ``flush_interval`` timer."""
+        import asyncio
+
+        if self._timer is None and self._flush_interval:
+            self._timer = asyncio.create_task(self._tick(self._flush_interval))
+        return self
+
+    async def close(self) -> None:
+        """Flush, complete every open file and stop the writer thread."""
+        import asyncio
+
+        if self._closed:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        try:
+            await self.flush()
+        finally:
+            self._closed = True
+            future = self._executor.submit(self._close_all)
+            self._executor.shutdown(wait=False)
+            await asyncio.wrap_future(future)
+
+    async def __aenter__(self) -> TelemetrySink:
+        return await self.start()
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.close()
+
+    async def _tick(self, interval: float) -> None:
+        import asyncio
+
+        while True:
+            await asyncio.sleep(interval)
+            self._submit(rotate=True)
+
+    def _partition(self, gateway_id: str, stamp: float) -> tuple[str, ...]:
+        parts = []
+        for field in self._partition_by:
+            if field == "gateway_id":
+                parts.append(f"gateway_id={_path_segment(gateway_id)}")
+            else:
+                day = datetime.fromtimestamp(stamp, timezone.utc).date()
+                parts.append(f"date={day.isoformat()}")
+        return tuple(parts)
+
+    def _submit(self, *, rotate: bool = False) -> None:
+        self._prune()
+        buffer, self._buffer, self._buffered = self._buffer, {}, 0
+        if buffer or rotate:
+            self.stats.flushes += bool(buffer)
+            self._pending.append(self._executor.submit(self._write, buffer))
+
+    def _prune(self) -> None:
+        pending = []
+        for future in self._pending:
+            if not future.done():
+                pending.append(future)
+            else:
+                future.result()  # re-raise writer errors here
+        self._pending = pending
+
+    # -- writer thread -------------------------------------------------------
+
+    def _write(self, buffer: dict[tuple[str, ...], _Chunk]) -> None:
+        now = time.time()
+        age = self._max_file_age
+        for key in [k for k, f in self._open.items() if now - f.opened >= age]:
+            self._complete(key)
+        for key, chunk in buffer.items():
+            if not chunk[0]:
+                continue
+            current = self._open.get(key) or self._open_file(key, now)
+            current.file.write(chunk)
+            self.stats.rows += len(chunk[0])
+            if current.file.size >= self._max_file_bytes:
+                self._complete(key)
+
+    def _open_file(self, key: tuple[str, ...], now: float) -> _OpenFile:
+        directory = os.path.join(self.root, *key)
+        os.makedirs(directory, exist_ok=True)
+        self._sequence += 1
+        stamp = datetime.fromtimestamp(now, timezone.utc).strftime("%Y%m%dT%H%M%S")
+        suffix = self._file_type.suffix
+        if self._compression == "gzip" and self.format == "csv":
+            suffix += ".gz"
+        name = f"part-{stamp}-{self._token}-{self._sequence:04d}{suffix}"
+        path = os.path.join(directory, name)
+        file = self._file_type(path + _IN_PROGRESS, self._compression)
+        self._open[key] = opened = _OpenFile(path, file, now)
+        return opened
+
+    def _complete(self, key: tuple[str, ...]) -> None:
+        current = self._open.pop(key)
+        current.file.close()
+        os.replace(current.path + _IN_PROGRESS, current.path)
+        self.stats.files += 1
+
+    def _close_all(self) -> None:
+        for key in list(self._open):
+            self._complete(key)
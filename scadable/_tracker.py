@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+from pydantic import ValidationError
+
+from ._exceptions import FATAL_ERRORS, ScadableError
+from ._models._gateway import Device
+from ._models._telemetry import TelemetryEvent, epoch_seconds
+
+if TYPE_CHECKING:
+    from ._resources._gateways import AsyncGateways
+
+# Device fields reported by both telemetry events and the devices endpoint.
+_TRACKED = ("connected", "last_error", "protocol")
+# Handshake statuses of the FATAL_ERRORS.
+_FATAL_STATUS = (401, 403, 404)
+
+
+@dataclass(frozen=True)
+class DeviceChange:
+    """Tracked fields of one device that changed, as ``{field: (old, new)}``.
+
+    ``added`` is set the first time a device is seen.
+    """
+
+    gateway_id: str
+    device: Device
+    changes: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    added: bool = False
+
+
+DeviceCallback = Callable[[DeviceChange], None]
+
+
+class DeviceTracker:
+    """Live ``connected``/``last_error`` state of one gateway's devices.
+
+    Device state is read from the ``devices`` section of telemetry events;
+    the devices endpoint is only called when the stream (re)connects, to
+    catch up on anything missed while disconnected.
+
+    >>> tracker = client.gateways.track_devices("gw-123")
+    >>> tracker.on_change(lambda c: print(c.device.name, c.changes))
+    >>> async with tracker:
+    ...     await asyncio.sleep(60)
+    ...     offline = [d for d in tracker.snapshot().values() if not d.connected]
+    """
+
+    def __init__(
+        self,
+        gateways: AsyncGateways,
+        gateway_id: str,
+        *,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ):
+        self.gateway_id = gateway_id
+        self.events = 0
+        self.errors = 0
+        self.refreshes = 0
+        self._gateways = gateways
+        self._devices: dict[str, Device] = {}
+        self._callbacks: list[DeviceCallback] = []
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._task: asyncio.Task[None] | None = None
+        self._connected = asyncio.Event()
+
+    @property
+    def devices(self) -> dict[str, Device]:
+        """Live device records by name; updated in place."""
+        return self._devices
+
+    def snapshot(self) -> dict[str, Device]:
+        """Copies of the current device records, safe to keep."""
+        return {name: device.model_copy() for name, device in self._devices.items()}
+
+    def on_change(self, callback: DeviceCallback) -> DeviceCallback:
+        """Call ``callback`` with every :class:`DeviceChange`; usable as a decorator."""
+        self._callbacks.append(callback)
+        return callback
+
+    def apply(self, event: TelemetryEvent | Mapping[str, Any]) -> list[DeviceChange]:
+        """Fold one telemetry event into the device state."""
+        data = event.data if isinstance(event, TelemetryEvent) else event["data"]
+        states = data.get("devices")
+        if not states:
+            return []
+        self.events += 1
+        timestamp = epoch_seconds(data.get("timestamp"))
+        seen = None
+        if timestamp is not None:
+            seen = datetime.fromtimestamp(timestamp, timezone.utc)
+        changes = []
+        for name, state in states.items():
+            update = {f: state[f] for f in _TRACKED if f in state}
+            if seen is not None:
+                update["last_seen_at"] = seen
+            change = self._update(name, update)
+            if change is not None:
+                changes.append(change)
+        self._notify(changes)
+        return changes
+
+    async def refresh(self) -> list[DeviceChange]:
+        """Reload every device from the REST API and report differences."""
+        devices = await self._gateways.devices(self.gateway_id)
+        self.refreshes += 1
+        changes = []
+        for device in devices:
+            name = device.name or device.device_id or device.id or ""
+            update = {f: getattr(device, f) for f in (*_TRACKED, "status")}
+            if device.last_seen_at is not None:
+                update["last_seen_at"] = device.last_seen_at
+            change = self._update(name, update, record=device)
+            if change is not None:
+                changes.append(change)
+        self._notify(changes)
+        return changes
+
+    async def run(self) -> None:
+        """Follow the stream forever, reconnecting with exponential backoff.
+
+        Events that can't be applied are skipped; a message that isn't a
+        valid event ends the stream, so the tracker reconnects. Both count
+        in ``errors``.
+        """
+        from websockets.exceptions import WebSocketException
+
+        delay = self._reconnect_delay
+        while True:
+            try:
+                async with self._gateways.stream(self.gateway_id) as events:
+                    # Refresh after connecting so no event falls in between.
+                    await self.refresh()
+                    self._connected.set()
+                    delay = self._reconnect_delay
+                    async for event in events:
+                        try:
+                            self.apply(event)
+                        except Exception:
+                            # A malformed event or a failing callback.
+                            self.errors += 1
+            except FATAL_ERRORS:
+                raise
+            except WebSocketException as exc:
+                # A rejected handshake carries the HTTP response.
+                response = getattr(exc, "response", None)
+                if getattr(response, "status_code", None) in _FATAL_STATUS:
+                    raise
+            except ValidationError:
+                # The stream ends at an event that isn't one; reconnecting
+                # refreshes whatever it carried.
+                self.errors += 1
+            except (OSError, asyncio.TimeoutError, ScadableError):
+                pass
+            self._connected.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._max_reconnect_delay)
+
+    async def wait_connected(self) -> None:
+        """Wait until the stream is up and the initial refresh is done.
+
+        Raises the error that stopped the tracker if it stops first.
+        """
+        task = self._task
+        if task is None:
+            await self._connected.wait()
+            return
+        connected = asyncio.ensure_future(self._connected.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {connected, task}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            connected.cancel()
+        # The stream may already have dropped again; that still counts.
+        if connected not in done:
+            task.result()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> DeviceTracker:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.stop()
+
+    def _update(
+        self, name: str, update: dict[str, Any], record: Device | None = None
+    ) -> DeviceChange | None:
+        device = self._devices.get(name)
+        added = device is None
+        if device is None:
+            # Start from an empty record so every known field shows as changed.
+            device = Device(name=name, gateway_id=self.gateway_id)
+            if record is not None:
+                device.device_id, device.id = record.device_id, record.id
+            self._devices[name] = device
+        changes = {}
+        for key, value in update.items():
+            old = getattr(device, key)
+            if old != value:
+                setattr(device, key, value)
+                if key in _TRACKED or key == "status":
+                    changes[key] = (old, value)
+        if not changes and not added:
+            return None
+        return DeviceChange(self.gateway_id, device, changes, added)
+
+    def _notify(self, changes: list[DeviceChange]) -> None:
+        for change in changes:
+            for callback in self._callbacks:
+                callback(change)
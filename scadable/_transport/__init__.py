@@ -1,3 +1,17 @@
-from ._http import SyncHTTPTransport, AsyncHTTPTransport
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._http import SyncHTTPTransport, AsyncHTTPTransport
 
 __all__ = ["SyncHTTPTransport", "AsyncHTTPTransport"]
+
+
+def __getattr__(name: str) -> Any:
+    # Deferred so importing a sibling module (codecs, websocket) skips httpx.
+    if name in __all__:
+        from . import _http
+
+        return getattr(_http, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
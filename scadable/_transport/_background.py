@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import AbstractAsyncContextManager
+from typing import Any, AsyncIterator, Callable, Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide background event loop, starting it on first use.
+
+    Every sync stream in the process is served by this one daemon thread, so
+    threaded callers never create their own loop or WebSocket stack.
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="scadable-loop", daemon=True
+            )
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+_DONE = object()
+
+
+class _Failure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class SyncStream(Generic[T]):
+    """Blocking iterator over an async stream running on the background loop.
+
+    At most ``max_queue`` items are buffered; once the buffer is full the
+    producer stops reading from the network until the consumer catches up.
+
+    >>> with client.gateways.stream("gw-123") as stream:
+    ...     for event in stream:
+    ...         print(event.data)
+    """
+
+    def __init__(
+        self,
+        opener: Callable[[], AbstractAsyncContextManager[AsyncIterator[T]]],
+        *,
+        max_queue: int = 1024,
+    ):
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        self._opener = opener
+        self._max_queue = max_queue
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._credits: asyncio.Semaphore | None = None
+        self._future: Future[None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._source: AsyncIterator[T] | None = None
+        self._finished = False
+
+    @property
+    def stats(self) -> Any:
+        """Byte counters of the underlying connection, once connected."""
+        return getattr(self._source, "stats", None)
+
+    @property
+    def profile(self) -> Any:
+        """Per-stage timings, once connected with ``stream_profile_rate`` set."""
+        return getattr(self._source, "profile", None)
+
+    def start(self) -> SyncStream[T]:
+        if self._future is None:
+            self._loop = get_loop()
+            self._future = asyncio.run_coroutine_threadsafe(self._pump(), self._loop)
+        return self
+
+    async def _pump(self) -> None:
+        self._task = asyncio.current_task()
+        self._credits = asyncio.Semaphore(self._max_queue)
+        try:
+            async with self._opener() as source:
+                self._source = source
+                async for item in source:
+                    await self._credits.acquire()
+                    self._queue.put(item)
+        except Exception as exc:
+            self._queue.put(_Failure(exc))
+        finally:
+            self._queue.put(_DONE)
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        if self._finished:
+            raise StopIteration
+        self.start()
+        item = self._queue.get()
+        if item is _DONE:
+            self._finished = True
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.exc
+        assert self._loop is not None and self._credits is not None
+        self._loop.call_soon_threadsafe(self._credits.release)
+        return item
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Stop the producer and release the connection."""
+        self._finished = True
+        future = self._future
+        if future is None or future.done():
+            return
+        if self._task is not None and self._loop is not None:
+            # Cancel the task itself so the connection is closed before we return.
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        else:  # pragma: no cover - producer not scheduled yet
+            future.cancel()
+        try:
+            future.result(timeout)
+        except BaseException:
+            pass
+
+    def __enter__(self) -> SyncStream[T]:
+        return self.start()
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
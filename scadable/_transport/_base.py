@@ -1,14 +1,70 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, AsyncIterator, Protocol, runtime_checkable
+import json
+import types
+import uuid
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    ContextManager,
+    Iterator,
+    Mapping,
+    Protocol,
+    runtime_checkable,
+)
+
+_UNPARSED: Any = object()
+_NO_HEADERS: Mapping[str, str] = types.MappingProxyType({})
+
+
+def parse_json(content: bytes) -> Any:
+    """Decode a JSON body straight from bytes; ``None`` if it isn't JSON."""
+    try:
+        return json.loads(content)
+    except ValueError:
+        return None
+
+
+def idempotency_key() -> dict[str, str]:
+    """Headers with a fresh ``Idempotency-Key``, so a write may be retried.
+
+    Only sent with the ``idempotency_keys`` option (see ``ClientConfig``).
+    """
+    return {"Idempotency-Key": uuid.uuid4().hex}
 
 
-@dataclass
 class Response:
-    status_code: int
-    data: Any
-    headers: dict[str, str]
+    """A completed response whose body is decoded on first use.
+
+    ``content`` holds the raw body, so typed endpoints can validate it with
+    ``model_validate_json`` and never build ``data`` at all. ``headers`` is
+    the transport's own case-insensitive mapping rather than a copy.
+    """
+
+    __slots__ = ("status_code", "content", "headers", "_data")
+
+    def __init__(
+        self,
+        status_code: int,
+        data: Any = _UNPARSED,
+        headers: Mapping[str, str] = _NO_HEADERS,
+        *,
+        content: bytes = b"",
+    ):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self._data = data
+
+    @property
+    def data(self) -> Any:
+        if self._data is _UNPARSED:
+            self._data = parse_json(self.content) if self.content else None
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"<Response [{self.status_code}]>"
 
 
 @runtime_checkable
@@ -20,8 +76,18 @@ class Transport(Protocol):
         *,
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
     ) -> Response: ...
 
+    def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> ContextManager[Iterator[bytes]]: ...
+
     def close(self) -> None: ...
 
 
@@ -34,8 +100,18 @@ class AsyncTransport(Protocol):
         *,
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
     ) -> Response: ...
 
+    def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> AsyncContextManager[AsyncIterator[bytes]]: ...
+
     async def close(self) -> None: ...
 
 
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from importlib.util import find_spec
+from typing import Any, Callable, Union
+
+Decoder = Callable[[Union[str, memoryview]], Any]
+
+# Subprotocol prefix used to negotiate the stream encoding, e.g. "scadable.msgpack".
+SUBPROTOCOL_PREFIX = "scadable."
+
+_DECODERS: dict[str, Decoder] = {}
+# Optional decoders, imported the first time their encoding is negotiated.
+_OPTIONAL: dict[str, Callable[[], Decoder]] = {}
+
+
+def register_decoder(name: str, decoder: Decoder) -> None:
+    """Register a stream payload decoder under an encoding name.
+
+    Binary frames are handed over as a ``memoryview`` of the received buffer,
+    so decoders that accept the buffer protocol parse without copying. Text
+    frames are passed as ``str``. Registering an existing name replaces it.
+    """
+    _DECODERS[name] = decoder
+    _OPTIONAL.pop(name, None)
+
+
+def get_decoder(name: str) -> Decoder:
+    if name not in _DECODERS and name in _OPTIONAL:
+        _DECODERS[name] = _OPTIONAL[name]()
+    try:
+        return _DECODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown stream encoding: {name!r}") from None
+
+
+def available_encodings() -> list[str]:
+    """Registered encodings, most compact first and JSON last."""
+    names = dict.fromkeys([*_OPTIONAL, *_DECODERS])
+    return sorted(names, key=lambda name: name == "json")
+
+
+def _decode_json(payload: str | memoryview) -> Any:
+    if isinstance(payload, memoryview):
+        payload = payload.tobytes()
+    return json.loads(payload)
+
+
+register_decoder("json", _decode_json)
+
+
+def _raising_value_error(
+    decode: Decoder, errors: tuple[type[Exception], ...]
+) -> Decoder:
+    """``decode`` with the library's own errors re-raised as ``ValueError``.
+
+    The stream skips payloads whose decoder raises ``ValueError``; anything
+    else would end it.
+    """
+
+    def decoder(payload: str | memoryview) -> Any:
+        try:
+            return decode(payload)
+        except errors as exc:
+            raise ValueError(str(exc)) from exc
+
+    return decoder
+
+
+def _load_msgpack() -> Decoder:
+    import msgpack
+
+    return _raising_value_error(
+        lambda payload: msgpack.unpackb(payload, raw=False),
+        (msgpack.UnpackException,),
+    )
+
+
+def _load_cbor() -> Decoder:
+    import cbor2
+
+    return _raising_value_error(cbor2.loads, (cbor2.CBORError,))
+
+
+if find_spec("msgpack") is not None:  # pragma: no branch
+    _OPTIONAL["msgpack"] = _load_msgpack
+if find_spec("cbor2") is not None:  # pragma: no branch
+    _OPTIONAL["cbor"] = _load_cbor
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import ipaddress
+import socket
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+
+import httpcore
+import httpx
+
+
+class CachedResolver:
+    """Host name lookups kept for ``ttl`` seconds.
+
+    Lookups run through the event loop's ``getaddrinfo`` (a worker thread),
+    so a slow resolver delays only the connection that needs it.
+    """
+
+    def __init__(self, ttl: float, *, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.lookups = 0
+        self._clock = clock
+        self._cache: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """Addresses of ``host``, in resolver order; IP literals pass through."""
+        import asyncio
+
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return [host]
+        now = self._clock()
+        cached = self._cache.get((host, port))
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        self.lookups += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        self._cache[(host, port)] = (now + self.ttl, addresses)
+        return addresses
+
+    def forget(self, host: str, port: int) -> None:
+        self._cache.pop((host, port), None)
+
+
+class _ResolvingBackend(httpcore.AsyncNetworkBackend):
+    """Connects by cached address; TLS still verifies the original host name."""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, resolver: CachedResolver):
+        self._backend = backend
+        self.resolver = resolver
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self.resolver.resolve(host, port)
+        except OSError as exc:
+            raise httpcore.ConnectError(str(exc)) from exc
+        error: httpcore.ConnectError | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except httpcore.ConnectError as exc:
+                error = exc
+        # Every address failed: look the name up again next time in case
+        # it moved.
+        self.resolver.forget(host, port)
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:  # pragma: no cover
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:  # pragma: no cover
+        await self._backend.sleep(seconds)
+
+
+def _httpx_error(exc: Exception) -> Exception:
+    """The httpx exception matching an httpcore one, as httpx's transport maps them."""
+    for cls in type(exc).__mro__:
+        mapped = getattr(httpx, cls.__name__, None)
+        if isinstance(mapped, type) and issubclass(mapped, httpx.TransportError):
+            return mapped(str(exc))
+    return exc  # pragma: no cover
+
+
+@contextmanager
+def _mapped_errors() -> Iterator[None]:
+    try:
+        yield
+    except Exception as exc:
+        error = _httpx_error(exc)
+        if error is exc:  # pragma: no cover
+            raise
+        raise error from exc
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: AsyncIterable[bytes]):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _mapped_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """An httpx transport whose new connections use a :class:`CachedResolver`.
+
+    Built on its own ``httpcore`` connection pool, sized by ``limits``, so
+    the resolver plugs in through httpcore's network backend hook.
+    """
+
+    def __init__(self, ttl: float, limits: httpx.Limits):
+        self.resolver = CachedResolver(ttl)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_ResolvingBackend(httpcore.AnyIOBackend(), self.resolver),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=url.raw_scheme,
+                host=url.raw_host,
+                port=url.port,
+                target=url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,  # type: ignore[arg-type]
+            extensions=request.extensions,
+        )
+        with _mapped_errors():
+            resp = await self._pool.handle_async_request(core_request)
+        return httpx.Response(
+            status_code=resp.status,
+            headers=resp.headers,
+            stream=_ResponseStream(resp.stream),  # type: ignore[arg-type]
+            extensions=resp.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
@@ -1,24 +1,150 @@
 from __future__ import annotations
 
+import threading
 import time
-from typing import Any
+from contextlib import (
+    asynccontextmanager,
+    contextmanager,
+    nullcontext,
+)
+from importlib.util import find_spec
+from typing import Any, AsyncContextManager, AsyncIterator, ContextManager, Iterator
 
 import httpx
 
 from .._config import ClientConfig
 from .._exceptions import ConnectionError, from_response
-from ._base import Response
+from .._ratelimit import TokenBucket
+from .._retry import Retrier, RetryStats
+from ._base import _NO_HEADERS, Response, idempotency_key, parse_json
+from ._dns import CachingTransport
+
+
+def _accept_encoding() -> str:
+    """Content codings httpx can decode here, most compact first.
+
+    brotli and zstd are only advertised when their optional packages are
+    installed (``pip install "scadable[compression]"``); httpx decodes zstd
+    from 0.27.1, the lowest version this package allows.
+    """
+    installed = {
+        "zstd": find_spec("zstandard") is not None,
+        "br": find_spec("brotli") is not None or find_spec("brotlicffi") is not None,
+    }
+    preferred = ("zstd", "br", "gzip", "deflate")
+    return ", ".join(c for c in preferred if installed.get(c, True))
+
+
+def _default_headers(config: ClientConfig) -> dict[str, str]:
+    return {"X-API-Key": config.api_key, "Accept-Encoding": _accept_encoding()}
+
+
+def _tenant_headers(
+    config: ClientConfig, client: httpx.Client | httpx.AsyncClient | None
+) -> dict[str, str] | None:
+    """Per-request headers when the httpx client is shared between API keys."""
+    return None if client is None else {"X-API-Key": config.api_key}
+
+
+def _limits(config: ClientConfig) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+
+
+def _merge(
+    base: dict[str, str] | None, extra: dict[str, str] | None
+) -> dict[str, str] | None:
+    if not extra:
+        return base
+    return {**base, **extra} if base else extra
+
+
+def _with_idempotency_key(
+    config: ClientConfig, method: str, headers: dict[str, str] | None
+) -> dict[str, str] | None:
+    """Give a write its own ``Idempotency-Key`` if the client is set to."""
+    if not config.idempotency_keys or method.upper() in config.retry.idempotent_methods:
+        return headers
+    return {**idempotency_key(), **(headers or {})}
+
+
+def _rate_limiter(config: ClientConfig) -> TokenBucket | None:
+    if config.rate_limit is None:
+        return None
+    return TokenBucket(config.rate_limit, config.rate_limit_burst)
 
 
 class SyncHTTPTransport:
-    def __init__(self, config: ClientConfig):
+    """HTTP transport of one client.
+
+    ``client`` shares an existing httpx client (and its connection pool);
+    the API key is then sent per request and :meth:`close` leaves it open.
+    """
+
+    def __init__(self, config: ClientConfig, *, client: httpx.Client | None = None):
         self._config = config
-        self._client = httpx.Client(
+        self._headers = _tenant_headers(config, client)
+        self._owns_client = client is None
+        self._client = client or httpx.Client(
             base_url=config.base_url,
             timeout=config.timeout,
-            headers={"X-API-Key": config.api_key},
+            headers=_default_headers(config),
+            limits=_limits(config),
+        )
+        self._retrier = Retrier(config)
+        self._limiter = _rate_limiter(config)
+        self._slots = (
+            None
+            if config.max_concurrency is None
+            else threading.BoundedSemaphore(config.max_concurrency)
         )
 
+    def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Send with retries; returns a successful response, raises otherwise."""
+        request = self._client.build_request(
+            method,
+            path,
+            json=json,
+            params=params,
+            headers=_with_idempotency_key(
+                self._config, method, _merge(self._headers, headers)
+            ),
+        )
+        attempts = self._retrier.start(method, request.headers)
+        while True:
+            if self._limiter is not None:
+                self._limiter.acquire_sync()
+            try:
+                resp = self._client.send(request, stream=stream)
+            except httpx.HTTPError as exc:
+                delay = attempts.on_exception(exc)
+                if delay is None:
+                    raise ConnectionError(str(exc)) from exc
+                time.sleep(delay)
+                continue
+
+            if resp.status_code < 400:
+                return resp
+            resp.read()
+            resp.close()
+
+            delay = attempts.on_status(resp.status_code, resp.headers)
+            if delay is None:
+                raise from_response(resp.status_code, _error_body(resp))
+            time.sleep(delay)
+
     def request(
         self,
         method: str,
@@ -26,50 +152,128 @@ class SyncHTTPTransport:
         *,
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
     ) -> Response:
-        last_exc: Exception | None = None
-        for attempt in range(self._config.max_retries + 1):
+        with self._slot():
+            resp = self._send(method, path, json=json, params=params, headers=headers)
+        return self._response(resp)
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> Iterator[Iterator[bytes]]:
+        """Send a request and yield its decompressed body as it arrives."""
+        # The slot covers sending, not reading: a caller may hold the body
+        # open while it makes other requests.
+        with self._slot():
+            resp = self._send(method, path, json=json, params=params, stream=True)
+
+        def _chunks() -> Iterator[bytes]:
             try:
-                resp = self._client.request(method, path, json=json, params=params)
+                yield from resp.iter_bytes()
             except httpx.HTTPError as exc:  # pragma: no cover
-                last_exc = exc  # pragma: no cover
-                if attempt < self._config.max_retries:  # pragma: no cover
-                    time.sleep(min(2**attempt, 8))  # pragma: no cover
-                    continue  # pragma: no cover
                 raise ConnectionError(str(exc)) from exc  # pragma: no cover
 
-            if resp.status_code == 429 or resp.status_code >= 500:
-                last_exc = from_response(resp.status_code, _safe_json(resp))
-                if attempt < self._config.max_retries:
-                    time.sleep(min(2**attempt, 8))
-                    continue
+        try:
+            yield _chunks()
+        finally:
+            resp.close()
 
-            if resp.status_code >= 400:
-                raise from_response(resp.status_code, _safe_json(resp))
+    @property
+    def retry_stats(self) -> RetryStats:
+        return self._retrier.stats
 
-            return Response(
-                status_code=resp.status_code,
-                data=_safe_json(resp),
-                headers=dict(resp.headers),
-            )
+    def _response(self, resp: httpx.Response) -> Response:
+        headers = resp.headers if self._config.response_headers else _NO_HEADERS
+        return Response(resp.status_code, headers=headers, content=resp.content)
 
-        raise last_exc or ConnectionError(
-            "Request failed after retries"
-        )  # pragma: no cover
+    def _slot(self) -> ContextManager[Any]:
+        """Holds one of the ``max_concurrency`` request slots, if limited."""
+        return nullcontext() if self._slots is None else self._slots
 
     def close(self) -> None:
-        self._client.close()
+        if self._owns_client:
+            self._client.close()
 
 
 class AsyncHTTPTransport:
-    def __init__(self, config: ClientConfig):
+    def __init__(
+        self, config: ClientConfig, *, client: httpx.AsyncClient | None = None
+    ):
+        import asyncio
+
         self._config = config
-        self._client = httpx.AsyncClient(
-            base_url=config.base_url,
-            timeout=config.timeout,
-            headers={"X-API-Key": config.api_key},
+        self._headers = _tenant_headers(config, client)
+        self._owns_client = client is None
+        if client is None:
+            transport = None
+            if config.dns_cache_ttl is not None:
+                transport = CachingTransport(config.dns_cache_ttl, _limits(config))
+            client = httpx.AsyncClient(
+                base_url=config.base_url,
+                timeout=config.timeout,
+                headers=_default_headers(config),
+                limits=_limits(config),
+                transport=transport,
+            )
+        self._client = client
+        self._retrier = Retrier(config)
+        self._limiter = _rate_limiter(config)
+        self._slots = (
+            None
+            if config.max_concurrency is None
+            else asyncio.Semaphore(config.max_concurrency)
         )
 
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        import asyncio
+
+        request = self._client.build_request(
+            method,
+            path,
+            json=json,
+            params=params,
+            headers=_with_idempotency_key(
+                self._config, method, _merge(self._headers, headers)
+            ),
+        )
+        attempts = self._retrier.start(method, request.headers)
+        while True:
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            try:
+                resp = await self._client.send(request, stream=stream)
+            except httpx.HTTPError as exc:
+                delay = attempts.on_exception(exc)
+                if delay is None:
+                    raise ConnectionError(str(exc)) from exc
+                await asyncio.sleep(delay)
+                continue
+
+            if resp.status_code < 400:
+                return resp
+            await resp.aread()
+            await resp.aclose()
+
+            delay = attempts.on_status(resp.status_code, resp.headers)
+            if delay is None:
+                raise from_response(resp.status_code, _error_body(resp))
+            await asyncio.sleep(delay)
+
     async def request(
         self,
         method: str,
@@ -77,47 +281,106 @@ class AsyncHTTPTransport:
         *,
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
     ) -> Response:
-        import asyncio
+        async with self._slot():
+            resp = await self._send(
+                method, path, json=json, params=params, headers=headers
+            )
+        return self._response(resp)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> AsyncIterator[AsyncIterator[bytes]]:
+        """Send a request and yield its decompressed body as it arrives."""
+        # As in the sync transport, the slot only covers sending.
+        async with self._slot():
+            resp = await self._send(method, path, json=json, params=params, stream=True)
 
-        last_exc: Exception | None = None
-        for attempt in range(self._config.max_retries + 1):
+        async def _chunks() -> AsyncIterator[bytes]:
             try:
-                resp = await self._client.request(
-                    method, path, json=json, params=params
-                )
+                async for chunk in resp.aiter_bytes():
+                    yield chunk
             except httpx.HTTPError as exc:  # pragma: no cover
-                last_exc = exc  # pragma: no cover
-                if attempt < self._config.max_retries:  # pragma: no cover
-                    await asyncio.sleep(min(2**attempt, 8))  # pragma: no cover
-                    continue  # pragma: no cover
                 raise ConnectionError(str(exc)) from exc  # pragma: no cover
 
-            if resp.status_code == 429 or resp.status_code >= 500:
-                last_exc = from_response(resp.status_code, _safe_json(resp))
-                if attempt < self._config.max_retries:
-                    await asyncio.sleep(min(2**attempt, 8))
-                    continue
+        try:
+            yield _chunks()
+        finally:
+            await resp.aclose()
 
-            if resp.status_code >= 400:
-                raise from_response(resp.status_code, _safe_json(resp))
+    async def warmup(self, connections: int, path: str = "/") -> int:
+        """Open up to ``connections`` pooled connections at once.
 
-            return Response(
-                status_code=resp.status_code,
-                data=_safe_json(resp),
-                headers=dict(resp.headers),
-            )
+        Sends that many concurrent ``HEAD`` requests, at most
+        ``max_connections`` and ``max_keepalive_connections`` (more would
+        wait on the pool or be closed on return), and keeps each response
+        open until every one has arrived, so each holds a connection of its
+        own; they then go back to the pool. Returns how many connections
+        were held at once, whatever their status; idle ones already pooled
+        count too. Skips retries, the rate limit and concurrency slots.
+        """
+        import asyncio
 
-        raise last_exc or ConnectionError(
-            "Request failed after retries"
-        )  # pragma: no cover
+        for limit in (
+            self._config.max_connections,
+            self._config.max_keepalive_connections,
+        ):
+            if limit is not None:
+                connections = min(connections, limit)
+        everyone = asyncio.Event()
+        waiting = connections
+        held = 0
+
+        def _arrived() -> None:
+            nonlocal waiting
+            waiting -= 1
+            if not waiting:
+                everyone.set()
+
+        async def _open() -> None:
+            nonlocal held
+            counted = False
+            try:
+                request = self._client.stream("HEAD", path, headers=self._headers)
+                async with request as resp:
+                    held += 1
+                    counted = True
+                    _arrived()
+                    await everyone.wait()
+                    # Read to the end so the connection can be reused.
+                    await resp.aread()
+            finally:
+                if not counted:
+                    _arrived()
+
+        await asyncio.gather(
+            *(_open() for _ in range(connections)), return_exceptions=True
+        )
+        return held
+
+    @property
+    def retry_stats(self) -> RetryStats:
+        return self._retrier.stats
+
+    def _response(self, resp: httpx.Response) -> Response:
+        headers = resp.headers if self._config.response_headers else _NO_HEADERS
+        return Response(resp.status_code, headers=headers, content=resp.content)
+
+    def _slot(self) -> AsyncContextManager[Any]:
+        return nullcontext() if self._slots is None else self._slots
 
     async def close(self) -> None:
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
 
-def _safe_json(resp: httpx.Response) -> dict[str, Any] | None:
-    try:
-        return resp.json()
-    except Exception:
-        return None
+def _error_body(resp: httpx.Response) -> dict[str, Any] | None:
+    body = parse_json(resp.content)
+    return body if isinstance(body, dict) else None
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import re
+
+_STRUCTURAL = re.compile(rb'[\[\]{},"]')
+_STRING_END = re.compile(rb'["\\]')
+_WHITESPACE = b" \t\r\n"
+_SPACE = re.compile(r"[ \t\r\n]*")
+_DECODER = json.JSONDecoder()
+
+
+class ArrayItemScanner:
+    """Split a JSON list response into raw item documents as bytes arrive.
+
+    Accepts the same shapes as ``_extract_list``: a top-level array, an object
+    wrapping the array as its first list value (``{"gateways": [...]}``), or a
+    single object which becomes the only item. Only the item being scanned is
+    buffered once the array has been found, so callers can validate each item
+    with ``model_validate_json`` and drop it before the next one arrives.
+
+    >>> scanner = ArrayItemScanner()
+    >>> scanner.feed(b'{"gateways": [{"id": 1}, {"i')
+    [b'{"id": 1}']
+    >>> scanner.feed(b'd": 2}], "total": 2}') + scanner.close()
+    [b'{"id": 2}']
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._kind: bytes | None = None  # b"[", b"{" or b"" for scalars
+        self._item_depth: int | None = None
+        self._seg_start = 0
+        self._done = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        if self._done or not chunk:
+            return []
+        self._buf += chunk
+        if self._kind is None:
+            stripped = self._buf.lstrip(_WHITESPACE)
+            if not stripped:
+                return []
+            self._kind = bytes(stripped[:1]) if stripped[:1] in (b"[", b"{") else b""
+            if self._kind == b"[":
+                self._item_depth = 1
+        if not self._kind:
+            return []
+        items = self._scan()
+        if self._item_depth is not None and self._seg_start:
+            # Drop everything before the item in progress.
+            del self._buf[: self._seg_start]
+            self._pos -= self._seg_start
+            self._seg_start = 0
+        return items
+
+    def close(self) -> list[bytes]:
+        """Flush at end of body; an object without any list is a single item."""
+        if self._kind == b"{" and self._item_depth is None and not self._done:
+            self._done = True
+            return [bytes(self._buf.strip(_WHITESPACE))]
+        return []
+
+    def _scan(self) -> list[bytes]:
+        buf, items = self._buf, []
+        end = len(buf)
+        text: str | None = None
+        while not self._done and self._pos < end:
+            if self._depth == self._item_depth and self._pos == self._seg_start:
+                if text is None:
+                    # latin-1 maps each byte to one character, so offsets in
+                    # ``text`` are byte offsets into ``buf``.
+                    text = buf.decode("latin-1")
+                self._skip_items(text, items)
+            if self._in_string:
+                m = _STRING_END.search(buf, self._pos)
+                if m is None:
+                    self._pos = end
+                    break
+                if m.group() == b"\\":
+                    if m.end() >= end:
+                        # Escape split across chunks: resume at the backslash.
+                        self._pos = m.start()
+                        break
+                    self._pos = m.end() + 1
+                    continue
+                self._in_string = False
+                self._pos = m.end()
+                continue
+
+            m = _STRUCTURAL.search(buf, self._pos)
+            if m is None:
+                self._pos = end
+                break
+            i, char = m.start(), buf[m.start()]
+            self._pos = i + 1
+            if char == 0x22:  # "
+                self._in_string = True
+            elif char in (0x5B, 0x7B):  # [ {
+                self._depth += 1
+                if char == 0x5B and self._item_depth is None and self._depth == 2:
+                    # First list value of the top-level object.
+                    self._item_depth = 2
+                    self._seg_start = i + 1
+                elif self._depth == self._item_depth:
+                    self._seg_start = i + 1
+            elif char in (0x5D, 0x7D):  # ] }
+                if self._depth == self._item_depth:
+                    self._emit(items, i)
+                    self._done = True
+                self._depth -= 1
+            elif self._depth == self._item_depth:  # ,
+                self._emit(items, i)
+                self._seg_start = i + 1
+        return items
+
+    def _skip_items(self, text: str, items: list[bytes]) -> None:
+        """Fast path: let the C JSON scanner find where each item ends.
+
+        Stops at the closing bracket, at an item that isn't complete yet or
+        at anything it can't parse; the structural scan carries on from there.
+        """
+        end = len(text)
+        while True:
+            start = _SPACE.match(text, self._pos).end()
+            if start >= end or text[start] == "]":
+                return
+            try:
+                _, stop = _DECODER.raw_decode(text, start)
+            except ValueError:
+                return
+            sep = _SPACE.match(text, stop).end()
+            # A number at the end of the buffer may still be growing.
+            if sep >= end or text[sep] not in ",]":
+                return
+            items.append(bytes(self._buf[start:stop]))
+            # The separator is left for the structural scan.
+            self._pos = self._seg_start = sep
+            if text[sep] == "]":
+                return
+            self._pos = self._seg_start = sep + 1
+
+    def _emit(self, items: list[bytes], end: int) -> None:
+        item = bytes(self._buf[self._seg_start : end].strip(_WHITESPACE))
+        if item:
+            items.append(item)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Mapping
+
+from .._models._telemetry import epoch_seconds
+
+# Buckets per doubling of the value: about 9% relative resolution.
+_SUB = 8
+# Microsecond buckets up to 2**32 us (about 71 minutes); larger values land
+# in the last bucket.
+_BUCKETS = 32 * _SUB
+_STAGES = ("receive", "decode", "validate", "handoff", "latency")
+
+
+class Histogram:
+    """Fixed-size log-bucketed histogram of durations in seconds.
+
+    Recording is a ``log2`` and a list increment; percentiles are accurate to
+    the bucket width (about 9%).
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds < 0:
+            seconds = 0.0
+        index = int(math.log2(seconds * 1e6 + 1) * _SUB)
+        self.counts[index if index < _BUCKETS else _BUCKETS - 1] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the ``p``-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):  # pragma: no branch
+            seen += n
+            if seen >= rank:
+                if index == _BUCKETS - 1:  # open-ended overflow bucket
+                    return self.max
+                upper = (2 ** ((index + 1) / _SUB) - 1) / 1e6
+                return min(upper, self.max)
+        return self.max  # pragma: no cover
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class StreamProfile:
+    """Per-stage timings of a telemetry stream, for one message in ``1/rate``.
+
+    * ``receive`` — waiting for the next message from the socket
+    * ``decode`` — JSON/MessagePack/CBOR decoding
+    * ``validate`` — building the :class:`TelemetryEvent`
+    * ``handoff`` — the consumer's time between receiving an event and
+      asking for the next one
+    * ``latency`` — now minus the event's server ``timestamp``, when present
+
+    Enable it with the ``stream_profile_rate`` client option:
+
+    >>> client = AsyncScadable(stream_profile_rate=0.05)
+    >>> async with client.gateways.stream("gw-123") as events:
+    ...     async for event in events:
+    ...         handle(event)
+    ...     print(events.profile.summary())
+    """
+
+    def __init__(self, rate: float = 1.0):
+        if not 0 < rate <= 1:
+            raise ValueError("rate must be in (0, 1]")
+        self.rate = rate
+        self.receive = Histogram()
+        self.decode = Histogram()
+        self.validate = Histogram()
+        self.handoff = Histogram()
+        self.latency = Histogram()
+        # Whether the message currently going through the pipeline is timed.
+        self.active = False
+        self._every = max(1, round(1 / rate))
+        self._countdown = 1
+
+    def sample(self) -> bool:
+        """Decide whether the next message is timed; every ``1/rate``-th is."""
+        self._countdown -= 1
+        self.active = not self._countdown
+        if self.active:
+            self._countdown = self._every
+        return self.active
+
+    def observe_latency(self, message: Mapping[str, Any]) -> None:
+        """Record end-to-end latency from the server's ``timestamp``, if any."""
+        data = message.get("data")
+        stamp = data.get("timestamp") if isinstance(data, dict) else None
+        if stamp is None:
+            stamp = message.get("timestamp")
+        stamp = epoch_seconds(stamp)
+        if stamp is not None:
+            self.latency.record(time.time() - stamp)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {stage: getattr(self, stage).summary() for stage in _STAGES}
@@ -1,37 +1,208 @@
 from __future__ import annotations
 
-import json
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from time import perf_counter
 from typing import Any, AsyncIterator
 
-from websockets.asyncio.client import connect
-
 from .._config import ClientConfig
+from ._codecs import (
+    SUBPROTOCOL_PREFIX,
+    Decoder,
+    available_encodings,
+    get_decoder,
+)
+from ._profile import StreamProfile
+
+
+@dataclass
+class StreamStats:
+    """Byte counters and negotiated encoding for one stream connection.
+
+    ``wire_bytes`` counts everything read off the socket (handshake, framing
+    and compressed payloads); ``payload_bytes`` counts decompressed message
+    bodies (characters for text frames). Their ratio shows what
+    permessage-deflate is saving.
+    """
+
+    encoding: str = "json"
+    messages: int = 0
+    payload_bytes: int = 0
+    wire_bytes: int = 0
+    decode_errors: int = 0
+
+    @property
+    def compression_ratio(self) -> float:
+        if not self.wire_bytes:
+            return 1.0
+        return self.payload_bytes / self.wire_bytes
+
+
+@lru_cache(maxsize=None)
+def _metered_connection() -> type[Any]:
+    # websockets is imported on first connect, not with the SDK.
+    from websockets.asyncio.client import ClientConnection
+
+    class _MeteredConnection(ClientConnection):
+        def __init__(self, *args: Any, **kwargs: Any):
+            super().__init__(*args, **kwargs)
+            self.stats = StreamStats()
+
+        def data_received(self, data: bytes) -> None:
+            self.stats.wire_bytes += len(data)
+            super().data_received(data)
+
+    return _MeteredConnection
+
+
+class WebSocketStream:
+    """Async iterator over the decoded messages of one connection."""
+
+    def __init__(
+        self, ws: Any, encoding: str = "json", profile: StreamProfile | None = None
+    ):
+        self._ws = ws
+        self._decoder: Decoder = get_decoder(encoding)
+        self._text_decoder: Decoder = get_decoder("json")
+        self.stats = ws.stats
+        self.stats.encoding = encoding
+        self.profile = profile
+
+    def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        return self._iter()
+
+    async def _iter(self) -> AsyncIterator[dict[str, Any]]:
+        from websockets.exceptions import ConnectionClosedOK
+
+        ws, stats, profile = self._ws, self.stats, self.profile
+        decoder, text_decoder = self._decoder, self._text_decoder
+        while True:
+            timed = profile is not None and profile.sample()
+            if timed:
+                started = perf_counter()
+            try:
+                raw = await ws.recv()
+            except ConnectionClosedOK:
+                return
+            if timed:
+                received = perf_counter()
+                profile.receive.record(received - started)  # type: ignore[union-attr]
+            stats.messages += 1
+            stats.payload_bytes += len(raw)
+            try:
+                if isinstance(raw, str):
+                    msg = text_decoder(raw)
+                else:
+                    # Binary frames reach the decoder without another copy.
+                    msg = decoder(memoryview(raw))
+            except ValueError:
+                stats.decode_errors += 1
+                continue
+            if timed:
+                profile.decode.record(perf_counter() - received)  # type: ignore[union-attr]
+            yield msg
 
 
 class WebSocketTransport:
     def __init__(self, config: ClientConfig):
         self._config = config
+        # Connections opened by :meth:`preconnect`, by path.
+        self._ready: dict[str, tuple[Any, AsyncExitStack]] = {}
 
-    @asynccontextmanager
-    async def connect(
-        self, path: str
-    ) -> AsyncIterator[AsyncIterator[dict[str, Any]]]:  # pragma: no cover
+    def _encodings(self) -> list[str]:
+        encodings = self._config.stream_encodings
+        if encodings is None:
+            return available_encodings()
+        for name in encodings:
+            get_decoder(name)
+        return list(encodings)
+
+    def _connect_options(self) -> dict[str, Any]:
+        config = self._config
+        options: dict[str, Any] = {
+            "compression": config.ws_compression,
+            "max_size": config.ws_max_size,
+            "max_queue": config.ws_max_queue,
+            "write_limit": config.ws_write_limit,
+            "ping_interval": config.ws_ping_interval,
+            "ping_timeout": config.ws_ping_timeout,
+            "open_timeout": config.ws_open_timeout,
+            "create_connection": _metered_connection(),
+        }
+        encodings = self._encodings()
+        if encodings != ["json"]:
+            # Offered in preference order; a server that ignores the
+            # subprotocol header keeps sending JSON.
+            options["subprotocols"] = [SUBPROTOCOL_PREFIX + e for e in encodings]
+        tuned = (
+            config.ws_compression_level is not None
+            or config.ws_max_window_bits is not None
+        )
+        if config.ws_compression == "deflate" and tuned:
+            from websockets.extensions.permessage_deflate import (
+                ClientPerMessageDeflateFactory,
+            )
+
+            compress_settings: dict[str, Any] = {"memLevel": 5}
+            if config.ws_compression_level is not None:
+                compress_settings["level"] = config.ws_compression_level
+            options["compression"] = None
+            options["extensions"] = [
+                ClientPerMessageDeflateFactory(
+                    server_max_window_bits=config.ws_max_window_bits,
+                    client_max_window_bits=config.ws_max_window_bits or True,
+                    compress_settings=compress_settings,
+                )
+            ]
+        return options
+
+    async def _dial(self, path: str) -> tuple[Any, AsyncExitStack]:
         base = self._config.base_url.replace("https://", "wss://").replace(
             "http://", "ws://"
         )
         url = f"{base}{path}?token={self._config.api_key}"
 
-        async with connect(url) as ws:
+        from websockets.asyncio.client import connect
+
+        stack = AsyncExitStack()
+        ws = await stack.enter_async_context(connect(url, **self._connect_options()))
+        return ws, stack
 
-            async def _iter() -> AsyncIterator[dict[str, Any]]:
-                async for raw in ws:
-                    try:
-                        yield json.loads(raw)
-                    except json.JSONDecodeError:
-                        continue
+    async def preconnect(self, path: str) -> None:
+        """Open the connection for ``path`` now; the next :meth:`connect` uses it.
+
+        Messages the server sends in between wait in the receive queue (up
+        to ``ws_max_queue``) and are the first ones the stream yields.
+        """
+        if path not in self._ready:
+            self._ready[path] = await self._dial(path)
+
+    @asynccontextmanager
+    async def connect(self, path: str) -> AsyncIterator[WebSocketStream]:
+        from websockets.protocol import State
 
-            yield _iter()
+        ready = self._ready.pop(path, None)
+        if ready is not None and ready[0].state is not State.OPEN:
+            await ready[1].aclose()  # closed by the server while waiting
+            ready = None
+        ws, stack = ready or await self._dial(path)
+        async with stack:
+            encoding = "json"
+            if ws.subprotocol and ws.subprotocol.startswith(SUBPROTOCOL_PREFIX):
+                encoding = ws.subprotocol[len(SUBPROTOCOL_PREFIX) :]
+            try:
+                rate = self._config.stream_profile_rate
+                profile = None if rate is None else StreamProfile(rate)
+                yield WebSocketStream(ws, encoding, profile)
+            finally:
+                # With the receive queue full, reading stays paused and the
+                # server's close frame is never seen, so closing would wait
+                # for close_timeout. Read (and discard) until the close.
+                ws.transport.resume_reading()
 
-    async def close(self) -> None:  # pragma: no cover
-        pass
+    async def close(self) -> None:
+        """Close pre-opened connections that were never used."""
+        ready, self._ready = self._ready, {}
+        for _, stack in ready.values():
+            await stack.aclose()
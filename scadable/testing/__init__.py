@@ -0,0 +1,24 @@
+"""Test and load-testing helpers: a local mock of the Scadable API.
+
+>>> from scadable import Scadable
+>>> from scadable.testing import MockServer
+>>> with MockServer(fleet_size=100) as server:
+...     client = Scadable(api_key="sk_test", base_url=server.base_url)
+...     assert len(client.gateways.list()) == 100
+
+Run ``python -m scadable.testing --help`` for a standalone server.
+"""
+
+from ._fleet import make_event, make_fleet, make_gateway
+from ._recording import Session, SessionRecorder
+from ._server import MockServer, MockStats
+
+__all__ = [
+    "MockServer",
+    "MockStats",
+    "Session",
+    "SessionRecorder",
+    "make_event",
+    "make_fleet",
+    "make_gateway",
+]
@@ -0,0 +1,55 @@
+"""Standalone mock Scadable API: ``python -m scadable.testing --port 8000``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from ._server import MockServer
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m scadable.testing", description=__doc__
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fleet-size", type=int, default=100)
+    parser.add_argument("--devices-per-gateway", type=int, default=4)
+    parser.add_argument("--registers", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--api-key", help="reject requests with any other key")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0..1, 503s")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="0..1, 429s")
+    parser.add_argument("--event-rate", type=float, help="events/s per stream")
+    parser.add_argument("--stream-events", type=int, help="close after N events")
+    parser.add_argument(
+        "--command-latency", type=float, default=0.0, help="seconds to task end"
+    )
+    parser.add_argument(
+        "--command-failure-rate", type=float, default=0.0, help="0..1, failed tasks"
+    )
+    parser.add_argument(
+        "--batch-commands", action="store_true", help="serve /v1/gateways/commands"
+    )
+    parser.add_argument("--upstream", help="proxy this API instead of a fake fleet")
+    parser.add_argument("--record", help="with --upstream, write session here")
+    parser.add_argument("--replay", help="serve a recorded session file")
+    parser.add_argument("--replay-speed", type=float, default=1.0)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    server = MockServer(**vars(args))
+    print(f"Mock Scadable API on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
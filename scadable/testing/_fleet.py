@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import random
+import time
+from typing import Any
+
+_PROTOCOLS = ("modbus", "opcua", "mqtt", "bacnet")
+_STATUSES = ("online", "online", "online", "online", "offline", "degraded")
+
+
+def make_gateway(
+    index: int, *, devices: int = 4, rng: random.Random | None = None
+) -> dict[str, Any]:
+    """Build one synthetic gateway payload shaped like ``/v1/gateways`` items."""
+    rng = rng or random.Random(index)
+    gateway_id = f"gw-{index:06d}"
+    return {
+        "gateway_id": gateway_id,
+        "id": gateway_id,
+        "name": f"Gateway {index}",
+        "status": rng.choice(_STATUSES),
+        "firmware_version": f"0.{rng.randint(4, 8)}.{rng.randint(0, 9)}",
+        "project_id": f"proj-{index % 25:03d}",
+        "os": "linux",
+        "arch": rng.choice(("arm64", "amd64")),
+        "last_seen_at": "2026-01-01T00:00:00Z",
+        "created_at": "2025-01-01T00:00:00Z",
+        "devices": [
+            {
+                "id": f"{gateway_id}-d{d}",
+                "device_id": f"{gateway_id}-d{d}",
+                "name": f"device-{d}",
+                "status": "connected",
+                "protocol": rng.choice(_PROTOCOLS),
+                "connected": True,
+                "gateway_id": gateway_id,
+                "last_seen_at": "2026-01-01T00:00:00Z",
+                "last_error": None,
+            }
+            for d in range(devices)
+        ],
+        "uptime_percent_30d": round(rng.uniform(90, 100), 2),
+        "uptime_percent_7d": round(rng.uniform(90, 100), 2),
+    }
+
+
+def make_fleet(
+    size: int, *, devices_per_gateway: int = 4, seed: int | None = 0
+) -> list[dict[str, Any]]:
+    """Build ``size`` synthetic gateways; the same seed yields the same fleet."""
+    rng = random.Random(seed)
+    return [make_gateway(i, devices=devices_per_gateway, rng=rng) for i in range(size)]
+
+
+def make_event(
+    gateway: dict[str, Any],
+    *,
+    registers: int = 20,
+    rng: random.Random | None = None,
+) -> dict[str, Any]:
+    """Build a telemetry event for ``gateway`` like those sent on ``/stream``."""
+    rng = rng or random.Random()
+    return {
+        "type": "telemetry",
+        "data": {
+            "gateway_id": gateway.get("gateway_id"),
+            "timestamp": time.time(),
+            "devices": {
+                device["name"]: {
+                    "connected": device.get("connected", True),
+                    "protocol": device.get("protocol"),
+                    "last_error": device.get("last_error"),
+                    "data": {
+                        f"reg_{r}": round(rng.uniform(0, 100), 3)
+                        for r in range(registers)
+                    },
+                }
+                for device in gateway.get("devices", [])
+            },
+        },
+    }
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import base64
+import json
+from collections import defaultdict
+from typing import IO, Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+
+def session_key(target: str) -> str:
+    """Request target without credentials, so sessions replay under any key."""
+    parts = urlsplit(target)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "token"]
+    return parts.path + (f"?{urlencode(query)}" if query else "")
+
+
+class SessionRecorder:
+    """Append HTTP exchanges and stream messages to a JSON Lines file."""
+
+    def __init__(self, path: str):
+        self._file: IO[str] = open(path, "w", encoding="utf-8")
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def http(self, method: str, target: str, status: int, body: bytes) -> None:
+        self._write(
+            {
+                "kind": "http",
+                "method": method,
+                "target": session_key(target),
+                "status": status,
+                "body": body.decode("utf-8", "replace"),
+            }
+        )
+
+    def ws(self, target: str, offset: float, data: str | bytes) -> None:
+        entry: dict[str, Any] = {
+            "kind": "ws",
+            "target": session_key(target),
+            "t": round(offset, 6),
+        }
+        if isinstance(data, bytes):
+            entry["b64"] = base64.b64encode(data).decode()
+        else:
+            entry["data"] = data
+        self._write(entry)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Session:
+    """A recorded session loaded for replay.
+
+    Repeated requests for the same target return the recorded responses in
+    order; once exhausted the last one keeps being served.
+    """
+
+    def __init__(self, entries: list[dict[str, Any]]):
+        self._http: dict[tuple[str, str], list[dict[str, Any]]] = defaultdict(list)
+        self._ws: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._cursor: dict[tuple[str, str], int] = defaultdict(int)
+        for entry in entries:
+            if entry["kind"] == "http":
+                self._http[(entry["method"], entry["target"])].append(entry)
+            else:
+                self._ws[entry["target"]].append(entry)
+
+    @classmethod
+    def load(cls, path: str) -> Session:
+        with open(path, encoding="utf-8") as f:
+            return cls([json.loads(line) for line in f if line.strip()])
+
+    def http_response(self, method: str, target: str) -> tuple[int, bytes] | None:
+        key = (method, session_key(target))
+        recorded = self._http.get(key)
+        if not recorded:
+            return None
+        index = min(self._cursor[key], len(recorded) - 1)
+        self._cursor[key] += 1
+        entry = recorded[index]
+        return entry["status"], entry["body"].encode()
+
+    def ws_messages(self, target: str) -> list[tuple[float, str | bytes]]:
+        return [
+            (e["t"], base64.b64decode(e["b64"]) if "b64" in e else e["data"])
+            for e in self._ws.get(session_key(target), [])
+        ]
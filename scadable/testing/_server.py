@@ -0,0 +1,552 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, AsyncIterator
+from urllib.parse import parse_qs, urlsplit
+
+from ._fleet import make_event, make_fleet
+from ._recording import Session, SessionRecorder
+
+
+@dataclass
+class MockStats:
+    """What the mock server has seen, for asserting on client behaviour."""
+
+    requests: int = 0
+    connections: int = 0
+    commands: int = 0
+    responses: dict[int, int] = field(default_factory=dict)
+    streams: int = 0
+    events_sent: int = 0
+
+
+class MockServer:
+    """In-process fake of the Scadable API for tests and load testing.
+
+    Serves ``/v1/gateways``, ``/v1/gateways/{id}``, ``/v1/gateways/{id}/devices``
+    and the ``/v1/gateways/{id}/stream`` WebSocket on a single port, so a
+    client only needs ``base_url=server.base_url``. HTTP connections are kept
+    alive like the real API.
+
+    Use ``async with MockServer() as server`` inside a running loop, or a plain
+    ``with`` block to run it on its own thread for sync clients::
+
+        with MockServer(fleet_size=1000, error_rate=0.05) as server:
+            client = Scadable(api_key="sk_test", base_url=server.base_url)
+            client.gateways.list()
+            print(server.stats.responses)
+
+    Faults are injected per request: ``rate_limit_rate`` and ``error_rate``
+    are probabilities of answering 429 or 503, ``latency`` (seconds, plus up
+    to ``latency_jitter``) delays every response. Streams send ``event_rate``
+    events per second (unthrottled when ``None``) and close after
+    ``stream_events`` events (never when ``None``).
+
+    Commands POSTed to ``/v1/gateways/{id}/commands`` (or, with
+    ``batch_commands``, many at once to ``/v1/gateways/commands``) return a
+    ``task_id``; ``command_latency`` seconds later a ``task`` event with that
+    ``task_id`` and a ``completed`` status (``failed`` with probability
+    ``command_failure_rate``) goes out on the gateway's open streams.
+    ``PATCH /v1/gateways/{id}`` updates the gateway's fields.
+
+    Pass ``upstream`` with ``record`` to proxy a real backend and write the
+    session to a JSON Lines file, and ``replay`` to serve a recorded session
+    instead of the synthetic fleet.
+    """
+
+    def __init__(
+        self,
+        *,
+        fleet_size: int = 10,
+        devices_per_gateway: int = 4,
+        registers: int = 20,
+        seed: int | None = 0,
+        api_key: str | None = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        event_rate: float | None = None,
+        stream_events: int | None = None,
+        command_latency: float = 0.0,
+        command_failure_rate: float = 0.0,
+        batch_commands: bool = False,
+        compression: bool = True,
+        upstream: str | None = None,
+        record: str | None = None,
+        replay: str | None = None,
+        replay_speed: float = 1.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        if record and not upstream:
+            raise ValueError("record= needs upstream= to proxy a real backend")
+        self.registers = registers
+        self.api_key = api_key
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.event_rate = event_rate
+        self.stream_events = stream_events
+        self.command_latency = command_latency
+        self.command_failure_rate = command_failure_rate
+        self.batch_commands = batch_commands
+        self.compression = compression
+        self.replay_speed = replay_speed
+        self.host = host
+        self.port = port
+        self.stats = MockStats()
+
+        self._rng = random.Random(seed)
+        self._gateways: dict[str, dict[str, Any]] = {}
+        self._list_body: bytes | None = None
+        self._tasks = 0
+        # Queues of task events for each open stream, by gateway.
+        self._listeners: dict[str, set[asyncio.Queue[str]]] = {}
+        self.set_fleet(make_fleet(fleet_size, devices_per_gateway=devices_per_gateway))
+
+        self._upstream = upstream
+        self._record_path = record
+        self._session = Session.load(replay) if replay else None
+        self._recorder: SessionRecorder | None = None
+        self._proxy: Any = None
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[asyncio.Task[Any]] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # -- fleet ---------------------------------------------------------------
+
+    @property
+    def gateways(self) -> list[dict[str, Any]]:
+        return list(self._gateways.values())
+
+    def set_fleet(self, gateways: list[dict[str, Any]]) -> None:
+        self._gateways = {gw["gateway_id"]: gw for gw in gateways}
+        self._list_body = None
+
+    def add_gateway(self, gateway: dict[str, Any]) -> None:
+        self._gateways[gateway["gateway_id"]] = gateway
+        self._list_body = None
+
+    def update_gateway(self, gateway_id: str, **fields: Any) -> None:
+        self._gateways[gateway_id].update(fields)
+        self._list_body = None
+
+    def remove_gateway(self, gateway_id: str) -> None:
+        del self._gateways[gateway_id]
+        self._list_body = None
+
+    # -- lifecycle -----------------------------------------------------------
+
+    async def start(self) -> MockServer:
+        if self._upstream:
+            import httpx
+
+            self._proxy = httpx.AsyncClient(base_url=self._upstream)
+            if self._record_path:
+                self._recorder = SessionRecorder(self._record_path)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._proxy is not None:
+            await self._proxy.aclose()
+            self._proxy = None
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self) -> MockServer:
+        return await self.start()
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.stop()
+
+    def __enter__(self) -> MockServer:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="scadable-mock", daemon=True
+        )
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        assert self._loop is not None and self._thread is not None
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    # -- HTTP ----------------------------------------------------------------
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections.add(task)
+        self.stats.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                method, target, headers = _parse_head(head)
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(reader, writer, head, target)
+                    return
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+                status, payload, extra = await self._respond(
+                    method, target, headers, body
+                )
+                if method == "HEAD":
+                    payload = b""
+                self._write_response(writer, status, payload, extra, headers)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    return
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _delay(self) -> None:
+        delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _respond(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, bytes, dict[str, str]]:
+        self.stats.requests += 1
+        await self._delay()
+        if self.api_key is not None and headers.get("x-api-key") != self.api_key:
+            return 401, _error("invalid api key"), {}
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return 429, _error("rate limited"), {"Retry-After": "1"}
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 503, _error("injected failure"), {}
+
+        if self._session is not None:
+            recorded = self._session.http_response(method, target)
+            if recorded is None:
+                return 404, _error("not in recorded session"), {}
+            return recorded[0], recorded[1], {}
+        if self._proxy is not None:
+            return await self._forward(method, target, headers, body)
+        return self._route(method, target, body)
+
+    def _route(
+        self, method: str, target: str, body: bytes
+    ) -> tuple[int, bytes, dict[str, str]]:
+        parts = urlsplit(target).path.strip("/").split("/")
+        if method == "POST" and parts[:2] == ["v1", "gateways"]:
+            return self._command(parts, body)
+        if method == "PATCH" and parts[:2] == ["v1", "gateways"] and len(parts) == 3:
+            return self._patch(parts[2], body)
+        if method not in ("GET", "HEAD"):
+            return 405, _error("method not allowed"), {}
+        if parts[:2] != ["v1", "gateways"]:
+            return 404, _error("not found"), {}
+        if len(parts) == 2:
+            if self._list_body is None:
+                gateways = list(self._gateways.values())
+                self._list_body = json.dumps(
+                    {"gateways": gateways, "total": len(gateways)}
+                ).encode()
+            return 200, self._list_body, {}
+        gateway = self._gateways.get(parts[2])
+        if gateway is None:
+            return 404, _error("gateway not found"), {}
+        if len(parts) == 3:
+            return 200, json.dumps(gateway).encode(), {}
+        if parts[3:] == ["devices"]:
+            return 200, json.dumps({"devices": gateway["devices"]}).encode(), {}
+        return 404, _error("not found"), {}
+
+    def _patch(self, gateway_id: str, body: bytes) -> tuple[int, bytes, dict[str, str]]:
+        fields = _json_object(body)
+        if fields is None:
+            return 400, _error("body must be a JSON object"), {}
+        if gateway_id not in self._gateways:
+            return 404, _error("gateway not found"), {}
+        self.update_gateway(gateway_id, **fields)
+        return 200, json.dumps(self._gateways[gateway_id]).encode(), {}
+
+    def _command(
+        self, parts: list[str], body: bytes
+    ) -> tuple[int, bytes, dict[str, str]]:
+        payload = _json_object(body)
+        if payload is None:
+            return 400, _error("body must be a JSON object"), {}
+        if parts[2:] == ["commands"] and self.batch_commands:
+            tasks = []
+            for item in payload.get("commands", []):
+                gateway_id = item.get("gateway_id")
+                if gateway_id in self._gateways:
+                    tasks.append(self._start_task(gateway_id, item.get("command")))
+                else:
+                    tasks.append({"gateway_id": gateway_id, "error": "not found"})
+            return 200, json.dumps({"tasks": tasks}).encode(), {}
+        if len(parts) != 4 or parts[3] != "commands":
+            return 405, _error("method not allowed"), {}
+        if parts[2] not in self._gateways:
+            return 404, _error("gateway not found"), {}
+        task = self._start_task(parts[2], payload.get("command"))
+        return 202, json.dumps(task).encode(), {}
+
+    def _start_task(self, gateway_id: str, command: Any) -> dict[str, Any]:
+        self._tasks += 1
+        self.stats.commands += 1
+        task_id = f"task-{self._tasks:06d}"
+        failed = self._rng.random() < self.command_failure_rate
+        event = {
+            "type": "task",
+            "task_id": task_id,
+            "data": {
+                "gateway_id": gateway_id,
+                "command": command,
+                "status": "failed" if failed else "completed",
+            },
+        }
+        asyncio.get_running_loop().call_later(
+            self.command_latency, self._publish, gateway_id, event
+        )
+        return {"gateway_id": gateway_id, "task_id": task_id, "status": "pending"}
+
+    def _publish(self, gateway_id: str, event: dict[str, Any]) -> None:
+        event["data"]["timestamp"] = time.time()
+        message = json.dumps(event)
+        for queue in self._listeners.get(gateway_id, ()):
+            queue.put_nowait(message)
+
+    async def _forward(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, bytes, dict[str, str]]:
+        forwarded = {k: v for k, v in headers.items() if k in ("x-api-key",)}
+        resp = await self._proxy.request(
+            method, target, content=body or None, headers=forwarded
+        )
+        if self._recorder is not None:
+            self._recorder.http(method, target, resp.status_code, resp.content)
+        return resp.status_code, resp.content, {}
+
+    def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        extra: dict[str, str],
+        request_headers: dict[str, str],
+    ) -> None:
+        self.stats.responses[status] = self.stats.responses.get(status, 0) + 1
+        headers = {"Content-Type": "application/json", **extra}
+        accepts_gzip = "gzip" in request_headers.get("accept-encoding", "")
+        if self.compression and accepts_gzip and len(body) > 1024:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(body))
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+
+    # -- WebSocket -----------------------------------------------------------
+
+    async def _websocket(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        head: bytes,
+        target: str,
+    ) -> None:
+        from websockets.extensions.permessage_deflate import (
+            ServerPerMessageDeflateFactory,
+        )
+        from websockets.protocol import State
+        from websockets.server import ServerProtocol
+
+        protocol = ServerProtocol(
+            extensions=[ServerPerMessageDeflateFactory()], max_size=None
+        )
+        protocol.receive_data(head)
+        request = protocol.events_received()[0]
+        token = parse_qs(urlsplit(target).query).get("token", [None])[0]
+        if self.api_key is not None and token != self.api_key:
+            response = protocol.reject(401, "invalid api key")
+        else:
+            response = protocol.accept(request)
+        protocol.send_response(response)
+        _flush(protocol, writer)
+        if response.status_code != 101:
+            return
+
+        self.stats.streams += 1
+        inbound = asyncio.create_task(_ws_reader(protocol, reader, writer))
+        parts = urlsplit(target).path.strip("/").split("/")
+        listeners = self._listeners.setdefault(
+            parts[2] if len(parts) > 2 else "", set()
+        )
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        listeners.add(queue)
+        tasks = asyncio.create_task(self._send_tasks(queue, protocol, writer))
+        try:
+            async for message in self._ws_source(target):
+                if inbound.done() or protocol.state is not State.OPEN:
+                    break
+                if isinstance(message, str):
+                    protocol.send_text(message.encode())
+                else:
+                    protocol.send_binary(message)
+                _flush(protocol, writer)
+                await writer.drain()
+                self.stats.events_sent += 1
+            if protocol.state is State.OPEN:
+                protocol.send_close(1000)
+                _flush(protocol, writer)
+            await asyncio.wait_for(asyncio.shield(inbound), timeout=5)
+        except (ConnectionError, asyncio.TimeoutError):
+            pass
+        finally:
+            listeners.discard(queue)
+            tasks.cancel()
+            inbound.cancel()
+
+    async def _send_tasks(
+        self, queue: asyncio.Queue[str], protocol: Any, writer: asyncio.StreamWriter
+    ) -> None:
+        from websockets.protocol import State
+
+        while True:
+            message = await queue.get()
+            if protocol.state is not State.OPEN:
+                return
+            protocol.send_text(message.encode())
+            _flush(protocol, writer)
+            self.stats.events_sent += 1
+
+    async def _ws_source(self, target: str) -> AsyncIterator[str | bytes]:
+        if self._session is not None:
+            elapsed = 0.0
+            for offset, message in self._session.ws_messages(target):
+                if self.replay_speed > 0 and offset > elapsed:
+                    await asyncio.sleep((offset - elapsed) / self.replay_speed)
+                    elapsed = offset
+                yield message
+            return
+        if self._proxy is not None:
+            async for message in self._relay(target):
+                yield message
+            return
+
+        parts = urlsplit(target).path.strip("/").split("/")
+        gateway = self._gateways.get(parts[2] if len(parts) > 2 else "", {})
+        # A few pre-rendered events with fresh timestamps keep the server cheap
+        # enough to measure the client, not the mock.
+        pool = []
+        for _ in range(_EVENT_POOL):
+            event = make_event(gateway, registers=self.registers, rng=self._rng)
+            event["data"]["timestamp"] = _TIMESTAMP
+            pool.append(json.dumps(event))
+        sent = 0
+        while self.stream_events is None or sent < self.stream_events:
+            template = pool[sent % _EVENT_POOL]
+            yield template.replace(f'"{_TIMESTAMP}"', repr(time.time()))
+            sent += 1
+            await asyncio.sleep(1 / self.event_rate if self.event_rate else 0)
+
+    async def _relay(self, target: str) -> AsyncIterator[str | bytes]:
+        from websockets.asyncio.client import connect
+
+        assert self._upstream is not None
+        base = self._upstream.replace("https://", "wss://").replace("http://", "ws://")
+        started = time.monotonic()
+        async with connect(base + target) as upstream:
+            async for message in upstream:
+                if self._recorder is not None:
+                    offset = time.monotonic() - started
+                    self._recorder.ws(target, offset, message)
+                yield message
+
+
+_EVENT_POOL = 16
+_TIMESTAMP = "@timestamp@"
+
+
+def _error(message: str) -> bytes:
+    return json.dumps({"error": message}).encode()
+
+
+def _json_object(body: bytes) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _parse_head(head: bytes) -> tuple[str, str, dict[str, str]]:
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+def _flush(protocol: Any, writer: asyncio.StreamWriter) -> None:
+    for data in protocol.data_to_send():
+        if data:
+            writer.write(data)
+        elif writer.can_write_eof():
+            writer.write_eof()
+
+
+async def _ws_reader(
+    protocol: Any, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Answer pings and the closing handshake while events are being sent."""
+    from websockets.protocol import State
+
+    while protocol.state is not State.CLOSED:
+        data = await reader.read(65536)
+        if not data:
+            protocol.receive_eof()
+            return
+        protocol.receive_data(data)
+        protocol.events_received()
+        _flush(protocol, writer)
@@ -18,3 +18,37 @@ def client(mock_api):
 @pytest.fixture
 def async_client(mock_api):
     return AsyncScadable(api_key="sk_test_123", base_url="https://test.scadable.com")
+
+
+class WSServer:
+    """Local WebSocket server that replays ``messages`` to every client."""
+
+    def __init__(self):
+        self.messages = []
+        self.requests = []
+        self.subprotocol = None
+        self.base_url = None
+
+    def select_subprotocol(self, ws, offered):
+        return self.subprotocol if self.subprotocol in offered else None
+
+    async def handler(self, ws):
+        self.requests.append(ws.request)
+        for msg in self.messages:
+            await ws.send(msg)
+
+
+@pytest.fixture
+async def ws_server():
+    from websockets.asyncio.server import serve
+
+    server = WSServer()
+    async with serve(
+        server.handler,
+        "127.0.0.1",
+        0,
+        select_subprotocol=server.select_subprotocol,
+    ) as srv:
+        port = srv.sockets[0].getsockname()[1]
+        server.base_url = f"http://127.0.0.1:{port}"
+        yield server
@@ -0,0 +1,316 @@
+"""Bulk commands and updates, with task completion correlated from streams."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+import respx
+
+from scadable import (
+    AsyncScadable,
+    CommandBatch,
+    CommandResult,
+    ConnectionError,
+    InternalServerError,
+    NotFoundError,
+    PermissionError,
+    RetryPolicy,
+    Scadable,
+)
+from scadable import _commands
+from scadable.testing import MockServer
+
+BASE = "https://test.scadable.com"
+IDS = [f"gw-{i:06d}" for i in range(20)]
+
+
+async def test_bulk_command_completes_from_streams():
+    async with MockServer(
+        fleet_size=20, event_rate=5, command_latency=0.05, command_failure_rate=0.3
+    ) as server:
+        async with AsyncScadable("sk_test", base_url=server.base_url) as client:
+            done = []
+            batch = await client.gateways.bulk_command(
+                IDS + ["gw-missing"], "reboot", {"delay": 1}, concurrency=8
+            )
+            batch.on_complete(done.append)
+            assert await batch.wait(timeout=5)
+            assert len(batch) == 21 and not batch.pending and batch.done
+            missing = batch.results["gw-missing"]
+            assert missing.status == "error" and isinstance(
+                missing.error, NotFoundError
+            )
+            statuses = {r.status for r in batch if r.gateway_id != "gw-missing"}
+            assert statuses == {"completed", "failed"}
+            assert {r.gateway_id for r in batch.failed} >= {"gw-missing"}
+            assert all(r.task_id for r in batch if r.ok)
+            assert len(done) == 21  # including results done before registering
+            assert server.stats.commands == 20 and server.stats.streams == 21
+            await asyncio.sleep(0)
+            assert not batch._watchers  # every stream closed with its task
+
+
+async def test_bulk_command_uses_batch_endpoint():
+    async with MockServer(fleet_size=20, event_rate=5, batch_commands=True) as server:
+        async with AsyncScadable(
+            "sk_test",
+            base_url=server.base_url,
+            command_batch_path="/v1/gateways/commands",
+        ) as client:
+            batch = await client.gateways.bulk_command(
+                IDS + ["gw-missing"], "sync", batch_size=8
+            )
+            assert server.stats.requests == 3
+            assert await batch.wait(timeout=5)
+            assert batch.results["gw-missing"].error.message == "not found"
+            assert sum(r.ok for r in batch) == 20
+
+        # A server without the endpoint fails the whole chunk.
+        server.batch_commands = False
+        async with AsyncScadable(
+            "sk_test",
+            base_url=server.base_url,
+            command_batch_path="/v1/gateways/commands",
+        ) as client:
+            batch = await client.gateways.bulk_command(IDS[:3], "sync", watch=False)
+        assert [r.status for r in batch] == ["error"] * 3
+
+
+def test_sync_bulk_command_and_manual_observe():
+    with MockServer(fleet_size=5, batch_commands=True) as server:
+        with Scadable("sk_test", base_url=server.base_url) as client:
+            batch = client.gateways.bulk_command(IDS[:5] + ["gw-missing"], "reboot")
+            assert len(batch.pending) == 5 and len(batch.failed) == 1
+            result = client.gateways.command(IDS[0], "ping")
+            assert result.task_id and result.status == "pending"
+
+        with Scadable(
+            "sk_test",
+            base_url=server.base_url,
+            command_batch_path="/v1/gateways/commands",
+        ) as client:
+            chunked = client.gateways.bulk_command(IDS[:5], "reboot", batch_size=2)
+        assert server.stats.commands == 11 and len(chunked.pending) == 5
+
+        server.batch_commands = False
+        with Scadable(
+            "sk_test",
+            base_url=server.base_url,
+            command_batch_path="/v1/gateways/commands",
+        ) as client:
+            rejected = client.gateways.bulk_command(IDS[:2], "reboot")
+        assert [r.status for r in rejected] == ["error"] * 2
+
+    first = batch.results[IDS[0]]
+    running = {"type": "task", "task_id": first.task_id, "data": {"status": "running"}}
+    assert batch.observe(running) and first.status == "running" and not first.done
+    ok = {"type": "task", "task_id": first.task_id, "data": {"result": {"up": 1}}}
+    assert batch.observe(ok) and first.ok and first.result == {"up": 1}
+    assert batch.observe(running) and first.ok  # late events are ignored
+    assert not batch.observe({"type": "telemetry", "data": {}})
+
+
+async def test_early_events_and_timeouts(monkeypatch):
+    batch = CommandBatch()
+    assert await batch.wait()
+    # The completion can beat the response that carries the task id.
+    assert not batch.observe({"type": "task", "task_id": "t1", "data": {}})
+    batch._add(CommandResult("gw-1", task_id="t1"))
+    assert batch.results["gw-1"].ok
+
+    monkeypatch.setattr(_commands, "_MAX_EARLY", 1)
+    batch.observe({"type": "task", "task_id": "t2", "data": {}})
+    batch.observe({"type": "task", "task_id": "t3", "data": {}})
+    assert list(batch._early) == ["t3"]
+
+    batch._add(CommandResult("gw-2", task_id="t4"))
+    assert not await batch.wait(timeout=0.05)
+    batch._watchers["gw-2"] = asyncio.create_task(asyncio.sleep(60))
+    await batch.close()
+    assert not batch._watchers
+
+
+async def test_unwatched_gateways_are_reported(monkeypatch):
+    monkeypatch.setattr(_commands, "_RECONNECT_DELAY", 0)
+    async with MockServer(fleet_size=3) as server:
+        async with AsyncScadable("sk_test", base_url=server.base_url) as client:
+            gateways = client.gateways
+            dials = []
+
+            async def preconnect(gateway_id):
+                if gateway_id == IDS[0]:
+                    raise OSError("refused")
+
+            @asynccontextmanager
+            async def stream(gateway_id):
+                dials.append(gateway_id)
+                raise ConnectionError("dropped")
+                yield
+
+            gateways.preconnect = preconnect
+            gateways.stream = stream
+            batch = await gateways.bulk_command(IDS[:2], "reboot")
+            assert not await asyncio.wait_for(batch.wait(), 5)
+            assert set(batch.unwatched) == set(IDS[:2])
+            assert isinstance(batch.unwatched[IDS[0]], OSError)
+            assert dials == [IDS[1]] * (1 + _commands._RECONNECTS)
+            assert len(batch.pending) == 2 and batch.unobserved == batch.pending
+
+            async def broken(*args, **kwargs):
+                raise RuntimeError("bug")
+
+            client._transport.request = broken
+            gateways.preconnect = lambda gateway_id: asyncio.sleep(0)
+            gateways.stream = client.gateways.__class__.stream.__get__(gateways)
+            with pytest.raises(RuntimeError):
+                await gateways.bulk_command(IDS[:1], "reboot")
+
+
+async def test_streams_that_end_are_redialled_then_given_up(monkeypatch):
+    monkeypatch.setattr(_commands, "_RECONNECT_DELAY", 0)
+    # Each stream closes after one event, long before the tasks complete.
+    async with MockServer(fleet_size=2, stream_events=1, command_latency=0.3) as server:
+        async with AsyncScadable("sk_test", base_url=server.base_url) as client:
+            batch = await client.gateways.bulk_command(IDS[:2], "reboot")
+            assert not await asyncio.wait_for(batch.wait(), 5)
+            assert [r.gateway_id for r in batch.unobserved] == IDS[:2]
+            assert isinstance(batch.unwatched[IDS[0]], ConnectionError)
+            # Pre-connected streams the server closed early are redialled too.
+            assert server.stats.streams >= 2 * (1 + _commands._RECONNECTS)
+
+        # Fatal errors are not retried.
+        async with AsyncScadable("sk_wrong", base_url=server.base_url) as client:
+            gateways = client.gateways
+            dials = []
+
+            @asynccontextmanager
+            async def forbidden(gateway_id):
+                dials.append(gateway_id)
+                raise PermissionError("no", status_code=403)
+                yield
+
+            gateways.preconnect = lambda gateway_id: asyncio.sleep(0)
+            gateways.stream = forbidden
+            batch = await gateways.bulk_command(IDS[:1], "reboot")
+            assert not await asyncio.wait_for(batch.wait(), 5)
+            assert dials == IDS[:1]
+
+
+async def test_redialled_stream_completes_the_task(monkeypatch):
+    monkeypatch.setattr(_commands, "_RECONNECT_DELAY", 0)
+    async with MockServer(fleet_size=1) as server:
+        async with AsyncScadable("sk_test", base_url=server.base_url) as client:
+            gateways = client.gateways
+            dials = []
+
+            async def events():
+                if len(dials) > 1:  # the first stream ends without events
+                    while not server.stats.commands:
+                        await asyncio.sleep(0.01)
+                    yield {"type": "task", "task_id": "task-000001", "data": {}}
+
+            @asynccontextmanager
+            async def stream(gateway_id):
+                dials.append(gateway_id)
+                yield events()
+
+            gateways.preconnect = lambda gateway_id: asyncio.sleep(0)
+            gateways.stream = stream
+            batch = await gateways.bulk_command(IDS[:1], "reboot")
+            assert await asyncio.wait_for(batch.wait(), 5)
+            assert batch.results[IDS[0]].ok and not batch.unwatched
+            assert len(dials) == 2
+
+
+async def test_updates():
+    async with MockServer(fleet_size=3) as server:
+        async with AsyncScadable("sk_test", base_url=server.base_url) as client:
+            gateway = await client.gateways.update(IDS[0], name="Pump 1")
+            assert gateway.name == "Pump 1"
+            results = await client.gateways.bulk_update(
+                {IDS[1]: {"name": "Pump 2"}, "gw-missing": {"name": "x"}}
+            )
+            assert results[IDS[1]].name == "Pump 2"
+            assert isinstance(results["gw-missing"], NotFoundError)
+            result = await client.gateways.command(IDS[2], "ping")
+            assert result.task_id and not result.done
+        assert server.gateways[1]["name"] == "Pump 2"
+
+    with MockServer(fleet_size=3) as server:
+        with Scadable("sk_test", base_url=server.base_url) as client:
+            assert client.gateways.update(IDS[0], name="A").name == "A"
+            results = client.gateways.bulk_update(
+                {IDS[1]: {"name": "B"}, "gw-missing": {"name": "x"}}
+            )
+        assert results[IDS[1]].name == "B"
+        assert isinstance(results["gw-missing"], NotFoundError)
+
+
+@respx.mock(base_url=BASE)
+async def test_commands_accepted_without_a_task_are_done(respx_mock):
+    respx_mock.post(url__regex=r"/v1/gateways/[^/]+/commands").mock(
+        return_value=httpx.Response(202, json={"status": "accepted"})
+    )
+    client = AsyncScadable("sk_test", base_url=BASE)
+    batch = await client.gateways.bulk_command(IDS[:2], "ping", watch=False)
+    assert await asyncio.wait_for(batch.wait(), 5)
+    assert [r.status for r in batch] == ["completed", "completed"]
+    await client.close()
+
+
+@respx.mock(base_url=BASE)
+def test_writes_are_not_retried_without_idempotency_keys(respx_mock):
+    patch = respx_mock.patch(f"/v1/gateways/{IDS[0]}").mock(
+        return_value=httpx.Response(503)
+    )
+    post = respx_mock.post(f"/v1/gateways/{IDS[0]}/commands").mock(
+        return_value=httpx.Response(204)
+    )
+    client = Scadable("sk_test", base_url=BASE, retry=RetryPolicy(backoff=0))
+    with pytest.raises(InternalServerError):
+        client.gateways.update(IDS[0], name="x")
+    assert patch.call_count == 1  # the server may have applied it
+    client.gateways.command(IDS[0], "ping")
+    assert "Idempotency-Key" not in post.calls[0].request.headers
+
+
+@respx.mock(base_url=BASE)
+def test_writes_carry_idempotency_keys_when_enabled(respx_mock):
+    patch = respx_mock.patch(f"/v1/gateways/{IDS[0]}").mock(
+        side_effect=[
+            httpx.Response(503),
+            httpx.Response(200, json={"id": IDS[0], "name": "x"}),
+        ]
+    )
+    post = respx_mock.post(f"/v1/gateways/{IDS[0]}/commands").mock(
+        return_value=httpx.Response(204)
+    )
+    batch = respx_mock.post("/v1/batch").mock(
+        return_value=httpx.Response(200, json=[{"gateway_id": IDS[0], "task_id": 7}])
+    )
+    get = respx_mock.get(f"/v1/gateways/{IDS[0]}").mock(
+        return_value=httpx.Response(200, json={"id": IDS[0], "name": "x"})
+    )
+    client = Scadable(
+        "sk_test",
+        base_url=BASE,
+        command_batch_path="/v1/batch",
+        idempotency_keys=True,
+        retry=RetryPolicy(backoff=0),
+    )
+    client.gateways.update(IDS[0], name="x")
+    keys = [call.request.headers["Idempotency-Key"] for call in patch.calls]
+    assert len(keys) == 2 and keys[0] == keys[1]  # retried under the same key
+
+    result = client.gateways.command(IDS[0], "ping")
+    assert result.task_id is None and result.done and result.ok
+    assert "Idempotency-Key" in post.calls[0].request.headers
+
+    results = client.gateways.bulk_command(IDS[:2], "ping").results
+    assert results[IDS[0]].task_id == "7"
+    assert results[IDS[1]].error.message == "Missing from the batch response"
+    assert batch.calls[0].request.headers["Idempotency-Key"]
+
+    client.gateways.get(IDS[0])
+    assert "Idempotency-Key" not in get.calls[0].request.headers
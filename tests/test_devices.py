@@ -0,0 +1,173 @@
+"""client.devices.iter_all — fleet-wide device enumeration."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from httpx import Response
+
+from scadable import AsyncScadable, NotFoundError, Scadable
+from scadable.testing import MockServer
+
+GATEWAYS = [{"id": f"g{i}", "name": f"G{i}"} for i in range(12)]
+
+
+class InFlight:
+    """Counts concurrent device requests answered by ``respond``."""
+
+    def __init__(self):
+        self.current = self.peak = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def leave(self):
+        with self.lock:
+            self.current -= 1
+
+    @staticmethod
+    def body(request):
+        gateway = request.url.path.split("/")[3]
+        return {"devices": [{"id": f"{gateway}-a"}, {"id": f"{gateway}-b"}]}
+
+
+def test_sync_iter_all_is_concurrent_and_bounded(client, mock_api):
+    flight = InFlight()
+
+    def respond(request):
+        flight.enter()
+        time.sleep(0.02)
+        flight.leave()
+        return Response(200, json=flight.body(request))
+
+    listing = GATEWAYS + [{"name": "No id"}]
+    mock_api.get("/v1/gateways").mock(return_value=Response(200, json=listing))
+    mock_api.get(url__regex=r".*/devices$").mock(side_effect=respond)
+
+    devices = list(client.devices.iter_all(window=4))
+    assert len(devices) == 24
+    assert {(d.gateway_id, d.id) for d in devices} == {
+        (gw["id"], f"{gw['id']}-{s}") for gw in GATEWAYS for s in "ab"
+    }
+    assert 1 < flight.peak <= 4
+
+
+async def test_async_iter_all_is_concurrent_and_bounded(async_client, mock_api):
+    flight = InFlight()
+
+    async def respond(request):
+        flight.enter()
+        await asyncio.sleep(0.02)
+        flight.leave()
+        return Response(200, json=flight.body(request))
+
+    listing = GATEWAYS + [{"name": "No id"}]
+    mock_api.get("/v1/gateways").mock(return_value=Response(200, json=listing))
+    devices_route = mock_api.get(url__regex=r".*/devices$").mock(side_effect=respond)
+
+    devices = [d async for d in async_client.devices.iter_all(window=3)]
+    assert devices_route.call_count == 12
+    assert len(devices) == 24
+    assert all(d.id.startswith(d.gateway_id) for d in devices)
+    assert flight.peak == 3
+
+
+def test_sync_against_mock_server_and_early_exit():
+    with MockServer(fleet_size=20, devices_per_gateway=3) as server:
+        with Scadable(api_key="k", base_url=server.base_url) as client:
+            devices = list(client.devices.iter_all())
+            assert len({d.device_id for d in devices}) == 60
+            for device in client.devices.iter_all(window=2):
+                break
+            assert device.gateway_id
+
+
+def test_sync_early_exit_does_not_wait_for_in_flight(client, mock_api):
+    release = threading.Event()
+
+    def respond(request):
+        if "/g0/" not in request.url.path:
+            release.wait(5)
+        return Response(200, json=InFlight.body(request))
+
+    mock_api.get("/v1/gateways").mock(return_value=Response(200, json=GATEWAYS))
+    route = mock_api.get(url__regex=r".*/devices$").mock(side_effect=respond)
+    devices = client.devices.iter_all(window=4)
+    started = time.monotonic()
+    assert next(devices).gateway_id == "g0"
+    devices.close()
+    assert time.monotonic() - started < 2
+    release.set()
+    assert route.call_count <= 5  # queued requests were cancelled
+
+
+async def test_async_early_exit_cancels_in_flight():
+    async with MockServer(fleet_size=20, latency=0.01, latency_jitter=0.2) as server:
+        async with AsyncScadable(api_key="k", base_url=server.base_url) as client:
+            devices = client.devices.iter_all(window=4)
+            async for device in devices:
+                break
+            await devices.aclose()
+        await asyncio.sleep(0.1)
+    assert server.stats.requests < 20
+
+
+def test_errors_propagate(client, mock_api):
+    mock_api.get("/v1/gateways").mock(return_value=Response(200, json=GATEWAYS))
+    mock_api.get(url__regex=r".*/devices$").mock(
+        return_value=Response(404, json={"detail": "gone"})
+    )
+    with pytest.raises(NotFoundError):
+        list(client.devices.iter_all())
+    with pytest.raises(ValueError, match="window"):
+        next(client.devices.iter_all(window=0))
+
+
+async def test_async_errors_propagate(async_client, mock_api):
+    mock_api.get("/v1/gateways").mock(return_value=Response(200, json=GATEWAYS))
+    mock_api.get(url__regex=r".*/devices$").mock(
+        return_value=Response(404, json={"detail": "gone"})
+    )
+    with pytest.raises(NotFoundError):
+        [d async for d in async_client.devices.iter_all()]
+
+
+def test_listing_stream_does_not_hold_a_concurrency_slot():
+    import threading
+
+    from scadable import ScadablePool
+
+    counts: list[int] = []
+    with MockServer(fleet_size=5) as server:
+        client = Scadable(api_key="k", base_url=server.base_url, max_concurrency=1)
+        pool = ScadablePool(base_url=server.base_url, max_concurrency=1)
+        with client, pool:
+            threads = [
+                threading.Thread(
+                    target=lambda c=c: counts.append(
+                        len(list(c.devices.iter_all(window=2)))
+                    ),
+                    daemon=True,
+                )
+                for c in (client, pool.client("k"))
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+            assert counts == [20, 20]
+
+
+async def test_async_listing_stream_does_not_hold_a_concurrency_slot():
+    async def listing(client):
+        return [d async for d in client.devices.iter_all(window=2)]
+
+    async with MockServer(fleet_size=5) as server:
+        async with AsyncScadable(
+            api_key="k", base_url=server.base_url, max_concurrency=1
+        ) as client:
+            assert len(await asyncio.wait_for(listing(client), 10)) == 20
@@ -0,0 +1,160 @@
+"""client.fleet — incremental mirror of the gateway list."""
+
+import pytest
+from httpx import Response
+
+from scadable import AsyncScadable, FleetMirror, Scadable
+from scadable.testing import MockServer, make_fleet
+
+
+def test_sync_reports_added_changed_removed():
+    with MockServer(fleet_size=5) as server:
+        client = Scadable(api_key="k", base_url=server.base_url)
+        seen = []
+        client.fleet.on_change(seen.append)
+
+        changes = client.fleet.sync()
+        assert [c.kind for c in changes] == ["added"] * 5
+        assert seen == changes
+        assert len(client.fleet.mirror) == 5
+        assert client.fleet.sync() == []
+
+        server.update_gateway("gw-000001", status="offline", firmware_version="9.9")
+        server.remove_gateway("gw-000002")
+        server.add_gateway(make_fleet(6)[5])
+        changes = {c.gateway_id: c for c in client.fleet.sync()}
+        client.close()
+
+    assert {k: c.kind for k, c in changes.items()} == {
+        "gw-000001": "changed",
+        "gw-000002": "removed",
+        "gw-000005": "added",
+    }
+    changed = changes["gw-000001"]
+    assert changed.gateway.status == "offline"
+    assert changed.previous.firmware_version != "9.9"
+    mirror = client.fleet.mirror
+    assert "gw-000002" not in mirror and mirror.get("gw-000002") is None
+    assert [gw.gateway_id for gw in mirror.by_firmware("9.9")] == ["gw-000001"]
+    assert mirror.device("gw-000001-d0").gateway_id == "gw-000001"
+    assert mirror.device("gw-000002-d0") is None
+
+
+def test_heartbeats_update_the_mirror_without_changes():
+    fleet = make_fleet(2)
+    with MockServer() as server:
+        server.set_fleet(fleet)
+        with Scadable(api_key="k", base_url=server.base_url) as client:
+            client.fleet.sync()
+            devices = [
+                dict(d, last_seen_at="2026-02-01T00:00:00Z")
+                for d in fleet[0]["devices"]
+            ]
+            server.update_gateway(
+                "gw-000000", last_seen_at="2026-02-01T00:00:00Z", devices=devices
+            )
+            assert client.fleet.sync() == []
+            server.update_gateway("gw-000001", status="degraded")
+            changes = client.fleet.sync()
+    assert [(c.kind, c.gateway_id) for c in changes] == [("changed", "gw-000001")]
+    mirror = client.fleet.mirror
+    assert mirror.get("gw-000000").last_seen_at.month == 2
+    assert mirror.cursor.month == 2
+
+
+def test_sync_with_device_ids_repeated_across_gateways():
+    fleet = make_fleet(3)
+    for gw in fleet:
+        for position, device in enumerate(gw["devices"]):
+            device["device_id"] = f"d{position}"
+    with MockServer() as server:
+        server.set_fleet(fleet)
+        with Scadable(api_key="k", base_url=server.base_url) as client:
+            assert len(client.fleet.sync()) == 3
+            server.update_gateway("gw-000001", status="offline")
+            server.remove_gateway("gw-000002")
+            kinds = sorted(c.kind for c in client.fleet.sync())
+    assert kinds == ["changed", "removed"]
+    mirror = client.fleet.mirror
+    assert mirror.device("d0", "gw-000001").name == "device-0"
+    assert mirror.device("d0", "gw-000002") is None
+    assert len(mirror.index.devices()) == sum(len(gw["devices"]) for gw in fleet[:2])
+
+
+def test_mirror_indexes():
+    mirror = FleetMirror()
+    diff = mirror.diff()
+    for gw in make_fleet(60):
+        diff.add(Response(200, json=gw).content)
+    diff.add(b'{"name": "No id", "status": "offline"}')
+    diff.commit()
+
+    assert len(list(mirror)) == 61
+    everyone = make_fleet(60) + [{"status": "offline", "project_id": None}]
+    offline = [gw for gw in everyone if gw["status"] == "offline"]
+    assert len(mirror.by_status("offline")) == len(offline)
+    assert {gw.name for gw in mirror.where(status="offline", project_id=None)} == {
+        "No id"
+    }
+    in_project = mirror.where(project_id="proj-003", status="online")
+    assert {gw.project_id for gw in in_project} == {"proj-003"}
+    assert len(mirror.by_project("proj-003")) == 3
+    assert mirror.where(status="nonexistent") == []
+    assert len(mirror.where()) == 61
+    with pytest.raises(ValueError, match="Cannot filter"):
+        mirror.where(name="x")
+
+
+def test_since_param_fetches_only_modified(mock_api):
+    client = Scadable(
+        api_key="k",
+        base_url="https://test.scadable.com",
+        fleet_since_param="modified_since",
+    )
+    delta = mock_api.get(
+        "/v1/gateways", params={"modified_since": "2026-01-02T00:00:00+00:00"}
+    ).mock(
+        return_value=Response(
+            200,
+            json=[{"id": "a", "name": "A2", "last_seen_at": "2026-01-03T00:00:00Z"}],
+        )
+    )
+    full = mock_api.get("/v1/gateways").mock(
+        return_value=Response(
+            200,
+            json=[
+                {"id": "a", "name": "A", "last_seen_at": "2026-01-01T00:00:00Z"},
+                {"id": "b", "name": "B", "last_seen_at": "2026-01-02T00:00:00Z"},
+            ],
+        )
+    )
+    assert len(client.fleet.sync()) == 2
+    changes = client.fleet.sync()
+    assert [(c.kind, c.gateway_id, c.gateway.name) for c in changes] == [
+        ("changed", "a", "A2")
+    ]
+    assert len(client.fleet.mirror) == 2
+    assert delta.call_count == 1
+
+    full.mock(return_value=Response(200, json=[]))
+    removed = client.fleet.sync(full=True)
+    assert sorted(c.gateway_id for c in removed) == ["a", "b"]
+    assert {c.kind for c in removed} == {"removed"}
+
+
+@pytest.mark.asyncio
+async def test_async_sync():
+    async with MockServer(fleet_size=3) as server:
+        async with AsyncScadable(api_key="k", base_url=server.base_url) as client:
+            kinds = []
+
+            @client.fleet.on_change
+            def record(change):
+                kinds.append(change.kind)
+
+            await client.fleet.sync()
+            server.remove_gateway("gw-000000")
+            await client.fleet.sync()
+            assert await client.fleet.sync() == []
+    assert kinds == ["added"] * 3 + ["removed"]
+    assert len(client.fleet.mirror) == 2
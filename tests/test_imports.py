@@ -0,0 +1,60 @@
+"""Import-time behaviour — heavy dependencies load on first use only."""
+
+import subprocess
+import sys
+
+import pytest
+
+import scadable
+
+
+def loaded_after(statement: str) -> set:
+    code = (
+        f"import sys; {statement}; "
+        "print(' '.join(m for m in ('httpx', 'pydantic', 'websockets', 'asyncio', "
+        "'msgpack', 'cbor2') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(out.stdout.split())
+
+
+def test_package_import_is_light():
+    assert loaded_after("import scadable") == set()
+
+
+def test_sync_client_skips_streaming_stack():
+    loaded = loaded_after("from scadable import Scadable; Scadable(api_key='k')")
+    assert loaded == {"httpx", "pydantic"}
+
+
+def test_codecs_load_on_negotiation():
+    loaded = loaded_after(
+        "from scadable._transport._codecs import get_decoder, available_encodings; "
+        "available_encodings(); get_decoder('json')"
+    )
+    assert "msgpack" not in loaded and "cbor2" not in loaded
+
+
+def test_lazy_attributes_resolve():
+    from scadable._client import Scadable
+    from scadable._models import Gateway
+
+    assert scadable.Scadable is Scadable
+    assert scadable.Gateway is Gateway
+    assert set(scadable.__all__) <= set(dir(scadable))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="no attribute 'Nope'"):
+        scadable.Nope
+
+
+def test_transport_package_lazy_exports():
+    from scadable import _transport
+    from scadable._transport._http import SyncHTTPTransport
+
+    assert _transport.SyncHTTPTransport is SyncHTTPTransport
+    with pytest.raises(AttributeError):
+        _transport.Nope
@@ -0,0 +1,174 @@
+"""GatewayIndex — secondary indexes and compound queries over gateways."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from scadable import Gateway, GatewayIndex, TelemetryEvent
+from scadable.testing import make_event, make_fleet
+
+
+def build(size=40):
+    fleet = make_fleet(size)
+    return fleet, GatewayIndex(Gateway.model_validate(gw) for gw in fleet)
+
+
+def ids(gateways):
+    return sorted(gw.gateway_id for gw in gateways)
+
+
+def test_query_matches_list_comprehension():
+    fleet, index = build()
+    assert len(index) == 40 and "gw-000001" in index
+    assert index.get("gw-000001").name == "Gateway 1"
+
+    def expect(pred):
+        return sorted(gw["gateway_id"] for gw in fleet if pred(gw))
+
+    assert ids(index.query(status="offline")) == expect(
+        lambda gw: gw["status"] == "offline"
+    )
+    assert ids(index.query(status={"offline", "degraded"}, project_id="proj-001")) == (
+        expect(
+            lambda gw: (
+                gw["status"] in ("offline", "degraded")
+                and gw["project_id"] == "proj-001"
+            )
+        )
+    )
+    assert ids(index.query(protocol="modbus", firmware_below="0.6")) == expect(
+        lambda gw: (
+            any(d["protocol"] == "modbus" for d in gw["devices"])
+            and tuple(map(int, gw["firmware_version"].split("."))) < (0, 6)
+        )
+    )
+    assert ids(index.query(firmware_at_least="0.6.5")) == expect(
+        lambda gw: tuple(map(int, gw["firmware_version"].split("."))) >= (0, 6, 5)
+    )
+    assert index.query(status="nope") == []
+    ordered = index.query(project_id="proj-001", order_by="last_seen_at")
+    assert [gw.gateway_id for gw in ordered] == ["gw-000001", "gw-000026"]
+    assert index.query(status=["nope"], connected=True) == []
+    assert len(index.query()) == 40
+
+
+def test_device_queries():
+    fleet, index = build(10)
+    index.upsert(
+        Gateway(
+            gateway_id="gw-x",
+            name="X",
+            status="offline",
+            devices=[
+                {"device_id": "x-1", "protocol": "mqtt", "last_error": "timeout"},
+                {"name": "no-id", "protocol": "mqtt", "connected": False},
+            ],
+        )
+    )
+    assert [d.device_id for d in index.devices(has_error=True)] == ["x-1"]
+    assert [d.name for d in index.devices(connected=False, protocol="mqtt")] == [
+        "no-id"
+    ]
+    assert len(index.devices(status="offline")) >= 2
+    assert len(index.devices()) == 42
+    assert index.device("x-1").last_error == "timeout"
+    assert ids(index.query(has_error=True)) == ["gw-x"]
+
+    index.remove("gw-x")
+    assert index.device("x-1") is None
+    assert index.query(has_error=True) == []
+    assert index.remove("gw-x") is None
+
+
+def test_device_ids_repeated_across_gateways():
+    def gateway(gateway_id, connected, last_error=None):
+        devices = [
+            {"device_id": "plc", "connected": connected, "last_error": last_error},
+            {"device_id": "plc", "protocol": "modbus"},
+        ]
+        return Gateway(gateway_id=gateway_id, name=gateway_id, devices=devices)
+
+    index = GatewayIndex([gateway("a", True), gateway("b", False, "timeout")])
+    assert len(index.devices()) == 4
+    assert [d.gateway_id for d in index.devices(has_error=True)] == [None]
+    assert ids(index.query(connected=False)) == ["b"]
+    assert index.device("plc", "b").last_error == "timeout"
+    assert index.device("plc").connected is True  # first gateway's
+    assert index.device("plc", "c") is None
+
+    assert index.remove("a") is not None
+    assert index.device("plc").last_error == "timeout"
+    index.upsert(gateway("b", True))
+    assert index.devices(has_error=True) == [] and len(index.devices()) == 2
+    index.remove("b")
+    assert index.device("plc") is None and index.devices() == []
+
+
+def test_order_and_limit():
+    index = GatewayIndex(
+        Gateway(
+            gateway_id=f"g{i}",
+            name=str(i),
+            status="online" if i % 2 else "offline",
+            last_seen_at=None if i == 0 else datetime(2026, 1, i, tzinfo=timezone.utc),
+        )
+        for i in range(10)
+    )
+    newest = index.query(order_by="-last_seen_at", limit=3)
+    assert [gw.gateway_id for gw in newest] == ["g9", "g8", "g7"]
+    oldest = index.query(order_by="last_seen_at")
+    assert [gw.gateway_id for gw in oldest][:2] == ["g0", "g1"]
+    few = index.query(status="online", order_by="last_seen_at", project_id=None)
+    assert [gw.gateway_id for gw in few] == ["g1", "g3", "g5", "g7", "g9"]
+    index.upsert(Gateway(gateway_id="g1", name="1", status="online"))
+    assert index.query(order_by="last_seen_at")[0].gateway_id in ("g0", "g1")
+    assert len(list(index)) == 10
+
+    with pytest.raises(ValueError, match="Cannot order"):
+        index.query(order_by="name")
+    with pytest.raises(ValueError, match="Cannot filter"):
+        index.query(name="x")
+    with pytest.raises(ValueError, match="Cannot filter"):
+        index.devices(name="x")
+
+
+def test_apply_event_updates_indexes():
+    fleet, index = build(3)
+    gateway = dict(fleet[1], devices=fleet[1]["devices"][:2])
+    index.upsert(Gateway.model_validate(gateway))
+    event = make_event(gateway)
+    event["data"]["devices"]["device-0"].update(connected=False, last_error="boom")
+    event["data"]["devices"]["device-9"] = {"connected": True, "protocol": "opcua"}
+
+    assert index.apply_event(TelemetryEvent.model_validate(event))
+    gw = index.get("gw-000001")
+    assert gw.last_seen_at.timestamp() == pytest.approx(event["data"]["timestamp"])
+    assert [d.name for d in index.devices(has_error=True)] == ["device-0"]
+    assert ids(index.query(connected=False)) == ["gw-000001"]
+    assert len(gw.devices) == 3 and gw.devices[2].protocol == "opcua"
+    assert index.query(order_by="-last_seen_at")[0] is gw
+
+    recovered = {"data": {"gateway_id": "gw-000001", "devices": {"device-0": {}}}}
+    assert index.apply_event(recovered)
+    gw = index.get("gw-000001")
+    assert gw.last_seen_at.timestamp() == pytest.approx(event["data"]["timestamp"])
+    assert index.apply_event({"data": {"gateway_id": "unknown"}}) is False
+    millis = {"data": {"gateway_id": "gw-000001", "timestamp": 1_767_225_600_000}}
+    assert index.apply_event(millis)
+    seen = index.get("gw-000001").last_seen_at
+    assert seen == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert index.apply_event({"data": {}}) is False
+
+
+def test_apply_event_leaves_shared_records_alone():
+    gateways = [Gateway.model_validate(gw) for gw in make_fleet(3)]
+    a, b = GatewayIndex(gateways), GatewayIndex(gateways)
+    event = make_event(make_fleet(3)[1])
+    for state in event["data"]["devices"].values():
+        state.update(connected=False, last_error="down")
+    assert a.apply_event(event)
+
+    assert ids(a.query(connected=False)) == ["gw-000001"]
+    assert b.query(has_error=True) == [] and b.get("gw-000001") is gateways[1]
+    assert all(d.last_error is None for d in gateways[1].devices)
+    assert b.remove("gw-000001") is gateways[1]
@@ -0,0 +1,154 @@
+"""Incremental list parsing — items are validated while the body streams in."""
+
+import gzip
+import json
+
+import pytest
+from httpx import Response
+
+from scadable import AsyncScadable, Device, Gateway, InternalServerError
+from scadable._transport._http import _accept_encoding
+from scadable._transport._jsonstream import ArrayItemScanner
+
+
+def scan(body: bytes, chunk_size: int) -> list:
+    scanner = ArrayItemScanner()
+    items = []
+    for i in range(0, len(body), chunk_size):
+        items += scanner.feed(body[i : i + chunk_size])
+    items += scanner.close()
+    return [json.loads(item) for item in items]
+
+
+DOCS = [
+    [{"id": "a", "name": 'Pi "5"\\', "tags": ["x", {"y": "]"}]}, {"id": "b"}],
+    {"total": 2, "meta": {"nested": [1]}, "gateways": [{"id": "a"}, {"id": "b"}]},
+    {"gateway_id": "gw1", "name": "Single"},
+    [1, "two, three", None, [4]],
+    [{"name": "Überwachung ✓", "v": 12345}, 678, -1.5e3, "é"],
+    [],
+    None,
+]
+
+
+@pytest.mark.parametrize("doc", DOCS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+def test_scanner_matches_extract_list(doc, chunk_size):
+    from scadable._resources._base import _extract_list
+
+    body = json.dumps(doc, indent=1).encode()
+    assert scan(body, chunk_size) == _extract_list(doc)
+
+
+def test_scanner_buffers_only_current_item():
+    scanner = ArrayItemScanner()
+    assert scanner.feed(b'  {"gateways": [{"id": 1}, {"id": 2') == [b'{"id": 1}']
+    assert len(scanner._buf) < 12
+    assert scanner.feed(b"}]") == [b'{"id": 2}']
+    assert scanner.feed(b', "total": 2}') == []
+    assert scanner.close() == []
+
+
+def test_scanner_passes_malformed_items_through():
+    body = b'[{"a": tru}, {"b": 1} , {"c": [1, 2]}x, 3]'
+    scanner = ArrayItemScanner()
+    assert scanner.feed(body) == [
+        b'{"a": tru}',
+        b'{"b": 1}',
+        b'{"c": [1, 2]}x',
+        b"3",
+    ]
+
+
+def test_scanner_ignores_empty_input():
+    scanner = ArrayItemScanner()
+    assert scanner.feed(b"") == []
+    assert scanner.feed(b"  \n") == []
+    assert scanner.close() == []
+
+
+def test_accept_encoding_prefers_compact_codings(client, mock_api):
+    route = mock_api.get("/v1/gateways").mock(return_value=Response(200, json=[]))
+    client.gateways.list()
+    sent = route.calls.last.request.headers["Accept-Encoding"]
+    assert sent == _accept_encoding()
+    assert sent.endswith("gzip, deflate")
+
+
+@pytest.mark.parametrize(
+    "installed, expected",
+    [
+        ({"zstandard", "brotli"}, "zstd, br, gzip, deflate"),
+        ({"brotlicffi"}, "br, gzip, deflate"),
+        (set(), "gzip, deflate"),
+    ],
+)
+def test_accept_encoding_follows_installed_packages(monkeypatch, installed, expected):
+    from scadable._transport import _http
+
+    monkeypatch.setattr(
+        _http, "find_spec", lambda name: object() if name in installed else None
+    )
+    assert _accept_encoding() == expected
+
+
+def test_iter_list_gzip(client, mock_api):
+    body = json.dumps(
+        {"gateways": [{"gateway_id": f"gw{i}", "name": f"Pi {i}"} for i in range(50)]}
+    ).encode()
+    mock_api.get("/v1/gateways").mock(
+        return_value=Response(
+            200, content=gzip.compress(body), headers={"Content-Encoding": "gzip"}
+        )
+    )
+    gateways = list(client.gateways.iter_list())
+    assert len(gateways) == 50
+    assert isinstance(gateways[0], Gateway)
+    assert gateways[49].name == "Pi 49"
+
+
+def test_iter_devices_single_object(client, mock_api):
+    mock_api.get("/v1/gateways/gw1/devices").mock(
+        return_value=Response(200, json={"id": "d1", "name": "Sensor"})
+    )
+    devices = list(client.gateways.iter_devices("gw1"))
+    assert len(devices) == 1
+    assert isinstance(devices[0], Device)
+
+
+def test_iter_list_error(client, mock_api):
+    client._config.max_retries = 0
+    mock_api.get("/v1/gateways").mock(
+        return_value=Response(500, json={"error": "down"})
+    )
+    with pytest.raises(InternalServerError, match="down"):
+        list(client.gateways.iter_list())
+
+
+@pytest.mark.asyncio
+async def test_async_iter_list(mock_api):
+    mock_api.get("/v1/gateways").mock(
+        return_value=Response(200, json=[{"gateway_id": "gw1", "name": "Pi"}])
+    )
+    mock_api.get("/v1/gateways/gw1/devices").mock(
+        return_value=Response(200, json={"devices": [{"id": "d1"}, {"id": "d2"}]})
+    )
+    async with AsyncScadable(
+        api_key="sk_test", base_url="https://test.scadable.com"
+    ) as client:
+        gateways = [gw async for gw in client.gateways.iter_list()]
+        devices = [d async for d in client.gateways.iter_devices("gw1")]
+    assert [gw.name for gw in gateways] == ["Pi"]
+    assert [d.id for d in devices] == ["d1", "d2"]
+
+
+@pytest.mark.asyncio
+async def test_async_iter_single_object(mock_api):
+    mock_api.get("/v1/gateways").mock(
+        return_value=Response(200, json={"gateway_id": "gw1", "name": "Only"})
+    )
+    async with AsyncScadable(
+        api_key="sk_test", base_url="https://test.scadable.com"
+    ) as client:
+        gateways = [gw async for gw in client.gateways.iter_list()]
+    assert [gw.name for gw in gateways] == ["Only"]
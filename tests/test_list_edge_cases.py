@@ -93,3 +93,22 @@ async def test_async_list_null(mock_api):
     ) as client:
         gateways = await client.gateways.list()
         assert gateways == []
+
+
+def test_list_bulk_validates_raw_array_bytes(client, mock_api):
+    from pydantic import ValidationError
+
+    body = b'\n  [{"gateway_id": "gw1", "name": "A", "version": "0.7.1",'
+    body += b' "devices": [{"id": "d1"}]}, {"id": "gw2", "name": "B"}]'
+    mock_api.get("/v1/gateways").mock(return_value=Response(200, content=body))
+    first, second = client.gateways.list()
+    assert (first.id, first.gateway_id) == ("gw1", "gw1")
+    assert (first.firmware_version, first.version) == ("0.7.1", "0.7.1")
+    assert first.devices[0].device_id == "d1"
+    assert (second.id, second.gateway_id) == ("gw2", "gw2")
+
+    mock_api.get("/v1/gateways").mock(
+        return_value=Response(200, json=[{"name": "ok"}, {"status": "no name"}])
+    )
+    with pytest.raises(ValidationError):
+        client.gateways.list()
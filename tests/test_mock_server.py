@@ -0,0 +1,269 @@
+"""scadable.testing — the mock API used for tests and load testing."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from scadable import (
+    AsyncScadable,
+    AuthenticationError,
+    InternalServerError,
+    NotFoundError,
+    RateLimitError,
+    Scadable,
+)
+from scadable.testing import (
+    MockServer,
+    Session,
+    SessionRecorder,
+    make_event,
+    make_fleet,
+)
+from scadable.testing.__main__ import build_parser, main
+
+
+def test_sync_client_against_mock():
+    with MockServer(fleet_size=25) as server:
+        with Scadable(api_key="sk_test", base_url=server.base_url) as client:
+            gateways = client.gateways.list()
+            assert len(gateways) == 25
+            assert client.gateways.get("gw-000003").name == "Gateway 3"
+            assert len(client.gateways.devices("gw-000003")) == 4
+            assert len(list(client.gateways.iter_list())) == 25
+            with pytest.raises(NotFoundError):
+                client.gateways.get("missing")
+            with pytest.raises(NotFoundError):
+                client.gateways._get("/v1/gateways/gw-000003/nope", model=dict)
+            with pytest.raises(NotFoundError):
+                client.gateways._get("/v2/other", model=dict)
+    assert server.stats.requests == 7
+    assert server.stats.responses == {200: 4, 404: 3}
+
+
+def test_gzip_only_when_accepted_and_enabled():
+    with MockServer(fleet_size=20) as server:
+        resp = httpx.get(f"{server.base_url}/v1/gateways")
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert len(resp.json()["gateways"]) == 20
+        plain = httpx.get(
+            f"{server.base_url}/v1/gateways", headers={"Accept-Encoding": "identity"}
+        )
+        assert "Content-Encoding" not in plain.headers
+        server.compression = False
+        assert (
+            "Content-Encoding"
+            not in httpx.get(server.base_url + "/v1/gateways").headers
+        )
+
+
+def test_methods_and_connection_close():
+    with MockServer() as server:
+        resp = httpx.post(
+            f"{server.base_url}/v1/gateways",
+            json={"name": "x"},
+            headers={"Connection": "close"},
+        )
+        assert resp.status_code == 405
+        gateway = f"{server.base_url}/v1/gateways/gw-000000"
+        assert httpx.delete(gateway).status_code == 405
+        assert httpx.patch(gateway, content=b"[1]").status_code == 400
+        assert httpx.post(f"{gateway}/commands", content=b"{").status_code == 400
+        assert httpx.patch(gateway, json={"name": "x"}).json()["name"] == "x"
+
+
+async def test_task_events_stop_with_the_stream():
+    from websockets.protocol import State
+
+    class Closed:
+        state = State.CLOSED
+
+    queue = asyncio.Queue()
+    queue.put_nowait("{}")
+    await MockServer()._send_tasks(queue, Closed(), None)
+
+
+def test_fleet_mutations_invalidate_list():
+    with MockServer(fleet_size=2) as server:
+        client = Scadable(api_key="sk_test", base_url=server.base_url)
+        assert [gw.status for gw in client.gateways.list()] == [
+            gw["status"] for gw in server.gateways
+        ]
+        server.update_gateway("gw-000000", status="offline")
+        server.remove_gateway("gw-000001")
+        server.add_gateway({"gateway_id": "new", "name": "New", "devices": []})
+        gateways = client.gateways.list()
+        assert [(gw.gateway_id, gw.status) for gw in gateways] == [
+            ("gw-000000", "offline"),
+            ("new", "unknown"),
+        ]
+        client.close()
+
+
+def test_api_key_enforced():
+    with MockServer(api_key="sk_right") as server:
+        client = Scadable(api_key="sk_wrong", base_url=server.base_url)
+        with pytest.raises(AuthenticationError):
+            client.gateways.list()
+        with pytest.raises(Exception):
+            with client.gateways.stream("gw-000000") as stream:
+                list(stream)
+        client.close()
+
+
+def test_injected_errors_and_rate_limits():
+    with MockServer(error_rate=1.0) as server:
+        client = Scadable(api_key="k", base_url=server.base_url, max_retries=0)
+        with pytest.raises(InternalServerError, match="injected failure"):
+            client.gateways.list()
+        client.close()
+    with MockServer(rate_limit_rate=1.0, latency=0.01, latency_jitter=0.01) as server:
+        resp = httpx.get(f"{server.base_url}/v1/gateways")
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "1"
+        client = Scadable(api_key="k", base_url=server.base_url, max_retries=0)
+        with pytest.raises(RateLimitError):
+            client.gateways.list()
+        client.close()
+    assert server.stats.responses == {429: 2}
+
+
+def test_sync_stream_events():
+    with MockServer(stream_events=3, registers=2) as server:
+        client = Scadable(api_key="k", base_url=server.base_url)
+        with client.gateways.stream("gw-000001") as stream:
+            events = list(stream)
+        client.close()
+    assert len(events) == 3
+    data = events[0].data
+    assert data["gateway_id"] == "gw-000001"
+    assert isinstance(data["timestamp"], float)
+    assert len(data["devices"]["device-0"]["data"]) == 2
+    assert server.stats.events_sent == 3
+
+
+@pytest.mark.asyncio
+async def test_async_stream_with_rate_and_early_exit():
+    async with MockServer(event_rate=200) as server:
+        async with AsyncScadable(api_key="k", base_url=server.base_url) as client:
+            async with client.gateways.stream("unknown") as stream:
+                count = 0
+                async for event in stream:
+                    assert event.data["devices"] == {}
+                    count += 1
+                    if count == 3:
+                        break
+        await asyncio.sleep(0.05)
+    assert server.stats.streams == 1
+
+
+@pytest.mark.asyncio
+async def test_abrupt_disconnects_are_tolerated():
+    async with MockServer() as server:
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(b"GET /v1/gateways HTTP/1.1\r\nHost: x\r\n")
+        writer.close()
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        writer.write(
+            b"GET /v1/gateways/gw-000000/stream HTTP/1.1\r\nHost: x\r\n"
+            b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
+            b"Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        assert b"101" in await reader.readline()
+        writer.close()
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    async with MockServer(fleet_size=3, stream_events=2) as real:
+        async with MockServer(upstream=real.base_url, record=path) as proxy:
+            async with AsyncScadable(api_key="k", base_url=proxy.base_url) as client:
+                recorded = await client.gateways.list()
+                await client.gateways.get("gw-000001")
+                async with client.gateways.stream("gw-000001") as stream:
+                    recorded_events = [e async for e in stream]
+
+    async with MockServer(replay=path, replay_speed=100) as replay:
+        async with AsyncScadable(api_key="other", base_url=replay.base_url) as client:
+            assert await client.gateways.list() == recorded
+            assert (await client.gateways.get("gw-000001")).name == "Gateway 1"
+            with pytest.raises(NotFoundError):
+                await client.gateways.get("gw-000002")
+            async with client.gateways.stream("gw-000001") as stream:
+                replayed = [e async for e in stream]
+    assert replayed == recorded_events
+    assert len(replayed) == 2
+
+
+def test_session_cycles_and_binary(tmp_path):
+    path = str(tmp_path / "s.jsonl")
+    recorder = SessionRecorder(path)
+    recorder.http("GET", "/v1/gateways?token=secret&page=2", 200, b"[1]")
+    recorder.http("GET", "/v1/gateways?page=2", 500, b"{}")
+    recorder.ws("/s?token=abc", 0.5, b"\x00\x01")
+    recorder.ws("/s", 0.7, "text")
+    recorder.close()
+    session = Session.load(path)
+    assert session.http_response("GET", "/v1/gateways?page=2") == (200, b"[1]")
+    assert session.http_response("GET", "/v1/gateways?page=2") == (500, b"{}")
+    assert session.http_response("GET", "/v1/gateways?page=2") == (500, b"{}")
+    assert session.http_response("POST", "/v1/gateways") is None
+    assert session.ws_messages("/s?token=zzz") == [(0.5, b"\x00\x01"), (0.7, "text")]
+
+
+def test_record_requires_upstream():
+    with pytest.raises(ValueError, match="upstream"):
+        MockServer(record="x.jsonl")
+
+
+def test_fleet_is_deterministic():
+    assert make_fleet(5, seed=1) == make_fleet(5, seed=1)
+    gateway = make_fleet(1, devices_per_gateway=2)[0]
+    event = make_event(gateway, registers=3)
+    assert set(event["data"]["devices"]) == {"device-0", "device-1"}
+    assert len(event["data"]["devices"]["device-0"]["data"]) == 3
+    assert make_event({})["data"]["devices"] == {}
+
+
+@pytest.mark.asyncio
+async def test_serve_forever_stops_on_cancel():
+    server = MockServer()
+    task = asyncio.create_task(server.serve_forever())
+    await asyncio.sleep(0.05)
+    assert server.port != 0
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert server._server is None
+
+
+def test_cli(monkeypatch, capsys):
+    args = build_parser().parse_args(["--port", "0", "--fleet-size", "3"])
+    assert args.fleet_size == 3 and args.error_rate == 0.0
+
+    seen = {}
+
+    async def fake_serve(self):
+        seen["fleet"] = len(self.gateways)
+
+    monkeypatch.setattr(MockServer, "serve_forever", fake_serve)
+    main(["--port", "0", "--fleet-size", "7"])
+    assert seen == {"fleet": 7}
+    assert "Mock Scadable API on http://127.0.0.1:0" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_replay_binary_frames(tmp_path):
+    from websockets.asyncio.client import connect
+
+    path = str(tmp_path / "s.jsonl")
+    recorder = SessionRecorder(path)
+    recorder.ws("/v1/gateways/gw/stream", 0.0, b"\x81\xa1a\x01")
+    recorder.close()
+    async with MockServer(replay=path) as server:
+        url = server.base_url.replace("http", "ws") + "/v1/gateways/gw/stream"
+        async with connect(url + "?token=t") as ws:
+            assert await ws.recv() == b"\x81\xa1a\x01"
@@ -0,0 +1,210 @@
+"""GatewayPoller — adaptive polling on a timer wheel within a request budget."""
+
+import asyncio
+
+import pytest
+
+from scadable import (
+    AsyncScadable,
+    AuthenticationError,
+    Gateway,
+    GatewayPoller,
+    InternalServerError,
+    NotFoundError,
+)
+from scadable._poller import TimerWheel
+from scadable._ratelimit import TokenBucket
+from scadable.testing import MockServer, make_fleet
+
+FAST = dict(
+    requests_per_second=1000,
+    interval=0.02,
+    min_interval=0.01,
+    max_interval=0.16,
+    tick=0.005,
+    seed=1,
+)
+
+
+class FakeGateways:
+    def __init__(self, n=3):
+        self.records = {f"gw-{i}": {"id": f"gw-{i}", "name": f"g{i}"} for i in range(n)}
+        self.errors = {}
+        self.calls = []
+
+    async def get(self, gateway_id):
+        self.calls.append(gateway_id)
+        if gateway_id in self.errors:
+            raise self.errors[gateway_id]
+        return Gateway.model_validate(self.records[gateway_id])
+
+
+def test_timer_wheel():
+    wheel = TimerWheel(0.1, slots=8)
+    wheel.schedule("a", 0.25)
+    wheel.schedule("b", 2.0)  # more than one revolution away
+    wheel.schedule("c", 0.0)
+    assert len(wheel) == 3 and "a" in wheel
+    assert wheel.advance(0.05) == []
+    assert wheel.advance(0.1) == ["c"]
+    assert wheel.advance(0.3) == ["a"]
+    assert wheel.advance(1.0) == []
+    assert wheel.cancel("b") and not wheel.cancel("b")
+    wheel.schedule("b", 0.5)
+    wheel.schedule("d", 100.0)
+    assert wheel.advance(50.0) == ["b"]  # a long stall visits each slot once
+    assert wheel.advance(100.95) == []
+    assert wheel.advance(101.0) == ["d"]
+    assert len(wheel) == 0
+    with pytest.raises(ValueError):
+        TimerWheel(0)
+
+
+async def test_token_bucket():
+    now = [0.0]
+    bucket = TokenBucket(10, burst=2, clock=lambda: now[0])
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.delay() == pytest.approx(0.1)
+    now[0] = 1.0
+    assert bucket.tokens == 2
+
+    real = TokenBucket(100, burst=1)
+    assert await real.acquire() == 0
+    assert await real.acquire() > 0
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+    with pytest.raises(ValueError):
+        TokenBucket(1, burst=0.5)
+
+
+async def test_delivers_only_changes_and_adapts_intervals():
+    fake = FakeGateways()
+    poller = GatewayPoller(fake, ["gw-0", "gw-1"], **FAST)
+    changes = []
+    poller.on_change(changes.append)
+    async with poller:
+        await asyncio.sleep(0.6)
+        assert {(c.kind, c.gateway_id) for c in changes} == {
+            ("added", "gw-0"),
+            ("added", "gw-1"),
+        }
+        assert fake.calls.count("gw-0") > 2  # idle polls went undelivered
+        assert poller.interval("gw-0") == 0.16  # grown to the maximum
+
+        fake.records["gw-0"]["last_seen_at"] = "2026-01-01T00:00:00Z"
+        fake.records["gw-1"]["status"] = "degraded"
+        poller.add("gw-2", interval=1)
+        await asyncio.sleep(0.4)
+    kinds = [(c.kind, c.gateway_id) for c in changes[2:]]
+    assert ("changed", "gw-1") in kinds and ("added", "gw-2") in kinds
+    assert all(c.gateway_id != "gw-0" for c in changes[2:])
+    changed = next(c for c in changes if c.kind == "changed")
+    assert changed.previous.status == "unknown"
+    assert poller.gateways["gw-1"].status == "degraded"
+    assert poller.interval("gw-1") <= 0.16 * 0.5
+    assert poller.stats.changes == len(changes)
+
+
+async def test_errors_back_off_and_404_removes():
+    fake = FakeGateways()
+    poller = GatewayPoller(fake, ["gw-0", "gw-1", "gw-2"], **FAST)
+    changes = []
+    poller.on_change(changes.append)
+    async with poller:
+        await asyncio.sleep(0.1)
+        fake.errors["gw-0"] = NotFoundError("gone", status_code=404)
+        fake.errors["gw-1"] = InternalServerError("down", status_code=503)
+        fake.errors["gw-3"] = NotFoundError("never", status_code=404)
+        poller.add("gw-3")
+        poller.remove("gw-2")
+        await asyncio.sleep(0.3)
+    assert ("removed", "gw-0") in [(c.kind, c.gateway_id) for c in changes]
+    assert set(poller.gateways) == {"gw-1"}
+    assert poller.stats.errors >= 1
+    assert poller.interval("gw-1") == 0.16
+
+
+async def test_invalid_records_and_failing_callbacks_do_not_stop_polling():
+    fake = FakeGateways(3)
+    del fake.records["gw-0"]["name"]  # fails validation on every poll
+    fake.errors["gw-1"] = RuntimeError("unexpected")
+    poller = GatewayPoller(fake, list(fake.records), **FAST)
+    reported, seen = [], []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _, context: reported.append(context))
+
+    @poller.on_change
+    def broken(change):
+        raise ValueError("bug in callback")
+
+    poller.on_change(seen.append)
+    try:
+        async with poller:
+            await asyncio.sleep(0.3)
+            assert poller._task is not None and not poller._task.done()
+    finally:
+        loop.set_exception_handler(None)
+    assert fake.calls.count("gw-0") > 1 and fake.calls.count("gw-1") > 1
+    assert poller.stats.errors >= 4
+    assert [c.gateway_id for c in seen] == ["gw-2"]
+    assert poller.stats.callback_errors == 1
+    assert isinstance(reported[0]["exception"], ValueError)
+
+
+async def test_budget_caps_request_rate():
+    fake = FakeGateways(20)
+    options = {**FAST, "requests_per_second": 50, "burst": 5}
+    poller = GatewayPoller(fake, list(fake.records), **options)
+    async with poller:
+        await asyncio.sleep(0.4)
+    assert len(fake.calls) <= 5 + 50 * 0.45
+    assert poller.stats.throttled > 0
+
+
+async def test_authentication_errors_stop_the_poller():
+    fake = FakeGateways(1)
+    fake.errors["gw-0"] = AuthenticationError("bad key", status_code=401)
+    poller = GatewayPoller(fake, ["gw-0"], **FAST)
+    with pytest.raises(AuthenticationError):
+        await asyncio.wait_for(poller.run(), 1)
+
+
+async def test_polls_through_the_client():
+    async with MockServer() as server:
+        server.set_fleet(make_fleet(3))
+        async with AsyncScadable(api_key="k", base_url=server.base_url) as client:
+            poller = client.gateways.poll(["gw-000000", "gw-000001"], **FAST)
+            seen = []
+            poller.on_change(seen.append)
+            await poller.start()
+            await poller.start()
+            await asyncio.sleep(0.1)
+            server.update_gateway("gw-000001", status="offline")
+            await asyncio.sleep(0.3)
+            await poller.stop()
+            await poller.stop()
+    assert [c.kind for c in seen].count("added") == 2
+    assert [(c.kind, c.gateway.status) for c in seen][-1] == ("changed", "offline")
+
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        GatewayPoller(None, interval=1, min_interval=2)
+    with pytest.raises(ValueError):
+        GatewayPoller(None, jitter=1)
+
+
+async def test_gateways_removed_mid_poll_are_dropped():
+    fake = FakeGateways(2)
+    poller = GatewayPoller(fake, ["gw-0", "gw-1"], **FAST)
+    original = fake.get
+
+    async def get_and_remove(gateway_id):
+        poller.remove(gateway_id)
+        return await original(gateway_id)
+
+    await poller._poll("gw-0")  # not running: polled but nothing to schedule
+    fake.get = get_and_remove
+    await poller._poll("gw-1")
+    assert set(poller.gateways) == {"gw-0"}
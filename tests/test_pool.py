@@ -0,0 +1,139 @@
+"""ScadablePool — many API keys over one connection pool."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+import respx
+
+from scadable import AsyncScadablePool, AuthenticationError, ScadablePool
+from scadable.testing import MockServer, make_fleet
+
+BASE = "https://test.scadable.com"
+
+
+@respx.mock(base_url=BASE)
+def test_keys_share_one_connection_pool(respx_mock):
+    route = respx_mock.get("/v1/gateways").mock(
+        return_value=httpx.Response(200, json=[])
+    )
+    with ScadablePool(base_url=BASE) as pool:
+        a, b = pool.client("sk_a"), pool.client("sk_b")
+        assert pool.client("sk_a") is a and len(pool) == 2 and "sk_b" in pool
+        assert a._transport._client is b._transport._client is pool.http_client
+        a.gateways.list()
+        b.gateways.list()
+        a.close()  # leaves the shared pool open
+        a.gateways.list()
+    keys = [call.request.headers["X-API-Key"] for call in route.calls]
+    assert keys == ["sk_a", "sk_b", "sk_a"]
+    assert "gzip" in route.calls[0].request.headers["Accept-Encoding"]
+    assert pool.http_client.is_closed
+    with pytest.raises(ValueError):
+        pool.client("")
+
+
+def test_evicts_idle_and_least_recently_used_tenants():
+    now = [0.0]
+    pool = ScadablePool(idle_timeout=60, max_tenants=2, clock=lambda: now[0])
+    a = pool.client("a")
+    pool.client("b")
+    now[0] = 30
+    pool.client("a")
+    now[0] = 50
+    pool.client("c")  # over max_tenants: "b" is least recently used
+    assert set(pool._tenants._clients) == {"a", "c"}
+    now[0] = 95
+    assert pool.evict_idle() == 1  # "a", last used at 30
+    assert pool.client("a") is not a
+    assert pool.evicted == 2
+    pool.close()
+
+
+async def test_async_pool_closes_evicted_tenants():
+    now = [0.0]
+    async with MockServer(event_rate=20) as server:
+        async with AsyncScadablePool(
+            base_url=server.base_url, idle_timeout=60, clock=lambda: now[0]
+        ) as pool:
+            idle, evicted_on_use = pool.client("a"), pool.client("b")
+            await idle.gateways.preconnect("gw-000000")
+            await evicted_on_use.gateways.preconnect("gw-000001")
+            now[0] = 30
+            pool.client("b")
+            now[0] = 70
+            assert await pool.evict_idle() == 1
+            assert not idle._ws_transport._ready  # its parked stream is closed
+            assert evicted_on_use._ws_transport._ready
+            # Still usable by whoever holds it: the connection pool is shared.
+            assert (await idle.gateways.get("gw-000000")).id == "gw-000000"
+
+            now[0] = 100
+            pool.client("c")  # evicts "b" and closes it in the background
+            assert pool._closing
+            await asyncio.gather(*pool._closing)
+            assert not evicted_on_use._ws_transport._ready
+            now[0] = 200
+            pool.client("d")  # closed by the pool's own close()
+        assert pool.evicted == 3 and not pool._closing
+
+
+@respx.mock(base_url=BASE)
+def test_per_key_rate_limit(respx_mock):
+    respx_mock.get("/v1/gateways").mock(return_value=httpx.Response(200, json=[]))
+    with ScadablePool(base_url=BASE, rate_limit=50, rate_limit_burst=1) as pool:
+        start = time.perf_counter()
+        for _ in range(6):
+            pool.client("limited").gateways.list()
+        assert time.perf_counter() - start >= 0.09
+        start = time.perf_counter()
+        pool.client("other").gateways.list()  # own budget, not throttled
+        assert time.perf_counter() - start < 0.02
+
+
+def test_per_key_concurrency_limit():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow(request):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return httpx.Response(200, json=[])
+
+    with (
+        respx.mock(base_url=BASE) as mock,
+        ScadablePool(base_url=BASE, max_concurrency=2) as pool,
+    ):
+        mock.get("/v1/gateways").mock(side_effect=slow)
+        client = pool.client("k")
+        threads = [threading.Thread(target=client.gateways.list) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with client._transport.stream("GET", "/v1/gateways") as chunks:
+            assert b"".join(chunks) == b"[]"
+    assert peak[0] == 2
+
+
+async def test_async_pool_against_mock_server():
+    async with MockServer(api_key="sk_good", latency=0.02) as server:
+        server.set_fleet(make_fleet(5))
+        async with AsyncScadablePool(
+            base_url=server.base_url, max_concurrency=2, rate_limit=1000
+        ) as pool:
+            good = pool.client("sk_good")
+            start = time.perf_counter()
+            results = await asyncio.gather(*(good.gateways.list() for _ in range(4)))
+            assert time.perf_counter() - start >= 0.04  # two at a time
+            assert [len(r) for r in results] == [5] * 4
+            assert [g.name async for g in good.gateways.iter_list()][0] == "Gateway 0"
+            with pytest.raises(AuthenticationError):
+                await pool.client("sk_bad").gateways.list()
+        assert pool.http_client.is_closed
+        assert len(pool) == 0
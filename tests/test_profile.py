@@ -0,0 +1,77 @@
+"""Stream profiling — per-stage histograms with sampling."""
+
+import asyncio
+import time
+
+import pytest
+
+from scadable import AsyncScadable, Scadable
+from scadable._transport._profile import Histogram, StreamProfile
+from scadable.testing import MockServer
+
+
+def test_histogram_percentiles_within_bucket_width():
+    h = Histogram()
+    assert h.percentile(50) == 0 and h.mean == 0
+    for ms in range(1, 101):
+        h.record(ms / 1000)
+    h.record(-1)  # clock skew counts as zero
+    assert h.count == 101 and h.max == 0.1
+    assert h.percentile(50) == pytest.approx(0.050, rel=0.1)
+    assert h.percentile(99) == pytest.approx(0.099, rel=0.1)
+    assert h.percentile(100) == 0.1
+    assert h.mean == pytest.approx(5.05 / 101)
+    h.record(10**6)  # past the last bucket
+    assert h.percentile(100) == 10**6
+    assert set(h.summary()) == {"count", "mean", "p50", "p99", "max"}
+
+
+def test_sampling_and_latency():
+    profile = StreamProfile(rate=0.25)
+    assert [profile.sample() for _ in range(8)] == [True, False, False, False] * 2
+    with pytest.raises(ValueError):
+        StreamProfile(rate=0)
+
+    now = time.time()
+    profile.observe_latency({"data": {"timestamp": now - 2}})
+    profile.observe_latency({"timestamp": (now - 1) * 1000})
+    profile.observe_latency({"data": {"timestamp": True}})
+    profile.observe_latency({"data": "raw"})
+    assert profile.latency.count == 2
+    assert 1 <= profile.latency.max < 3
+    assert set(profile.summary()) == {
+        "receive",
+        "decode",
+        "validate",
+        "handoff",
+        "latency",
+    }
+
+
+async def test_profiles_each_stage_of_the_async_stream():
+    async with MockServer(stream_events=20, event_rate=2000) as server:
+        async with AsyncScadable(
+            api_key="k", base_url=server.base_url, stream_profile_rate=0.5
+        ) as client:
+            async with client.gateways.stream("gw-000000") as events:
+                async for _ in events:
+                    await asyncio.sleep(0.001)  # the consumer's own work
+            profile = events.profile
+    for stage in ("receive", "decode", "validate", "handoff", "latency"):
+        assert getattr(profile, stage).count == 10, stage
+    assert profile.handoff.percentile(50) >= 0.001
+    assert profile.latency.max < 5
+
+
+def test_sync_stream_exposes_profile_and_defaults_off():
+    with MockServer(stream_events=3, event_rate=1000) as server:
+        client = Scadable(api_key="k", base_url=server.base_url)
+        with client.gateways.stream("gw-000000") as stream:
+            assert len(list(stream)) == 3
+            assert stream.profile is None
+        client = Scadable(
+            api_key="k", base_url=server.base_url, stream_profile_rate=1.0
+        )
+        with client.gateways.stream("gw-000000") as stream:
+            list(stream)
+            assert stream.profile.validate.count == 3
@@ -0,0 +1,158 @@
+"""RetryPolicy — per-status/per-exception rules, jitter, budget, idempotency."""
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+from scadable import ConnectionError, InternalServerError, RateLimitError, RetryPolicy
+from scadable._config import ClientConfig
+from scadable._retry import Retrier
+from scadable._transport._http import AsyncHTTPTransport, SyncHTTPTransport
+
+BASE = "https://test.scadable.com"
+
+
+def transport(cls=SyncHTTPTransport, max_retries=2, **policy):
+    policy.setdefault("backoff", 0)
+    config = ClientConfig(
+        api_key="k", base_url=BASE, max_retries=max_retries, retry=RetryPolicy(**policy)
+    )
+    return cls(config)
+
+
+def retrier(max_retries=3, **policy):
+    return Retrier(
+        ClientConfig(api_key="k", max_retries=max_retries, retry=RetryPolicy(**policy))
+    )
+
+
+@respx.mock(base_url=BASE)
+def test_per_status_limits(respx_mock):
+    route = respx_mock.get("/x").mock(
+        side_effect=[Response(503)] * 3 + [Response(200, json={"ok": 1})]
+    )
+    t = transport(statuses={503: 3})
+    assert t.request("GET", "/x").data == {"ok": 1}
+    assert route.call_count == 4
+    assert t.retry_stats.retries == 3
+
+    route.mock(side_effect=[Response(500), Response(200)])
+    with pytest.raises(InternalServerError):
+        t.request("GET", "/x")
+
+
+@respx.mock(base_url=BASE)
+def test_max_retries_applies_to_unlimited_rules(respx_mock):
+    route = respx_mock.get("/x").mock(return_value=Response(502))
+    with pytest.raises(InternalServerError):
+        transport(max_retries=1).request("GET", "/x")
+    assert route.call_count == 2
+
+
+@respx.mock(base_url=BASE)
+def test_non_idempotent_requests_only_retry_when_unprocessed(respx_mock):
+    route = respx_mock.post("/x").mock(side_effect=[Response(503), Response(201)])
+    with pytest.raises(InternalServerError):
+        transport().request("POST", "/x", json={})
+    assert route.call_count == 1
+
+    route.mock(side_effect=[Response(429), Response(201)])
+    assert transport().request("POST", "/x", json={}).status_code == 201
+
+    route.mock(side_effect=[httpx.ConnectError("refused"), Response(201)])
+    assert transport().request("POST", "/x", json={}).status_code == 201
+
+    route.mock(side_effect=[httpx.ReadTimeout("slow"), Response(201)])
+    with pytest.raises(ConnectionError, match="slow"):
+        transport().request("POST", "/x", json={})
+
+    attempts = retrier().start("POST", {"idempotency-key": "abc"})
+    assert attempts.on_status(503, {}) is not None
+
+
+@respx.mock(base_url=BASE)
+def test_exception_rules(respx_mock):
+    route = respx_mock.get("/x").mock(
+        side_effect=[httpx.ReadTimeout("slow"), Response(200)]
+    )
+    assert transport().request("GET", "/x").status_code == 200
+
+    only_connect = transport(exceptions={httpx.ConnectError: 1})
+    route.mock(side_effect=[httpx.ReadTimeout("slow"), Response(200)])
+    with pytest.raises(ConnectionError):
+        only_connect.request("GET", "/x")
+    route.mock(side_effect=[httpx.ConnectError("no")] * 2 + [Response(200)])
+    with pytest.raises(ConnectionError):
+        only_connect.request("GET", "/x")
+
+
+def test_retry_after():
+    attempts = retrier(jitter="none").start("GET", {})
+    assert attempts.on_status(429, {"retry-after": "3"}) == 3
+    assert attempts.on_status(429, {"retry-after": "0"}) == 1.0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30))
+    assert 25 < retrier().start("GET", {}).on_status(429, {"retry-after": later}) <= 30
+    assert retrier().start("GET", {}).on_status(429, {"retry-after": "120"}) is None
+    garbage = retrier(jitter="none").start("GET", {})
+    assert garbage.on_status(503, {"retry-after": "soon"}) == 0.5
+    ignored = retrier(jitter="none", respect_retry_after=False).start("GET", {})
+    assert ignored.on_status(429, {"retry-after": "30"}) == 0.5
+
+
+def test_backoff_shapes():
+    attempts = retrier(max_retries=6, jitter="none", max_backoff=4).start("GET", {})
+    delays = [attempts.on_status(503, {}) for _ in range(7)]
+    assert delays == [0.5, 1, 2, 4, 4, 4, None]
+
+    full = retrier(max_retries=50).start("GET", {})
+    delays = [full.on_status(503, {}) for _ in range(10)]
+    assert all(0 <= d <= 8 for d in delays)
+
+    decorrelated = retrier(
+        max_retries=10, jitter="decorrelated", budget_burst=20
+    ).start("GET", {})
+    previous = 0.5
+    for _ in range(10):
+        delay = decorrelated.on_status(503, {})
+        assert 0.5 <= delay <= min(8, previous * 3)
+        previous = delay
+
+    with pytest.raises(ValueError, match="jitter"):
+        RetryPolicy(jitter="random")
+
+
+def test_budget_limits_retry_share():
+    r = retrier(max_retries=5, budget_ratio=0.5, budget_burst=2)
+    first = r.start("GET", {})
+    assert first.on_status(503, {}) is not None
+    assert first.on_status(503, {}) is not None
+    assert first.on_status(503, {}) is None  # burst spent
+    second = r.start("GET", {})
+    assert second.on_status(503, {}) is None  # only half a token earned
+    third = r.start("GET", {})
+    assert third.on_status(503, {}) is not None
+    assert r.stats.requests == 3
+    assert r.stats.retries == 3
+    assert r.stats.budget_exhausted == 2
+
+
+@respx.mock(base_url=BASE)
+async def test_async_transport_uses_policy(respx_mock):
+    route = respx_mock.get("/x").mock(
+        side_effect=[httpx.ConnectError("no"), Response(429), Response(200)]
+    )
+    t = transport(AsyncHTTPTransport)
+    assert (await t.request("GET", "/x")).status_code == 200
+    assert t.retry_stats.retries == 2
+
+    route.mock(side_effect=[httpx.ConnectError("no")] * 3)
+    with pytest.raises(ConnectionError):
+        await t.request("GET", "/x")
+    route.mock(return_value=Response(429, headers={"Retry-After": "600"}))
+    with pytest.raises(RateLimitError):
+        await t.request("GET", "/x")
+    await t.close()
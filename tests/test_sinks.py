@@ -0,0 +1,188 @@
+"""TelemetrySink — Parquet/CSV archives with rotation and background flushing."""
+
+import asyncio
+import csv
+import gzip
+import os
+import threading
+import time
+
+import pyarrow.parquet as pq
+import pytest
+
+from scadable import AsyncScadable, TelemetryEvent, TelemetrySink
+from scadable import _sinks
+from scadable.testing import MockServer
+
+DAY = 1_790_000_000.0  # 2026-09-21
+
+
+def event(gateway="gw-1", timestamp=DAY, **registers):
+    registers = registers or {"temp": 21.5, "on": True}
+    return {
+        "type": "telemetry",
+        "data": {
+            "gateway_id": gateway,
+            "timestamp": timestamp,
+            "devices": {
+                "pump": {"connected": True, "data": {**registers, "label": "x"}},
+                "idle": {"connected": False},
+            },
+        },
+    }
+
+
+def files(root):
+    return sorted(
+        os.path.relpath(os.path.join(d, f), root)
+        for d, _, names in os.walk(root)
+        for f in names
+    )
+
+
+async def test_parquet_partitions_and_round_trip(tmp_path):
+    async with TelemetrySink(tmp_path) as sink:
+        assert sink.format == "parquet"
+        sink.write(event())
+        sink.write(TelemetryEvent.model_validate(event("gw-2", DAY * 1000)))
+        sink.write(event(timestamp=DAY + 86400))
+        sink.write({"type": "status", "data": {"gateway_id": "gw-1"}})
+        sink.write({"type": "ping"})
+        sink.write(event("gw-3", temp="hot"))  # nothing numeric to store
+        await sink.flush()
+        assert any(f.endswith(".inprogress") for f in files(tmp_path))
+    found = files(tmp_path)
+    assert [f.split("/part-")[0] for f in found] == [
+        "gateway_id=gw-1/date=2026-09-21",
+        "gateway_id=gw-1/date=2026-09-22",
+        "gateway_id=gw-2/date=2026-09-21",
+    ]
+    assert all(f.endswith(".parquet") for f in found)
+    table = pq.read_table(tmp_path / found[2])
+    assert table.column_names == list(_sinks.COLUMNS)
+    assert table.to_pylist()[0] == {
+        "timestamp": table.column("timestamp")[0].as_py(),
+        "gateway_id": "gw-2",
+        "device": "pump",
+        "register": "temp",
+        "value": 21.5,
+    }
+    assert table.column("timestamp")[0].as_py().timestamp() == DAY
+    assert sink.stats.events == 6 and sink.stats.rows == 6
+    assert sink.stats.files == 3
+    with pytest.raises(RuntimeError):
+        sink.write(event())
+    await sink.close()
+
+
+async def test_gateway_id_fallback(tmp_path):
+    bare = event()
+    del bare["data"]["gateway_id"]
+    async with TelemetrySink(tmp_path, format="csv") as sink:
+        sink.write(bare)
+        sink.write(bare, gateway_id="gw-9")
+        sink.write(event("gw-1"), gateway_id="gw-9")  # the event's own id wins
+    assert [f.split("/")[0] for f in files(tmp_path)] == [
+        "gateway_id=gw-1",
+        "gateway_id=gw-9",
+        "gateway_id=unknown",
+    ]
+
+
+async def test_sinks_sharing_a_root_write_separate_files(tmp_path):
+    first = TelemetrySink(tmp_path, format="csv")
+    second = TelemetrySink(tmp_path, format="csv")
+    for sink in (first, second):
+        sink.write(event())
+        await sink.close()
+    assert len(files(tmp_path)) == 2
+
+
+async def test_gateway_ids_cannot_escape_the_root(tmp_path):
+    root = tmp_path / "archive"
+    async with TelemetrySink(root, format="csv", compression=None) as sink:
+        for gateway in ("../../etc", "..", ".", "a/b", "c\\d", "/abs", "gw 1"):
+            sink.write(event(gateway))
+    assert os.listdir(tmp_path) == ["archive"]
+    assert sorted(f.split("/")[0] for f in files(root)) == [
+        "gateway_id=%2E",
+        "gateway_id=%2E%2E",
+        "gateway_id=%2Fabs",
+        "gateway_id=..%2F..%2Fetc",
+        "gateway_id=a%2Fb",
+        "gateway_id=c%5Cd",
+        "gateway_id=gw%201",
+    ]
+
+
+async def test_csv_and_rotation(tmp_path):
+    sink = TelemetrySink(
+        tmp_path, format="csv", partition_by=("date",), max_file_bytes=1
+    )
+    sink.write(event())
+    await sink.flush()
+    sink.write(event(temp=3))
+    await sink.close()
+    found = files(tmp_path)
+    assert len(found) == 2 and all(f.endswith(".csv.gz") for f in found)
+    with gzip.open(tmp_path / found[0], "rt") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(_sinks.COLUMNS)
+    assert rows[1] == ["2026-09-21T14:13:20+00:00", "gw-1", "pump", "temp", "21.5"]
+
+    plain = TelemetrySink(tmp_path / "plain", format="csv", compression=None)
+    plain.write(event(timestamp="bad"))
+    await plain.close()
+    (name,) = files(tmp_path / "plain")
+    assert name.endswith(".csv")
+    assert str(time.gmtime().tm_year) in name
+
+
+async def test_background_flush_and_age_rotation(tmp_path):
+    sink = TelemetrySink(tmp_path, flush_interval=0.01, max_file_age=0.05)
+    async with sink:
+        sink.write(event())
+        await asyncio.sleep(0.03)
+        assert sink.stats.rows == 2  # written without an explicit flush
+        await asyncio.sleep(0.1)
+        assert sink.stats.files == 1  # aged out on a timer tick
+        sink.write(event())
+    assert sink.stats.files == 2
+
+
+async def test_consume_stream_with_backpressure(tmp_path):
+    async with MockServer(stream_events=30, event_rate=5000) as server:
+        async with AsyncScadable(api_key="k", base_url=server.base_url) as client:
+            sink = TelemetrySink(tmp_path, flush_rows=20, max_pending=0)
+            async with sink, client.gateways.stream("gw-000000") as events:
+                assert await sink.consume(events, gateway_id="gw-000000") == 30
+    assert sink.stats.flushes >= 2
+    rows = sum(pq.read_table(tmp_path / f).num_rows for f in files(tmp_path))
+    assert rows == sink.stats.rows > 0
+
+
+async def test_writer_errors_surface(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    sink = TelemetrySink(blocker, flush_rows=1)
+    busy = threading.Event()
+    sink._pending.append(sink._executor.submit(busy.wait))
+    sink.write(event())  # queued behind the busy writer
+    busy.set()
+    while not all(future.done() for future in sink._pending):
+        await asyncio.sleep(0.01)
+    with pytest.raises(OSError):
+        sink.write(event())  # the next write raises the finished write's error
+    with pytest.raises(OSError):
+        await sink.close()
+
+
+def test_validates_options(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="format"):
+        TelemetrySink(tmp_path, format="json")
+    with pytest.raises(ValueError, match="partition"):
+        TelemetrySink(tmp_path, partition_by=("device",))
+    with pytest.raises(ValueError, match="gzip"):
+        TelemetrySink(tmp_path, format="csv", compression="zstd")
+    monkeypatch.setattr(_sinks, "find_spec", lambda name: None)
+    assert TelemetrySink(tmp_path).format == "csv"
@@ -1,8 +1,22 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
 import pytest
 
-from scadable._resources._gateways import AsyncGateways
+from scadable import (
+    AsyncScadable,
+    Scadable,
+    StreamStats,
+    TelemetryEvent,
+    register_decoder,
+)
+from scadable._resources._gateways import AsyncGateways, Gateways
+from scadable._transport._background import SyncStream, get_loop
 from scadable._transport._http import AsyncHTTPTransport
 from scadable._config import ClientConfig
+from scadable._transport import _codecs
+from scadable._transport._websocket import WebSocketTransport
 
 
 @pytest.mark.asyncio
@@ -12,11 +26,269 @@ async def test_stream_requires_async_client():
     with pytest.raises(RuntimeError, match="Streaming requires AsyncScadable"):
         async with gateways.stream("gw1"):
             pass
+    with pytest.raises(RuntimeError, match="Streaming requires AsyncScadable"):
+        await gateways.preconnect("gw1")
 
 
 def test_websocket_transport_init():
-    from scadable._transport._websocket import WebSocketTransport
-
     config = ClientConfig(api_key="sk_test", base_url="https://api.scadable.com")
     transport = WebSocketTransport(config)
     assert transport._config.api_key == "sk_test"
+
+
+class FakeStreamTransport:
+    """Stands in for WebSocketTransport, yielding canned messages."""
+
+    def __init__(self, messages, error=None):
+        self.messages = messages
+        self.error = error
+        self.paths = []
+        self.closed = 0
+
+    @asynccontextmanager
+    async def connect(self, path):
+        self.paths.append(path)
+
+        async def _iter():
+            for msg in self.messages:
+                yield msg
+            if self.error:
+                raise self.error
+
+        try:
+            yield _iter()
+        finally:
+            self.closed += 1
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_async_stream_parses_events():
+    config = ClientConfig(api_key="sk_test", base_url="https://test.scadable.com")
+    ws = FakeStreamTransport([{"type": "telemetry", "data": {"a": 1}}])
+    gateways = AsyncGateways(AsyncHTTPTransport(config), stream_transport=ws)
+    async with gateways.stream("gw1") as stream:
+        events = [event async for event in stream]
+    assert ws.paths == ["/v1/gateways/gw1/stream"]
+    assert isinstance(events[0], TelemetryEvent)
+    assert events[0].data == {"a": 1}
+
+
+def test_sync_stream_iterates_events():
+    ws = FakeStreamTransport(
+        [{"type": "telemetry", "data": {"n": i}} for i in range(5)]
+    )
+    with Scadable(api_key="sk_test") as client:
+        client._ws_transport = ws
+        client.gateways._stream_transport = ws
+        with client.gateways.stream("gw1", max_queue=2) as stream:
+            events = list(stream)
+            assert next(stream, None) is None
+    assert [e.data["n"] for e in events] == [0, 1, 2, 3, 4]
+    assert ws.paths == ["/v1/gateways/gw1/stream"]
+    assert ws.closed == 1
+
+
+def test_sync_stream_propagates_errors():
+    ws = FakeStreamTransport([{"type": "telemetry"}], error=OSError("dropped"))
+    gateways = Gateways(transport=None, stream_transport=ws)
+    stream = gateways.stream("gw1")
+    assert next(stream).type == "telemetry"
+    with pytest.raises(OSError, match="dropped"):
+        next(stream)
+    with pytest.raises(StopIteration):
+        next(stream)
+
+
+def test_sync_stream_close_stops_producer():
+    ws = FakeStreamTransport([{"type": "telemetry"}] * 100)
+    gateways = Gateways(transport=None, stream_transport=ws)
+    with gateways.stream("gw1", max_queue=1) as stream:
+        assert next(stream).type == "telemetry"
+    assert ws.closed == 1
+    assert list(stream) == []
+    stream.close()
+
+
+def test_sync_stream_close_before_start():
+    stream = SyncStream(lambda: None)
+    stream.close()
+    assert stream.stats is None
+
+
+def test_sync_stream_requires_transport():
+    with pytest.raises(RuntimeError, match="Streaming requires"):
+        Gateways(transport=None).stream("gw1")
+
+
+def test_sync_stream_rejects_empty_queue():
+    with pytest.raises(ValueError, match="max_queue"):
+        SyncStream(lambda: None, max_queue=0)
+
+
+def test_background_loop_is_shared():
+    async def _loop_id():
+        return id(asyncio.get_running_loop())
+
+    assert get_loop() is get_loop()
+    running = asyncio.run_coroutine_threadsafe(_loop_id(), get_loop())
+    assert running.result(5) == id(get_loop())
+
+
+@pytest.mark.asyncio
+async def test_websocket_stream_end_to_end(ws_server):
+    ws_server.messages = [
+        json.dumps({"type": "telemetry", "data": {"v": "x" * 500}}),
+        "not json",
+        json.dumps({"type": "telemetry", "data": {"v": "y" * 500}}),
+    ]
+    async with AsyncScadable(api_key="sk_test", base_url=ws_server.base_url) as client:
+        async with client.gateways.stream("gw1") as stream:
+            events = [event async for event in stream]
+
+    assert [e.data["v"][0] for e in events] == ["x", "y"]
+    assert ws_server.requests[0].path == "/v1/gateways/gw1/stream?token=sk_test"
+    stats = stream.stats
+    assert stats.messages == 3
+    assert stats.payload_bytes > 1000
+    # Repetitive payloads compress well with the default permessage-deflate.
+    assert stats.compression_ratio > 1
+
+
+@pytest.mark.asyncio
+async def test_websocket_tuned_deflate(ws_server):
+    ws_server.messages = [json.dumps({"type": "telemetry"})]
+    config = ClientConfig(
+        api_key="sk_test",
+        base_url=ws_server.base_url,
+        ws_compression_level=1,
+        ws_max_window_bits=10,
+        ws_max_size=None,
+        ws_ping_interval=None,
+    )
+    transport = WebSocketTransport(config)
+    options = transport._connect_options()
+    assert options["compression"] is None
+    assert options["max_size"] is None
+    assert options["ping_interval"] is None
+    async with transport.connect("/v1/gateways/gw1/stream") as stream:
+        assert [msg async for msg in stream] == [{"type": "telemetry"}]
+    extensions = ws_server.requests[0].headers["Sec-WebSocket-Extensions"]
+    assert "server_max_window_bits=10" in extensions
+
+
+@pytest.mark.asyncio
+async def test_websocket_compression_disabled(ws_server):
+    ws_server.messages = [json.dumps({"type": "telemetry"})]
+    config = ClientConfig(
+        api_key="sk_test", base_url=ws_server.base_url, ws_compression=None
+    )
+    async with WebSocketTransport(config).connect("/stream") as stream:
+        assert [msg async for msg in stream] == [{"type": "telemetry"}]
+    assert "Sec-WebSocket-Extensions" not in ws_server.requests[0].headers
+
+
+def test_stream_stats_ratio_without_traffic():
+    assert StreamStats().compression_ratio == 1.0
+
+
+def test_client_forwards_config_options():
+    with Scadable(api_key="sk_test", ws_max_size=4 * 2**20) as client:
+        assert client._config.ws_max_size == 4 * 2**20
+    with pytest.raises(TypeError):
+        Scadable(api_key="sk_test", ws_bogus=1)
+
+
+@pytest.mark.asyncio
+async def test_websocket_negotiates_msgpack(ws_server):
+    import msgpack
+
+    ws_server.subprotocol = "scadable.msgpack"
+    ws_server.messages = [
+        msgpack.packb({"type": "telemetry", "data": {"r": [1, 2]}}),
+        b"\xc1",  # reserved msgpack byte
+        json.dumps({"type": "status"}),  # text frames stay JSON
+    ]
+    config = ClientConfig(api_key="sk_test", base_url=ws_server.base_url)
+    async with WebSocketTransport(config).connect("/stream") as stream:
+        msgs = [msg async for msg in stream]
+    assert msgs == [{"type": "telemetry", "data": {"r": [1, 2]}}, {"type": "status"}]
+    assert stream.stats.encoding == "msgpack"
+    assert stream.stats.decode_errors == 1
+    offered = ws_server.requests[0].headers["Sec-WebSocket-Protocol"]
+    assert offered == "scadable.msgpack, scadable.cbor, scadable.json"
+
+
+@pytest.mark.asyncio
+async def test_websocket_negotiates_cbor(ws_server):
+    import cbor2
+
+    ws_server.subprotocol = "scadable.cbor"
+    ws_server.messages = [
+        b"\x9f",  # indefinite array without its break byte
+        b"\xff",  # break byte outside an indefinite item
+        cbor2.dumps({"type": "telemetry"}),
+    ]
+    config = ClientConfig(
+        api_key="sk_test", base_url=ws_server.base_url, stream_encodings=("cbor",)
+    )
+    async with WebSocketTransport(config).connect("/stream") as stream:
+        assert [msg async for msg in stream] == [{"type": "telemetry"}]
+    assert stream.stats.decode_errors == 2
+    assert ws_server.requests[0].headers["Sec-WebSocket-Protocol"] == "scadable.cbor"
+
+
+@pytest.mark.asyncio
+async def test_websocket_json_only_sends_no_subprotocol(ws_server):
+    ws_server.messages = [json.dumps({"type": "telemetry"}).encode()]
+    config = ClientConfig(
+        api_key="sk_test", base_url=ws_server.base_url, stream_encodings=("json",)
+    )
+    async with WebSocketTransport(config).connect("/stream") as stream:
+        assert [msg async for msg in stream] == [{"type": "telemetry"}]
+    assert "Sec-WebSocket-Protocol" not in ws_server.requests[0].headers
+    assert stream.stats.encoding == "json"
+
+
+@pytest.mark.asyncio
+async def test_custom_decoder_registry(ws_server, monkeypatch):
+    monkeypatch.setattr(_codecs, "_DECODERS", dict(_codecs._DECODERS))
+    seen = []
+
+    def decode(payload):
+        seen.append(type(payload))
+        return {"type": bytes(payload).decode()}
+
+    register_decoder("test-raw", decode)
+    ws_server.subprotocol = "scadable.test-raw"
+    ws_server.messages = [b"telemetry"]
+    config = ClientConfig(
+        api_key="sk_test",
+        base_url=ws_server.base_url,
+        stream_encodings=("test-raw", "json"),
+    )
+    async with WebSocketTransport(config).connect("/stream") as stream:
+        assert [msg async for msg in stream] == [{"type": "telemetry"}]
+    assert seen == [memoryview]
+
+
+def test_unknown_stream_encoding():
+    config = ClientConfig(api_key="sk_test", stream_encodings=("yaml",))
+    with pytest.raises(ValueError, match="Unknown stream encoding"):
+        WebSocketTransport(config)._connect_options()
+
+
+async def test_closing_a_stalled_stream_does_not_wait_for_timeout():
+    import time
+
+    from scadable.testing import MockServer
+
+    async with MockServer() as server:
+        async with AsyncScadable(api_key="k", base_url=server.base_url) as client:
+            start = time.perf_counter()
+            async with client.gateways.stream("gw-000000"):
+                # Not reading lets the receive queue fill up.
+                await asyncio.sleep(0.2)
+            assert time.perf_counter() - start < 3
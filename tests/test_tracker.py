@@ -0,0 +1,179 @@
+"""DeviceTracker — device connectivity from the stream instead of polling."""
+
+import asyncio
+
+import pytest
+
+from scadable import AsyncScadable, DeviceTracker, NotFoundError, TelemetryEvent
+from scadable.testing import MockServer, make_fleet
+
+
+def event(devices, timestamp=1767225600.0):
+    return {"type": "telemetry", "data": {"timestamp": timestamp, "devices": devices}}
+
+
+def test_apply_reports_changes_and_snapshots():
+    tracker = DeviceTracker(None, "gw-1")
+    seen = []
+    tracker.on_change(seen.append)
+
+    changes = tracker.apply(event({"pump": {"connected": True, "protocol": "modbus"}}))
+    assert [(c.device.name, c.added) for c in changes] == [("pump", True)]
+    assert changes[0].changes == {
+        "connected": (None, True),
+        "protocol": (None, "modbus"),
+    }
+    snapshot = tracker.snapshot()
+
+    message = TelemetryEvent.model_validate(
+        event({"pump": {"connected": False, "last_error": "timeout"}}, 1767225660)
+    )
+    changes = tracker.apply(message)
+    assert changes[0].changes == {
+        "connected": (True, False),
+        "last_error": (None, "timeout"),
+    }
+    assert not changes[0].added
+    assert tracker.devices["pump"].connected is False
+    assert tracker.devices["pump"].last_seen_at.minute == 1
+    assert snapshot["pump"].connected is True
+    assert seen == [*seen[:1], changes[0]]
+
+    assert tracker.apply(event({"pump": {"connected": False}}, "bad")) == []
+    assert tracker.apply({"data": {"gateway_id": "gw-1"}}) == []
+    tracker.apply(event({"pump": {"connected": True}}, 1767225720_000))
+    assert tracker.devices["pump"].last_seen_at.minute == 2  # milliseconds
+    assert tracker.events == 4
+
+
+@pytest.mark.asyncio
+async def test_tracks_stream_and_refreshes_only_on_connect():
+    fleet = make_fleet(1, devices_per_gateway=2)
+    async with MockServer(stream_events=3, event_rate=500) as server:
+        server.set_fleet(fleet)
+        client = AsyncScadable(api_key="k", base_url=server.base_url)
+        tracker = client.gateways.track_devices("gw-000000", reconnect_delay=0.01)
+        changes = []
+        tracker.on_change(changes.append)
+        async with tracker:
+            await tracker.wait_connected()
+            assert tracker.refreshes == 1
+            assert {c.device.name for c in changes if c.added} == {
+                "device-0",
+                "device-1",
+            }
+            assert tracker.devices["device-0"].device_id == "gw-000000-d0"
+            # The stream ends after three events; the tracker reconnects and
+            # the reconnect refresh picks up what changed in between.
+            fleet[0]["devices"][1].update(connected=False, last_error="io")
+            server.set_fleet(fleet)
+            while tracker.refreshes < 2:
+                await asyncio.sleep(0.01)
+            await tracker.start()  # already running
+        await client.close()
+
+    assert tracker.events >= 3
+    device = tracker.devices["device-1"]
+    assert (device.connected, device.last_error) == (False, "io")
+    assert any(c.changes.get("connected") == (True, False) for c in changes)
+    requests = server.stats.responses.get(200, 0)
+    assert requests == tracker.refreshes
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    async with MockServer(error_rate=1.0) as server:
+        client = AsyncScadable(api_key="k", base_url=server.base_url, max_retries=0)
+        tracker = client.gateways.track_devices(
+            "gw-000000", reconnect_delay=0.001, max_reconnect_delay=0.002
+        )
+        await tracker.start()
+        while server.stats.requests < 3:
+            await asyncio.sleep(0.01)
+        await tracker.stop()
+        await tracker.stop()
+        await client.close()
+    assert tracker.refreshes == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_credentials_stop_the_tracker():
+    from websockets.exceptions import InvalidStatus
+
+    async with MockServer(api_key="right") as server:
+        client = AsyncScadable(api_key="wrong", base_url=server.base_url)
+        tracker = client.gateways.track_devices("gw-000000")
+        with pytest.raises(InvalidStatus):
+            await tracker.run()
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_fatal_api_errors_propagate():
+    async with MockServer() as server:
+        client = AsyncScadable(api_key="k", base_url=server.base_url)
+        tracker = client.gateways.track_devices("missing")
+        with pytest.raises(NotFoundError):
+            await tracker.run()
+        # Started in the background, the error ends the wait for a connection.
+        await tracker.start()
+        with pytest.raises(NotFoundError):
+            await asyncio.wait_for(tracker.wait_connected(), 5)
+        with pytest.raises(NotFoundError):
+            await tracker.stop()
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_connected_with_run_driven_by_the_caller():
+    async with MockServer(event_rate=50) as server:
+        client = AsyncScadable(api_key="k", base_url=server.base_url)
+        tracker = client.gateways.track_devices("gw-000000")
+        running = asyncio.create_task(tracker.run())
+        await asyncio.wait_for(tracker.wait_connected(), 5)
+        assert tracker.refreshes == 1
+        running.cancel()
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_malformed_events_do_not_stop_tracking():
+    from contextlib import asynccontextmanager
+
+    from pydantic import ValidationError
+
+    good = event({"pump": {"connected": True}})
+    streams = [
+        [event({"pump": 5}), good],
+        [good, ValidationError.from_exception_data("TelemetryEvent", [])],
+        [event({"pump": {"connected": False}})],
+    ]
+
+    class Gateways:
+        async def devices(self, gateway_id):
+            return []
+
+        @asynccontextmanager
+        async def stream(self, gateway_id):
+            messages = streams.pop(0) if streams else []
+
+            async def events():
+                for message in messages:
+                    if isinstance(message, Exception):
+                        raise message
+                    yield TelemetryEvent.model_validate(message)
+                if not streams:
+                    await asyncio.sleep(60)
+
+            yield events()
+
+    async def tracked():
+        while streams or tracker.devices["pump"].connected is not False:
+            await asyncio.sleep(0.01)
+
+    tracker = DeviceTracker(Gateways(), "gw-1", reconnect_delay=0.001)
+    async with tracker:
+        await tracker.wait_connected()
+        tracker.apply(good)
+        await asyncio.wait_for(tracked(), 5)
+    assert tracker.errors == 2 and tracker.refreshes == 3
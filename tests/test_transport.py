@@ -140,3 +140,55 @@ def test_sync_with_json_body(config):
         resp = transport.request("POST", "/api/test", json={"name": "test"})
         assert resp.status_code == 201
         transport.close()
+
+
+def test_sync_keeps_a_caller_idempotency_key(config):
+    config.idempotency_keys = True
+    with respx.mock(base_url="https://test.scadable.com") as mock:
+        route = mock.post("/api/test").mock(return_value=Response(201))
+        transport = SyncHTTPTransport(config)
+        transport.request("POST", "/api/test", headers={"Idempotency-Key": "k1"})
+        assert route.calls[0].request.headers["Idempotency-Key"] == "k1"
+        transport.close()
+
+
+def test_response_is_decoded_lazily_and_once(config):
+    with respx.mock(base_url="https://test.scadable.com") as mock:
+        mock.get("/api/test").mock(
+            return_value=Response(200, json={"ok": True}, headers={"X-Trace": "t1"})
+        )
+        transport = SyncHTTPTransport(config)
+        resp = transport.request("GET", "/api/test")
+        assert resp.content == b'{"ok":true}'
+        assert resp.data is resp.data
+        assert resp.headers["x-trace"] == "t1"
+        assert repr(resp) == "<Response [200]>"
+
+        config.response_headers = False
+        assert transport.request("GET", "/api/test").headers == {}
+        transport.close()
+
+
+def test_sync_error_body_that_is_not_an_object(config):
+    config.max_retries = 0
+    with respx.mock(base_url="https://test.scadable.com") as mock:
+        mock.get("/api/test").mock(return_value=Response(401, json=["denied"]))
+        transport = SyncHTTPTransport(config)
+        with pytest.raises(AuthenticationError, match="HTTP 401"):
+            transport.request("GET", "/api/test")
+        transport.close()
+
+
+def test_resources_accept_responses_without_raw_content():
+    from scadable._models._gateway import Gateway
+    from scadable._resources._base import SyncResource
+    from scadable._transport._base import Response as TransportResponse
+
+    class Static:
+        def request(self, *_, **__):
+            return TransportResponse(
+                200, {"id": "gw-1", "name": "a", "status": "online"}
+            )
+
+    gateway = SyncResource(Static())._get("/v1/gateways/gw-1", model=Gateway)
+    assert gateway.id == "gw-1"
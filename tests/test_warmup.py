@@ -0,0 +1,117 @@
+"""Connection warm-up, stream pre-connection and DNS caching."""
+
+import asyncio
+import socket
+
+import pytest
+
+from scadable import AsyncScadable, ConnectionError
+from scadable._transport._dns import CachedResolver
+from scadable.testing import MockServer
+
+
+async def test_warmup_opens_pooled_connections():
+    async with MockServer(latency=0.01) as server:
+        async with AsyncScadable("sk_test", base_url=server.base_url) as client:
+            result = await client.warmup(8)
+            assert result.connections == 8 and not result.streams
+            assert server.stats.connections == 8
+            # The burst after warm-up finds every connection already open.
+            await asyncio.gather(*(client.gateways.get("gw-000001") for _ in range(8)))
+            assert server.stats.connections == 8
+
+
+async def test_warmup_counts_connections_not_requests():
+    async with MockServer() as server:
+        async with AsyncScadable(
+            "sk_test", base_url=server.base_url, max_keepalive_connections=5
+        ) as client:
+            assert (await client.warmup(12)).connections == 5
+            assert server.stats.connections == 5
+            # Already pooled, so held again without new handshakes.
+            assert (await client.warmup(3)).connections == 3
+            assert server.stats.connections == 5
+
+
+async def test_warmup_on_enter_and_failures_are_not_raised():
+    async with MockServer() as server:
+        async with AsyncScadable(
+            "sk_test", base_url=server.base_url, warmup_connections=3
+        ):
+            assert server.stats.connections == 3
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    async with AsyncScadable("sk_test", base_url=f"http://127.0.0.1:{port}") as client:
+        result = await client.warmup(2, gateways=["gw-000000"])
+    assert result.connections == 0 and not result.streams
+    assert isinstance(result.errors["gw-000000"], OSError)
+
+
+async def test_preconnected_stream_is_used_by_the_next_stream():
+    async with MockServer(stream_events=3, event_rate=50, api_key="sk_test") as server:
+        async with AsyncScadable("sk_test", base_url=server.base_url) as client:
+            result = await client.warmup(0, gateways=["gw-000000", "gw-000000"])
+            assert result.streams == ["gw-000000"] and server.stats.streams == 1
+            async with client.gateways.stream("gw-000000") as events:
+                received = [event async for event in events]
+            assert len(received) == 3 and server.stats.streams == 1
+
+            # Closed by the server while waiting: the next stream redials.
+            await client.gateways.preconnect("gw-000000")
+            await asyncio.sleep(0.3)
+            async with client.gateways.stream("gw-000000") as events:
+                assert len([event async for event in events]) == 3
+            assert server.stats.streams == 3
+
+            await client.gateways.preconnect("gw-000001")
+        assert not client._ws_transport._ready  # closed unused
+
+        async with AsyncScadable("sk_wrong", base_url=server.base_url) as client:
+            result = await client.warmup(1, gateways=["gw-000000"])
+        assert result.connections == 1  # a 401 still opened the connection
+        assert list(result.errors) == ["gw-000000"]
+
+
+async def test_cached_resolver_reuses_answers_until_ttl():
+    now = [0.0]
+    resolver = CachedResolver(60, clock=lambda: now[0])
+    assert await resolver.resolve("localhost", 80) == await resolver.resolve(
+        "localhost", 80
+    )
+    assert resolver.lookups == 1
+    now[0] = 61
+    await resolver.resolve("localhost", 80)
+    assert resolver.lookups == 2
+    assert await resolver.resolve("10.0.0.1", 80) == ["10.0.0.1"]
+    assert await resolver.resolve("::1", 80) == ["::1"]
+    assert resolver.lookups == 2
+
+
+def _resolver(client):
+    return client._transport._client._transport.resolver
+
+
+async def test_dns_cache_falls_through_addresses():
+    async with MockServer() as server:
+        url = server.base_url.replace("127.0.0.1", "localhost")
+        key = ("localhost", server.port)
+        options = dict(base_url=url, dns_cache_ttl=60, max_retries=0)
+        async with AsyncScadable("sk_test", **options) as client:
+            # 127.0.0.2 is loopback too, but nothing listens there.
+            _resolver(client)._cache[key] = (float("inf"), ["127.0.0.2", "127.0.0.1"])
+            assert (await client.gateways.get("gw-000001")).id == "gw-000001"
+            assert _resolver(client).lookups == 0
+
+        async with AsyncScadable("sk_test", **options) as client:
+            _resolver(client)._cache[key] = (float("inf"), ["127.0.0.2"])
+            with pytest.raises(ConnectionError):
+                await client.gateways.get("gw-000001")
+            assert key not in _resolver(client)._cache
+
+            async def fail(host, port):
+                raise socket.gaierror("no such host")
+
+            _resolver(client).resolve = fail
+            with pytest.raises(ConnectionError, match="no such host"):
+                await client.gateways.get("gw-000001")